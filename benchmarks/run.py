@@ -0,0 +1,330 @@
+"""Offline benchmark of the YouTube Sensor coordinator.
+
+Runs the real coordinator against the local stand-in server for 1, 100 and
+1000 channels (by default) and reports, for each update round:
+
+- HTTP requests and bytes downloaded per channel,
+- update latency percentiles (time to update one channel),
+- event-loop lag,
+- peak Python memory (tracemalloc).
+
+Usage, from the repository root::
+
+    python -m benchmarks.run
+    python -m benchmarks.run --channels 100 --latency 0.05 --throttle 0.01
+    python -m benchmarks.run --json results.json
+    python -m benchmarks.run --baseline results.json
+
+With ``--baseline`` the run fails (exit status 1) when requests or bytes per
+channel grow by more than ``--tolerance`` compared to a previous run; the
+timings are reported but, being noisy, never compared.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from custom_components.youtube_sensor.const import (
+    CONF_FEED_ONLY,
+    CONF_MAX_CONCURRENCY,
+    CONF_REQUESTS_PER_SECOND,
+    DATA_SESSION,
+    DEFAULT_MAX_CONCURRENCY,
+    DOMAIN,
+)
+from custom_components.youtube_sensor.coordinator import async_get_coordinator
+
+from .server import StandInServer, channel_id
+
+YOUTUBE = "https://www.youtube.com"
+LAG_INTERVAL = 0.01  # seconds
+# Metriche deterministiche, confrontate con --baseline
+COMPARED = ("requests_per_channel", "kb_per_channel")
+
+
+class StandInSession:
+    """aiohttp session that sends every YouTube request to the stand-in server.
+
+    It counts the bytes of the response bodies actually received, so pages
+    abandoned early by the scanner only count for what was downloaded.
+    Connections are not reused: client and server share the event loop, and
+    a request sent on a connection the server is about to drop could wait
+    for the whole request timeout, skewing the timings.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(force_close=True))
+        self._responses: list[aiohttp.ClientResponse] = []
+        self._bytes_read = 0
+
+    @property
+    def bytes_read(self) -> int:
+        """Return the body bytes received so far."""
+        self._bytes_read += sum(response.content.total_bytes for response in self._responses)
+        self._responses.clear()
+        return self._bytes_read
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the session is closed."""
+        return self._session.closed
+
+    async def request(self, method, url, **kwargs):
+        """Send a request to the stand-in server instead of YouTube."""
+        response = await self._session.request(
+            method, str(url).replace(YOUTUBE, self.base_url), **kwargs
+        )
+        self._responses.append(response)
+        return response
+
+    async def post(self, url, **kwargs):
+        """Send a POST request."""
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """Close the session."""
+        await self._session.close()
+
+
+class LagMonitor:
+    """Measure how late the event loop wakes up a task sleeping LAG_INTERVAL."""
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(max(0.0, time.perf_counter() - start - LAG_INTERVAL))
+
+
+@dataclass
+class RoundResult:
+    """Metrics of one update round."""
+
+    channels: int
+    round: str
+    requests_per_channel: float
+    kb_per_channel: float
+    duration_s: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+    peak_memory_mb: float | None
+
+
+def _percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(share * 100) - 1]
+
+
+async def async_run_scenario(
+    hass: HomeAssistant,
+    server: StandInServer,
+    channels: int,
+    publish: float = 0.1,
+    memory: bool = True,
+) -> list[RoundResult]:
+    """Register ``channels`` channels and run a cold, a warm and a publish round.
+
+    - cold: nothing cached, every channel is polled for the first time;
+    - warm: nothing changed since the cold round;
+    - publish: a ``publish`` share of the channels uploaded a new video.
+    """
+    session = StandInSession(server.url)
+    hass.data.setdefault(DOMAIN, {})[DATA_SESSION] = session
+    coordinator = await async_get_coordinator(hass)
+    registered = [
+        coordinator.async_register_channel(channel_id(index), f"Channel {index}")
+        for index in range(channels)
+    ]
+    # Il benchmark guida gli aggiornamenti da sé: niente primo aggiornamento differito
+    if coordinator._unsub_startup is not None:  # pylint: disable=protected-access
+        coordinator._unsub_startup()  # pylint: disable=protected-access
+        coordinator._unsub_startup = None  # pylint: disable=protected-access
+
+    latencies: list[float] = []
+    update_channel = coordinator._async_update_channel  # pylint: disable=protected-access
+
+    async def _timed_update(channel):
+        start = time.perf_counter()
+        try:
+            await update_channel(channel)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    coordinator._async_update_channel = _timed_update  # pylint: disable=protected-access
+
+    monitor = LagMonitor()
+    results = []
+    for name in ("cold", "warm", "publish"):
+        if name == "publish":
+            server.publish(publish)
+        for channel in registered:
+            channel.next_update = None
+        latencies.clear()
+        requests, bytes_read = server.stats.total, session.bytes_read
+        if memory:
+            tracemalloc.start()
+        monitor.start()
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        duration = time.perf_counter() - start
+        await monitor.stop()
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        results.append(RoundResult(
+            channels=channels,
+            round=name,
+            requests_per_channel=(server.stats.total - requests) / channels,
+            kb_per_channel=(session.bytes_read - bytes_read) / channels / 1024,
+            duration_s=duration,
+            latency_p50_ms=_percentile(latencies, 0.50) * 1000,
+            latency_p95_ms=_percentile(latencies, 0.95) * 1000,
+            latency_p99_ms=_percentile(latencies, 0.99) * 1000,
+            loop_lag_p99_ms=_percentile(monitor.samples, 0.99) * 1000,
+            loop_lag_max_ms=max(monitor.samples, default=0.0) * 1000,
+            peak_memory_mb=peak,
+        ))
+
+    for channel in registered:
+        coordinator.async_unregister_channel(channel)
+    await session.close()
+    return results
+
+
+async def _async_run_channels(args, channels: int) -> list[RoundResult]:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.data[DOMAIN] = {
+            CONF_MAX_CONCURRENCY: args.max_concurrency,
+            CONF_REQUESTS_PER_SECOND: args.rate,
+            CONF_FEED_ONLY: args.feed_only,
+        }
+        server = StandInServer(
+            latency=args.latency,
+            not_modified=not args.no_etag,
+            throttle=args.throttle,
+            page_size=args.page_kb * 1024,
+        )
+        await server.async_start()
+        try:
+            return await async_run_scenario(
+                hass, server, channels, publish=args.publish, memory=not args.no_memory
+            )
+        finally:
+            await server.async_stop()
+            await hass.async_stop(force=True)
+
+
+def _print_table(results: list[RoundResult]) -> None:
+    header = (
+        f"{'channels':>8} {'round':>8} {'req/ch':>7} {'KB/ch':>9} {'time s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'lag p99':>8} {'lag max':>8} {'peak MB':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        peak = f"{result.peak_memory_mb:8.1f}" if result.peak_memory_mb is not None else f"{'-':>8}"
+        print(
+            f"{result.channels:>8} {result.round:>8} {result.requests_per_channel:7.2f} "
+            f"{result.kb_per_channel:9.1f} {result.duration_s:8.2f} "
+            f"{result.latency_p50_ms:8.1f} {result.latency_p95_ms:8.1f} {result.latency_p99_ms:8.1f} "
+            f"{result.loop_lag_p99_ms:8.1f} {result.loop_lag_max_ms:8.1f} {peak}"
+        )
+
+
+def _regressions(results: list[RoundResult], baseline: list[dict], tolerance: float) -> list[str]:
+    previous = {(item["channels"], item["round"]): item for item in baseline}
+    found = []
+    for result in results:
+        if (old := previous.get((result.channels, result.round))) is None:
+            continue
+        for metric in COMPARED:
+            new_value, old_value = getattr(result, metric), old[metric]
+            if new_value > old_value * (1 + tolerance) + 1e-9:
+                found.append(
+                    f"{result.channels} channels, {result.round}: {metric} "
+                    f"{old_value:.2f} -> {new_value:.2f}"
+                )
+    return found
+
+
+async def async_main(argv: list[str] | None = None) -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency in seconds")
+    parser.add_argument("--throttle", type=float, default=0.0, help="share of 429 answers")
+    parser.add_argument("--no-etag", action="store_true", help="never answer 304")
+    parser.add_argument("--publish", type=float, default=0.1, help="share of channels with a new upload")
+    parser.add_argument("--page-kb", type=int, default=512, help="size of watch and channel pages")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument(
+        "--rate", type=float, default=1000.0,
+        help="requests per second allowed by the integration's rate limiter",
+    )
+    parser.add_argument(
+        "--feed-only", action="store_true", help="classify from the feed alone (feed_only option)"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster)")
+    parser.add_argument("--json", type=Path, help="save the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare with the results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    results: list[RoundResult] = []
+    for channels in args.channels:
+        results.extend(await _async_run_channels(args, channels))
+    _print_table(results)
+
+    if args.json:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=2))
+    if args.baseline:
+        if regressions := _regressions(results, json.loads(args.baseline.read_text()), args.tolerance):
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(async_main()))
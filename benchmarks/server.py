@@ -0,0 +1,232 @@
+"""Local stand-in for the YouTube endpoints used by the integration.
+
+It replays the recorded pages in ``fixtures/`` for any number of synthetic
+channels, with a configurable latency, conditional-request support and a
+share of ``429 Too Many Requests`` answers.
+
+Channel ``n`` has the ID ``UC`` followed by ``n`` on 22 digits. Its videos
+have 11-character IDs made of the channel number and a sequence number,
+and the sequence number decides what kind of page the video gets.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+FEED_ENTRIES = 15
+PAD_MARKER = "<!--PAD-->"
+# Blocco di riempimento: le pagine vere sono grandi e piene di script
+PAD_BLOCK = '<script nonce="x">window.ytcsi={};window.ytplayer={};</script>'
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+SHORT, VIDEO, LIVE, UPCOMING = "short", "video", "live", "upcoming"
+
+
+def _render(template: str, **values) -> str:
+    # Le pagine contengono JSON: niente str.format
+    for key, value in values.items():
+        template = template.replace("{%s}" % key, str(value))
+    return template
+
+
+def channel_id(index: int) -> str:
+    """Return the ID of synthetic channel ``index``."""
+    return f"UC{index:022d}"
+
+
+def video_kind(seq: int) -> str:
+    """Return the kind of page of the video with sequence number ``seq``."""
+    kind = seq % 10
+    if kind in (0, 3, 6):
+        return SHORT
+    if kind == 8:
+        return LIVE
+    if kind == 9:
+        return UPCOMING
+    return VIDEO
+
+
+@dataclass
+class ServerStats:
+    """What the stand-in server answered."""
+
+    requests: Counter = field(default_factory=Counter)
+    statuses: Counter = field(default_factory=Counter)
+    bytes_sent: int = 0
+
+    @property
+    def total(self) -> int:
+        """Return the number of requests received."""
+        return sum(self.requests.values())
+
+
+class StandInServer:
+    """Serve feeds, watch pages, /shorts/ probes and channel pages.
+
+    ``latency`` seconds are waited before every answer. With
+    ``not_modified`` the feed honors ``If-None-Match``. A ``throttle`` share
+    of the requests is answered with 429 and ``Retry-After: 1``. Pages are
+    padded to about ``page_size`` bytes, split around the recorded markup.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        not_modified: bool = True,
+        throttle: float = 0.0,
+        page_size: int = 512 * 1024,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.not_modified = not_modified
+        self.throttle = throttle
+        self.page_size = page_size
+        self.stats = ServerStats()
+        self.url: str | None = None
+        self._random = random.Random(seed)
+        # Numero di caricamenti di ogni canale, per simulare nuovi video
+        self._uploads: dict[int, int] = {}
+        self._templates = {
+            path.stem: path.read_text(encoding="utf-8") for path in FIXTURES.iterdir()
+        }
+        self._runner: web.AppRunner | None = None
+
+    async def async_start(self) -> str:
+        """Start listening on a free local port and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/feeds/videos.xml", self._feed)
+        app.router.add_route("*", "/shorts/{video_id}", self._shorts)
+        app.router.add_get("/watch", self._watch)
+        app.router.add_get("/channel/{channel_id}", self._channel)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def async_stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def publish(self, share: float) -> None:
+        """Add a new upload to a random ``share`` of the channels seen so far."""
+        for index in self._uploads:
+            if self._random.random() < share:
+                self._uploads[index] += 1
+
+    async def _answer(self, kind: str, build) -> web.StreamResponse:
+        self.stats.requests[kind] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.throttle and self._random.random() < self.throttle:
+            response = web.Response(status=429, headers={"Retry-After": "1"})
+        else:
+            response = build()
+        self.stats.statuses[response.status] += 1
+        if response.body is not None:
+            self.stats.bytes_sent += len(response.body)
+        return response
+
+    def _page(self, template: str, **values) -> bytes:
+        page = _render(self._templates[template], **values)
+        pads = page.count(PAD_MARKER)
+        if pads:
+            block = PAD_BLOCK * max(0, (self.page_size - len(page)) // (pads * len(PAD_BLOCK)))
+            page = page.replace(PAD_MARKER, block)
+        return page.encode()
+
+    def _feed_body(self, index: int) -> bytes:
+        uploads = self._uploads.setdefault(index, 0)
+        cid = channel_id(index)
+        title = f"Channel {index}"
+        entries = []
+        for offset in range(FEED_ENTRIES):
+            seq = uploads + FEED_ENTRIES - 1 - offset
+            video_id = f"{index:06d}{seq:05d}"
+            published = EPOCH + timedelta(hours=seq * 7)
+            # Come su YouTube, le dirette non hanno statistiche finché non sono finite
+            counted = video_kind(seq) not in (LIVE, UPCOMING)
+            entries.append(_render(
+                self._templates["entry"],
+                video_id=video_id,
+                video_title=f"{title} - video {seq}",
+                video_path=(
+                    f"shorts/{video_id}" if video_kind(seq) == SHORT else f"watch?v={video_id}"
+                ),
+                channel_id=cid,
+                channel_title=title,
+                published=published.isoformat(),
+                updated=(published + timedelta(hours=1)).isoformat(),
+                stars=seq * 3 if counted else 0,
+                views=seq * 101 if counted else 0,
+            ))
+        return _render(
+            self._templates["feed"],
+            channel_id=cid,
+            channel_id_short=cid[2:],
+            channel_title=title,
+            entries="".join(entries),
+        ).encode()
+
+    async def _feed(self, request: web.Request) -> web.StreamResponse:
+        index = int(request.query["channel_id"][2:])
+
+        def build():
+            etag = f'"{index}-{self._uploads.get(index, 0)}"'
+            if self.not_modified and request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(
+                body=self._feed_body(index),
+                content_type="text/xml",
+                headers={"ETag": etag},
+            )
+
+        return await self._answer("feed", build)
+
+    async def _shorts(self, request: web.Request) -> web.StreamResponse:
+        video_id = request.match_info["video_id"]
+
+        def build():
+            if video_kind(int(video_id[6:])) == SHORT:
+                return web.Response(status=200)
+            return web.Response(
+                status=303, headers={"Location": f"{self.url}/watch?v={video_id}"}
+            )
+
+        return await self._answer("shorts_probe", build)
+
+    async def _watch(self, request: web.Request) -> web.StreamResponse:
+        video_id = request.query["v"]
+        kind = video_kind(int(video_id[6:]))
+
+        def build():
+            return web.Response(
+                body=self._page(f"watch_{kind}", video_id=video_id, video_title=video_id),
+                content_type="text/html",
+            )
+
+        return await self._answer("watch", build)
+
+    async def _channel(self, request: web.Request) -> web.StreamResponse:
+        cid = request.match_info["channel_id"]
+        # Un canale su dieci è in diretta
+        template = "channel_live" if int(cid[2:]) % 10 == 0 else "channel"
+
+        def build():
+            return web.Response(
+                body=self._page(template, channel_id=cid, channel_title=cid),
+                content_type="text/html",
+            )
+
+        return await self._answer("channel", build)
@@ -1,13 +1,163 @@
 """The YouTube Sensor integration."""
 from __future__ import annotations
 
-from homeassistant.config_entries import ConfigEntry
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .api import async_close_session
+from .const import (
+    ATTR_FILE,
+    ATTR_LIMIT,
+    ATTR_LIVE,
+    ATTR_SHORTS,
+    ATTR_SINCE,
+    ATTR_SUBSCRIPTIONS,
+    CONF_CHANNEL_ID,
+    CONF_FEED_ONLY,
+    CONF_INCLUDE_SHORTS,
+    CONF_MAX_CONCURRENCY,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_SCAN_INTERVAL,
+    CONF_WEBSUB,
+    CONF_WEBSUB_HUB,
+    DATA_COORDINATOR,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_RECENT_VIDEOS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WEBSUB_HUB,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    SERVICE_GET_RECENT_VIDEOS,
+    SERVICE_IMPORT_CHANNELS,
+)
+from .history import query_recent_videos
+from .importer import async_import_channels, parse_channel_ids
+
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+                vol.Optional(
+                    CONF_REQUESTS_PER_SECOND, default=DEFAULT_REQUESTS_PER_SECOND
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=50)),
+                vol.Optional(CONF_WEBSUB, default=False): cv.boolean,
+                vol.Optional(CONF_WEBSUB_HUB, default=DEFAULT_WEBSUB_HUB): cv.url,
+                vol.Optional(CONF_FEED_ONLY, default=False): cv.boolean,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+IMPORT_CHANNELS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_SUBSCRIPTIONS, "source"): cv.string,
+            vol.Exclusive(ATTR_FILE, "source"): cv.string,
+            vol.Optional(CONF_INCLUDE_SHORTS, default=False): cv.boolean,
+            vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+                vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_SUBSCRIPTIONS, ATTR_FILE),
+)
+
+GET_RECENT_VIDEOS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SHORTS): cv.boolean,
+        vol.Optional(ATTR_LIVE): cv.boolean,
+        vol.Optional(ATTR_SINCE): cv.datetime,
+        vol.Optional(CONF_CHANNEL_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_RECENT_VIDEOS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
 
-from .const import DOMAIN
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration-wide options from configuration.yaml."""
+    hass.data.setdefault(DOMAIN, {})
+    if DOMAIN in config:
+        for option in (
+            CONF_MAX_CONCURRENCY,
+            CONF_REQUESTS_PER_SECOND,
+            CONF_WEBSUB,
+            CONF_WEBSUB_HUB,
+            CONF_FEED_ONLY,
+        ):
+            hass.data[DOMAIN][option] = config[DOMAIN][option]
+
+    async def _async_import_channels(call: ServiceCall) -> ServiceResponse:
+        """Add every channel of an OPML or subscriptions export."""
+        if (text := call.data.get(ATTR_SUBSCRIPTIONS)) is None:
+            path = Path(hass.config.path(call.data[ATTR_FILE]))
+            if not hass.config.is_allowed_path(str(path)):
+                raise HomeAssistantError(f"Access to {path} is not allowed")
+            try:
+                text = await hass.async_add_executor_job(path.read_text, "utf-8")
+            except OSError as error:
+                raise HomeAssistantError(f"Cannot read {path}: {error}") from error
+        if not (channel_ids := parse_channel_ids(text)):
+            raise HomeAssistantError("No YouTube channel ID found")
+        return await async_import_channels(
+            hass,
+            channel_ids,
+            include_shorts=call.data[CONF_INCLUDE_SHORTS],
+            scan_interval=call.data[CONF_SCAN_INTERVAL],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_CHANNELS,
+        _async_import_channels,
+        schema=IMPORT_CHANNELS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_get_recent_videos(call: ServiceCall) -> ServiceResponse:
+        """Return the recent videos of the monitored channels, from memory."""
+        if (coordinator := hass.data[DOMAIN].get(DATA_COORDINATOR)) is None:
+            return {'videos': []}
+        since = call.data.get(ATTR_SINCE)
+        if since is not None and since.tzinfo is None:
+            since = dt_util.as_utc(since.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE))
+        return {
+            'videos': query_recent_videos(
+                coordinator.channels.values(),
+                shorts=call.data.get(ATTR_SHORTS),
+                live=call.data.get(ATTR_LIVE),
+                since=since,
+                channel_ids=call.data.get(CONF_CHANNEL_ID),
+                limit=call.data[ATTR_LIMIT],
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RECENT_VIDEOS,
+        _async_get_recent_videos,
+        schema=GET_RECENT_VIDEOS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -23,5 +173,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Chiudi la sessione HTTP condivisa quando non resta nessuna entry attiva
+        if not any(
+            other.state is ConfigEntryState.LOADED
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id != entry.entry_id
+        ):
+            await async_close_session(hass)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
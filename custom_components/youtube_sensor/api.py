@@ -0,0 +1,414 @@
+"""HTTP helpers used to query YouTube feeds, watch pages and channel pages."""
+from http import HTTPStatus
+import logging
+import re
+import time
+
+import aiohttp
+from dateutil.parser import parse
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import dt as dt_util, ssl as ssl_util
+
+from .const import (
+    CONF_REQUESTS_PER_SECOND,
+    DATA_CLIENT,
+    DATA_SESSION,
+    DATA_SESSION_UNSUB_CLOSE,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DOMAIN,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_LIMIT,
+    HTTP_LIMIT_PER_HOST,
+    RATE_BURST,
+    REQUEST_CHANNEL,
+    REQUEST_FEED,
+    REQUEST_TIMEOUT,
+    SHORTS_URL,
+    STREAM_ENDED,
+    STREAM_LIVE,
+    STREAM_UPCOMING,
+)
+from .breaker import CircuitOpen
+from .executor import ParseExecutor
+from .ratelimit import RateLimiter
+from .scanner import PageScanner
+from .singleflight import SingleFlight
+from .stats import request_kind
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the HTTP session shared by the whole integration.
+
+    Every channel talks to the same few YouTube hosts, so a single pooled
+    session lets warm polls reuse keep-alive connections instead of opening
+    a new TLS connection per request.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    session = domain_data.get(DATA_SESSION)
+    if session is None or session.closed:
+        session = domain_data[DATA_SESSION] = _async_create_session(hass)
+
+        async def _async_close(event: Event) -> None:
+            domain_data.pop(DATA_SESSION_UNSUB_CLOSE, None)
+            await session.close()
+
+        # Un solo listener, anche se la sessione viene ricreata
+        if (unsub := domain_data.pop(DATA_SESSION_UNSUB_CLOSE, None)) is not None:
+            unsub()
+        domain_data[DATA_SESSION_UNSUB_CLOSE] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close
+        )
+    return session
+
+
+async def async_close_session(hass: HomeAssistant) -> None:
+    """Close the shared HTTP session, if any."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if (unsub := domain_data.pop(DATA_SESSION_UNSUB_CLOSE, None)) is not None:
+        unsub()
+    if (session := domain_data.pop(DATA_SESSION, None)) is not None:
+        await session.close()
+
+
+class YoutubeThrottled(Exception):
+    """Error to indicate YouTube answered with 429 or a server error."""
+
+
+# Risposte che dicono che la pagina non esiste (es. canale eliminato)
+GONE_STATUSES = (HTTPStatus.NOT_FOUND, HTTPStatus.GONE)
+# Tipi di pagina che spariscono solo con il canale
+GONE_KINDS = (REQUEST_FEED, REQUEST_CHANNEL)
+
+
+class YoutubeClient:
+    """Send requests to YouTube through the shared session and rate limiter.
+
+    It is used like an aiohttp session (``get``/``head``). The request timeout
+    only starts once the rate limiter lets the request through, and 429/5xx
+    answers raise YoutubeThrottled after slowing every other request down.
+    Requests of a kind whose circuit breaker is open raise CircuitOpen without
+    being sent. The answers are parsed in the ``parser`` thread pool, and the
+    fetch helpers share identical concurrent requests through ``flights``.
+    """
+
+    def __init__(self, hass: HomeAssistant, limiter: RateLimiter, parser: ParseExecutor) -> None:
+        self.hass = hass
+        self.limiter = limiter
+        self.parser = parser
+        self.flights = SingleFlight()
+
+    async def get(self, url, **kwargs):
+        """Send a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        """Send a HEAD request."""
+        return await self.request("HEAD", url, **kwargs)
+
+    async def request(self, method, url, stats=None, breakers=None, **kwargs):
+        """Send a request once the rate limiter allows it.
+
+        If ``stats`` (a ChannelStats) is given, the request is recorded in it.
+        If ``breakers`` (a ChannelBreakers) is given, the request is only sent
+        while the breaker of its kind allows it, and its outcome is recorded.
+        """
+        kind = request_kind(url)
+        breaker = breakers[kind] if breakers is not None else None
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpen(f"{method} {url} paused until {breaker.retry_at}")
+        try:
+            await self.limiter.acquire()
+            kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+            start = time.monotonic()
+            try:
+                response = await async_get_session(self.hass).request(method, url, **kwargs)
+            except Exception as error:
+                if stats is not None:
+                    stats.record_request(kind, time.monotonic() - start, error=error)
+                if breaker is not None:
+                    breaker.failed()
+                raise
+            if stats is not None:
+                stats.record_request(kind, time.monotonic() - start, response)
+            if response.status == HTTPStatus.TOO_MANY_REQUESTS or response.status >= 500:
+                self.limiter.throttled(response.status, response.headers.get("Retry-After"))
+                response.release()
+                # Il 429 riguarda tutte le richieste, non questo canale
+                if breaker is not None and response.status != HTTPStatus.TOO_MANY_REQUESTS:
+                    breaker.failed()
+                raise YoutubeThrottled(f"{method} {url} answered {response.status}")
+            self.limiter.succeeded()
+            if breaker is not None:
+                if response.status >= 400:
+                    breaker.failed(gone=response.status in GONE_STATUSES and kind in GONE_KINDS)
+                else:
+                    breaker.succeeded()
+            return response
+        finally:
+            if breaker is not None:
+                breaker.release()
+
+
+@callback
+def async_get_client(hass: HomeAssistant) -> YoutubeClient:
+    """Return the rate-limited client shared by the whole integration."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (client := domain_data.get(DATA_CLIENT)) is None:
+        rate = domain_data.get(CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND)
+        client = domain_data[DATA_CLIENT] = YoutubeClient(
+            hass, RateLimiter(rate, max(RATE_BURST, int(rate))), ParseExecutor()
+        )
+
+        @callback
+        def _async_shutdown(event: Event) -> None:
+            # Siamo nel loop: i parsing in corso finiscono da soli nei loro thread
+            client.parser.shutdown(wait=False)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_shutdown)
+    return client
+
+
+def _async_create_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_LIMIT,
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        enable_cleanup_closed=True,
+        ssl=ssl_util.get_default_context(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector, headers={"User-Agent": SERVER_SOFTWARE}
+    )
+
+
+# Indicatori SPECIFICI che un video è uno Short
+# Questi sono più affidabili e riducono i falsi positivi
+DEFINITIVE_SHORT_INDICATORS = (
+    b'"isShort":true',                       # Indicatore JSON esplicito
+    b'"shorts":{"isShort":true',             # Struttura JSON specifica per Shorts
+    b'ytd-shorts-player',                    # Player specifico per Shorts
+    b'"webPageType":"WEB_PAGE_TYPE_SHORTS"',  # Tipo di pagina esplicito
+)
+# Indicatori aggiuntivi, validi solo per video brevi (confronto senza maiuscole)
+ADDITIONAL_SHORT_INDICATORS = (
+    b'shorts',                     # parola "shorts" nel contenuto
+    b'"isShortsMobileWeb":true',   # indicatore mobile
+    b'shortsLockupViewModel',      # componente UI specifico
+)
+# Indicatori di un video normale molto corto o live
+NORMAL_VIDEO_INDICATORS = (b'"isLive":true', b'"isLiveBroadcast":true')
+
+
+REDIRECT_STATUSES = (
+    HTTPStatus.MOVED_PERMANENTLY,
+    HTTPStatus.FOUND,
+    HTTPStatus.SEE_OTHER,
+    HTTPStatus.TEMPORARY_REDIRECT,
+    HTTPStatus.PERMANENT_REDIRECT,
+)
+
+
+def _any_of(indicators, ignore_case=False):
+    pattern = b"|".join(re.escape(indicator) for indicator in indicators)
+    return b"(?i:%s)" % pattern if ignore_case else b"(?:%s)" % pattern
+
+
+LIVE_PATTERNS = {
+    'broadcast': rb'isLiveBroadcast',
+    'start': rb'startDate" content="[^"]*"',
+    'end': rb'endDate',
+    'upcoming': rb'"isUpcoming":true',
+}
+LIVE_SCANNER = PageScanner(LIVE_PATTERNS)
+# Il controllo Short cerca anche la diretta: il video scelto viene poi
+# controllato con la stessa pagina, senza riscaricarla
+WATCH_SCANNER = PageScanner({
+    'definitive': _any_of(DEFINITIVE_SHORT_INDICATORS),
+    'length': rb'"lengthSeconds":"\d+"',
+    'additional': _any_of(ADDITIONAL_SHORT_INDICATORS, ignore_case=True),
+    'normal': _any_of(NORMAL_VIDEO_INDICATORS),
+    **LIVE_PATTERNS,
+})
+CHANNEL_SCANNER = PageScanner({
+    'live': rb'\{"iconType":"LIVE"\}',
+    'avatar': rb'"width":48,"height":48\},\{"url":"[^"]*","width":88,"height":88\},\{"url":',
+})
+_AVATAR_URL = re.compile(rb'\{"url":"([^"]*)"')
+
+
+def _short_length(found):
+    """Return the video length in seconds from the scanner matches, if known."""
+    if (match := found.get('length')) is None:
+        return None
+    return int(re.search(rb'\d+', match).group())
+
+
+def _short_known(found):
+    """Return True once the matches found so far prove the video is a Short."""
+    if 'definitive' in found:
+        return True
+    length = _short_length(found)
+    return length is not None and length <= 180 and 'additional' in found
+
+
+def _stream_known(found):
+    """Return True once the matches found so far tell the state of the stream."""
+    return 'broadcast' in found and 'start' in found and ('end' in found or 'upcoming' in found)
+
+
+def _channel_live_known(found):
+    """Return True once the matches found so far prove the channel is live."""
+    return 'live' in found
+
+
+def _channel_known(found):
+    """Return True once both the live badge and the avatar were found."""
+    return len(found) == 2
+
+
+async def async_scan_page(session, url, scanner, stop):
+    """Download a page and return the matches of ``scanner``, up to ``stop``.
+
+    Also returns True if the page was cut off at SCAN_MAX_BYTES before
+    ``stop`` was satisfied: a missing match then proves nothing.
+    Identical requests made during the same update cycle share one download.
+    A scan shared with another caller is only reused if it looked for every
+    pattern of ``scanner`` and either read the whole page or already
+    satisfies this caller's ``stop``; otherwise the page is read again.
+    """
+    async def _async_fetch():
+        response = await session.get(url, cookies=dict(CONSENT="YES+cb"))
+        found, truncated = await scanner.async_scan(response, stop, session.parser)
+        return found, not truncated and not stop(found), scanner.names
+
+    def _answers(result):
+        found, complete, names = result
+        return set(scanner.names) <= set(names) and (complete or stop(found))
+
+    found, complete, _ = await session.flights.async_run(("GET", url), _async_fetch, _answers)
+    return found, not complete and not stop(found)
+
+
+async def is_live(url, name, hass, session):
+    """Return the state of the stream of a video and when it starts.
+
+    The state is STREAM_UPCOMING, STREAM_LIVE, STREAM_ENDED, or None if the
+    video is not a stream. Returns None if the check could not be completed.
+    """
+    state = None
+    start = None
+    try:
+        found, truncated = await async_scan_page(session, url, LIVE_SCANNER, _stream_known)
+        if truncated and 'broadcast' not in found:
+            _LOGGER.debug('%s - Video page cut off before its stream details', name)
+            return None
+        if 'broadcast' in found:
+            if 'start' in found:
+                start = parse(found['start'].decode().split('content="')[1].rstrip('"'))
+            if 'end' in found:
+                state = STREAM_ENDED
+            elif 'upcoming' in found or (start is not None and start > dt_util.utcnow()):
+                state = STREAM_UPCOMING
+                _LOGGER.debug('%s - Latest Video is an upcoming stream (%s)', name, start)
+            else:
+                state = STREAM_LIVE
+                _LOGGER.debug('%s - Latest Video is live', name)
+    except Exception as error:  # pylint: disable=broad-except
+        _LOGGER.debug('%s - Could not update - %s', name, error)
+        return None
+    return state, start
+
+
+async def is_channel_live(url, name, hass, session, want_image=True):
+    """Return bool if channel is live (None if unknown), and the channel image if ``want_image``"""
+    live = False
+    channel_image = None
+    try:
+        stop = _channel_known if want_image else _channel_live_known
+        found, truncated = await async_scan_page(session, url, CHANNEL_SCANNER, stop)
+        if 'live' in found:
+            live = True
+            _LOGGER.debug('%s - Channel is live', name)
+        elif truncated:
+            _LOGGER.debug('%s - Channel page cut off, live state unknown', name)
+            live = None
+        if 'avatar' in found:
+            image = _AVATAR_URL.search(found['avatar']).group(1).decode()
+            channel_image = image.replace("=s88-c-k-c0x00ffffff-no-rj", "")
+    except Exception as error:  # pylint: disable=broad-except
+        _LOGGER.debug('%s - Could not update - %s', name, error)
+    return live, channel_image
+
+
+async def probe_youtube_short(video_id, name, session):
+    """Classify a video from how YouTube answers its /shorts/ URL, without downloading a page.
+
+    The /shorts/ URL of a Short is served directly, while a regular video is
+    redirected to its watch page. Returns None if the answer is ambiguous.
+    """
+    url = SHORTS_URL.format(video_id)
+
+    async def _async_probe():
+        response = await session.head(url, allow_redirects=False, cookies=dict(CONSENT="YES+cb"))
+        response.release()
+        return response.status, response.headers.get('Location', '')
+
+    try:
+        status, location = await session.flights.async_run(("HEAD", url), _async_probe)
+        if status == HTTPStatus.OK:
+            return True
+        if status in REDIRECT_STATUSES and '/watch' in location:
+            return False
+        _LOGGER.debug('%s - Shorts probe for %s inconclusive (status %s)', name, video_id, status)
+    except Exception as error:  # pylint: disable=broad-except
+        _LOGGER.debug('%s - Could not probe Shorts URL - %s', name, error)
+    return None
+
+
+async def is_youtube_short(video_id, name, session):
+    """Check if a video is a YouTube Short with stricter validation to reduce false positives.
+
+    Returns None if the check could not be completed.
+    """
+    try:
+        # Controlla la pagina normale del video, fermandosi appena uno Short è confermato
+        video_url = f"https://www.youtube.com/watch?v={video_id}"
+        found, truncated = await async_scan_page(session, video_url, WATCH_SCANNER, _short_known)
+
+        # Prima verifica: cerca indicatori definitivi
+        if (indicator := found.get('definitive')) is not None:
+            _LOGGER.debug('%s - Video %s confirmed as YouTube Short (indicator: %s)', name, video_id, indicator.decode())
+            return True
+
+        # Seconda verifica: controlla durata E altri segnali insieme
+        duration = _short_length(found)
+        if duration is not None and duration <= 180:
+            # Solo se la durata è <= 180 secondi E ci sono altri indicatori
+            if (indicator := found.get('additional')) is not None:
+                _LOGGER.debug('%s - Video %s is YouTube Short (duration: %ds + indicator: %s)',
+                            name, video_id, duration, indicator.decode().lower())
+                return True
+
+        # Pagina tagliata a SCAN_MAX_BYTES: gli indicatori mancanti potrebbero essere più avanti
+        if truncated:
+            _LOGGER.debug('%s - Video %s page cut off, Short state unknown', name, video_id)
+            return None
+
+        # Se è molto corto (< 30 sec) e non ci sono indicatori contrari, probabilmente è uno Short
+        if duration is not None and duration <= 30 and 'normal' not in found:
+            _LOGGER.debug('%s - Video %s likely Short (very short duration: %ds)', name, video_id, duration)
+            return True
+
+        _LOGGER.debug('%s - Video %s is NOT a YouTube Short', name, video_id)
+        return False
+
+    except Exception as error:  # pylint: disable=broad-except
+        _LOGGER.debug('%s - Could not check if video is Short - %s', name, error)
+        return None
@@ -0,0 +1,51 @@
+"""Binary sensor telling whether a monitored YouTube channel is live."""
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import YoutubeChannel, YoutubeCoordinator, async_register_entry_channel
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the channel live binary sensor from a config entry."""
+    coordinator, channel = await async_register_entry_channel(hass, config_entry)
+    async_add_entities([YoutubeChannelLiveSensor(coordinator, channel)])
+
+
+class YoutubeChannelLiveSensor(CoordinatorEntity, BinarySensorEntity):
+    """On while the channel is live, from the channel page checked by the sensor's update."""
+
+    _attr_icon = "mdi:access-point"
+    _written_value = None
+
+    def __init__(self, coordinator: YoutubeCoordinator, channel: YoutubeChannel):
+        super().__init__(coordinator)
+        self.channel = channel
+        self._attr_unique_id = f"youtube_{channel.channel_id}_channel_live"
+        self._attr_name = f"youtube_{channel.name} live"
+
+    @property
+    def available(self) -> bool:
+        """Return False while the channel's feed cannot be read."""
+        return super().available and self.channel.available
+
+    @property
+    def is_on(self) -> bool:
+        """Return True while the channel is live."""
+        return self.channel.channel_live
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if it changed."""
+        if (value := (self.available, self.is_on)) == self._written_value:
+            return
+        self._written_value = value
+        self.async_write_ha_state()
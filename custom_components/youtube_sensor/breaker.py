@@ -0,0 +1,151 @@
+"""Per-channel circuit breakers, so broken channels stop costing requests."""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BREAKER_CLOSED,
+    BREAKER_COOLDOWN,
+    BREAKER_COOLDOWN_MAX,
+    BREAKER_GONE_COOLDOWN,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    BREAKER_THRESHOLD,
+    REQUEST_FEED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    """Error to indicate a request was not sent because its breaker is open."""
+
+
+class CircuitBreaker:
+    """Stop sending a kind of request after it failed BREAKER_THRESHOLD times in a row.
+
+    Once open, requests fail at once for a cool-down that doubles every
+    time the breaker opens again (BREAKER_COOLDOWN, or BREAKER_GONE_COOLDOWN
+    when YouTube answered that the page does not exist, up to
+    BREAKER_COOLDOWN_MAX). Then a single request is let through: if it
+    succeeds the breaker closes, otherwise it opens again.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.failures = 0
+        self.opens = 0
+        self.gone = False
+        self.retry_at: datetime | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return BREAKER_CLOSED, BREAKER_OPEN or BREAKER_HALF_OPEN."""
+        if self.retry_at is None:
+            return BREAKER_CLOSED
+        if self._probing or dt_util.utcnow() >= self.retry_at:
+            return BREAKER_HALF_OPEN
+        return BREAKER_OPEN
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return True
+        if state == BREAKER_HALF_OPEN and not self._probing:
+            # Una sola richiesta di prova alla volta
+            self._probing = True
+            return True
+        return False
+
+    def succeeded(self) -> None:
+        """Close the breaker after a successful answer."""
+        if self.retry_at is not None:
+            _LOGGER.info('%s - Requests work again', self.name)
+        self.failures = 0
+        self.opens = 0
+        self.gone = False
+        self.retry_at = None
+        self._probing = False
+
+    def failed(self, gone: bool = False) -> None:
+        """Record a failed request, opening the breaker if it failed too often.
+
+        ``gone`` tells YouTube answered that the page does not exist (e.g. a
+        deleted channel): that answer is kept for a longer cool-down.
+        """
+        self.failures += 1
+        self.gone = gone
+        if not self._probing and (self.retry_at is not None or self.failures < BREAKER_THRESHOLD):
+            # Già aperto (richiesta partita prima dell'apertura) o non ancora da aprire
+            return
+        base = BREAKER_GONE_COOLDOWN if gone else BREAKER_COOLDOWN
+        cooldown = min(base * 2 ** min(self.opens, 16), BREAKER_COOLDOWN_MAX)
+        # Il primo errore di una serie è già segnalato dalle statistiche del canale
+        log = _LOGGER.info if self.opens == 0 else _LOGGER.debug
+        log('%s - %s after %d failures, pausing requests for %s',
+            self.name, 'Not found' if gone else 'Failing', self.failures, cooldown)
+        self.opens += 1
+        self.retry_at = dt_util.utcnow() + cooldown
+        self._probing = False
+
+    def release(self) -> None:
+        """Let another request test the breaker if this one got no answer (e.g. cancelled)."""
+        self._probing = False
+
+    def as_dict(self) -> dict:
+        """Return the state of the breaker as JSON-friendly data."""
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opens': self.opens,
+            'gone': self.gone,
+            'retry_at': self.retry_at.isoformat() if self.retry_at else None,
+        }
+
+    def restore(self, data: dict) -> None:
+        """Restore the state saved by ``as_dict``."""
+        self.failures = data.get('failures', 0)
+        self.opens = data.get('opens', 0)
+        self.gone = data.get('gone', False)
+        if retry_at := data.get('retry_at'):
+            self.retry_at = dt_util.parse_datetime(retry_at)
+
+
+class ChannelBreakers:
+    """The circuit breakers of a channel, one per kind of request."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def __getitem__(self, kind: str) -> CircuitBreaker:
+        if (breaker := self._breakers.get(kind)) is None:
+            breaker = self._breakers[kind] = CircuitBreaker(f"{self.name} ({kind})")
+        return breaker
+
+    @property
+    def feed(self) -> CircuitBreaker:
+        """Return the breaker of the channel's feed."""
+        return self[REQUEST_FEED]
+
+    def as_dict(self) -> dict:
+        """Return the state of every breaker, as JSON-friendly data."""
+        return {kind: breaker.as_dict() for kind, breaker in sorted(self._breakers.items())}
+
+    def snapshot(self) -> dict:
+        """Return the breakers worth keeping across restarts (the open ones)."""
+        return {
+            kind: breaker.as_dict()
+            for kind, breaker in self._breakers.items()
+            if breaker.retry_at is not None
+        }
+
+    def restore(self, data: dict) -> None:
+        """Restore the breakers saved by ``snapshot``."""
+        for kind, saved in data.items():
+            self[kind].restore(saved)
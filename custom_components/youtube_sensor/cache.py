@@ -0,0 +1,162 @@
+"""Persistent caches shared by all YouTube channels."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    AVATAR_CACHE_MAX_AGE,
+    AVATAR_CACHE_MAX_SIZE,
+    AVATAR_CACHE_STORAGE_KEY,
+    DATA_AVATAR_CACHE,
+    DATA_SHORTS_CACHE,
+    DATA_STATE_CACHE,
+    DOMAIN,
+    SHORTS_CACHE_MAX_AGE,
+    SHORTS_CACHE_MAX_SIZE,
+    SHORTS_CACHE_STORAGE_KEY,
+    STATE_CACHE_MAX_AGE,
+    STATE_CACHE_MAX_SIZE,
+    STATE_CACHE_STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+
+class PersistentCache:
+    """LRU cache whose entries expire, persisted across restarts.
+
+    Entries are evicted when the cache is full (least recently used first)
+    or when they are older than ``max_age`` seconds.
+    """
+
+    storage_key: str
+    data_key: str
+    default_max_size: int
+    default_max_age: float
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_size: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        self._store: Store = Store(hass, STORAGE_VERSION, self.storage_key)
+        self._max_size = max_size or self.default_max_size
+        self._max_age = max_age or self.default_max_age
+        self._data: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def async_load(self) -> None:
+        """Load the persisted entries (only once)."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load() or {}
+            now = time.time()
+            # Le voci salvate sono in ordine LRU, dalla meno recente
+            for key, (value, stamp) in stored.get(self.data_key, {}).items():
+                if now - stamp <= self._max_age:
+                    self._data[key] = (value, stamp)
+            self._evict()
+            self._loaded = True
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for a key, or None if unknown or expired."""
+        if (item := self._data.get(key)) is None:
+            return None
+        value, stamp = item
+        if time.time() - stamp > self._max_age:
+            del self._data[key]
+            self._schedule_save()
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store the value for a key."""
+        self._data[key] = (value, time.time())
+        self._data.move_to_end(key)
+        self._evict()
+        self._schedule_save()
+
+    def _evict(self) -> None:
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        return {self.data_key: {key: list(value) for key, value in self._data.items()}}
+
+
+class ShortsCache(PersistentCache):
+    """Short/not-Short verdicts, keyed by video ID.
+
+    A video's Short status never changes, so a verdict only has to be fetched
+    once.
+    """
+
+    storage_key = SHORTS_CACHE_STORAGE_KEY
+    data_key = "verdicts"
+    default_max_size = SHORTS_CACHE_MAX_SIZE
+    default_max_age = SHORTS_CACHE_MAX_AGE
+
+
+class AvatarCache(PersistentCache):
+    """Channel avatar URLs, keyed by channel ID.
+
+    Avatars almost never change, so they are only read again from the channel
+    page once the cached URL has expired.
+    """
+
+    storage_key = AVATAR_CACHE_STORAGE_KEY
+    data_key = "avatars"
+    default_max_size = AVATAR_CACHE_MAX_SIZE
+    default_max_age = AVATAR_CACHE_MAX_AGE
+
+
+class StateCache(PersistentCache):
+    """Last known state of each channel, keyed by channel key.
+
+    Sensors show it right after a restart, and its feed validators turn the
+    first poll into a cheap conditional request.
+    """
+
+    storage_key = STATE_CACHE_STORAGE_KEY
+    data_key = "channels"
+    default_max_size = STATE_CACHE_MAX_SIZE
+    default_max_age = STATE_CACHE_MAX_AGE
+
+
+async def _async_get_cache(hass: HomeAssistant, data_key: str, cache_class):
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (cache := domain_data.get(data_key)) is None:
+        cache = domain_data[data_key] = cache_class(hass)
+    await cache.async_load()
+    return cache
+
+
+async def async_get_shorts_cache(hass: HomeAssistant) -> ShortsCache:
+    """Return the integration-wide Shorts cache, loading it on first use."""
+    return await _async_get_cache(hass, DATA_SHORTS_CACHE, ShortsCache)
+
+
+async def async_get_avatar_cache(hass: HomeAssistant) -> AvatarCache:
+    """Return the integration-wide avatar cache, loading it on first use."""
+    return await _async_get_cache(hass, DATA_AVATAR_CACHE, AvatarCache)
+
+
+async def async_get_state_cache(hass: HomeAssistant) -> StateCache:
+    """Return the integration-wide channel state cache, loading it on first use."""
+    return await _async_get_cache(hass, DATA_STATE_CACHE, StateCache)
@@ -10,8 +10,9 @@ from homeassistant.config_entries import ConfigFlow
 from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-import async_timeout
+
+from .api import async_get_client
+from .feed import async_parse_feed, async_store_prefetched_feed
 
 DOMAIN = "youtube_sensor"
 CONF_CHANNEL_ID = "channel_id"
@@ -42,7 +43,11 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate the user input allows us to connect."""
+    """Validate the user input allows us to connect.
+
+    The feed downloaded here is kept for the first update of the channel,
+    which then does not need to download it again.
+    """
     
     channel_id = data[CONF_CHANNEL_ID].strip()
     
@@ -55,23 +60,18 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         raise InvalidChannelId("Channel ID must be 24 characters long")
     
     # Testa la connettività al canale
-    session = async_create_clientsession(hass)
+    session = async_get_client(hass)
     
     try:
         url = BASE_URL.format(channel_id)
-        async with async_timeout.timeout(10):
-            response = await session.get(url)
-            info = await response.text()
+        response = await session.get(url)
+        response.raise_for_status()
         
-        # Verifica che la risposta contenga dati validi
-        if '<title>' not in info or 'channel' not in info.lower():
+        feed = await async_parse_feed(response, executor=session.parser)
+        if feed.title is None:
             raise CannotConnect("Unable to fetch channel data")
-        
-        # Estrai il nome del canale dal feed
-        try:
-            channel_name = info.split('<title>')[1].split('</')[0]
-        except (IndexError, AttributeError):
-            channel_name = f"Channel {channel_id}"
+        channel_name = feed.title
+        async_store_prefetched_feed(hass, channel_id, feed, response)
         
         # Se l'utente non ha fornito un nome, usa quello del canale
         if not data.get(CONF_NAME):
@@ -91,6 +91,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         CONF_CHANNEL_ID: channel_id,
         CONF_NAME: data[CONF_NAME],
         CONF_INCLUDE_SHORTS: data.get(CONF_INCLUDE_SHORTS, False),
+        CONF_SCAN_INTERVAL: data[CONF_SCAN_INTERVAL],
     }
 
 
@@ -162,6 +163,13 @@ class YouTubeSensorConfigFlow(ConfigFlow, domain=DOMAIN):
         
         return self.async_create_entry(title=info["title"], data=info)
 
+    async def async_step_bulk_import(self, user_input: dict[str, Any]) -> FlowResult:
+        """Handle a channel of a bulk import, already validated by the importer."""
+        await self.async_set_unique_id(user_input[CONF_CHANNEL_ID])
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(title=user_input["title"], data=user_input)
+
 
 class CannotConnect(Exception):
     """Error to indicate we cannot connect."""
@@ -1,10 +1,16 @@
 """Constants for the YouTube Sensor integration."""
+from datetime import timedelta
 
 DOMAIN = "youtube_sensor"
 
 CONF_CHANNEL_ID = "channel_id"
 CONF_INCLUDE_SHORTS = "includeShorts"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_MAX_CONCURRENCY = "max_concurrent_requests"
+CONF_REQUESTS_PER_SECOND = "requests_per_second"
+CONF_WEBSUB = "websub"
+CONF_WEBSUB_HUB = "websub_hub"
+CONF_FEED_ONLY = "feed_only"
 
 ICON = "mdi:youtube"
 
@@ -15,6 +21,175 @@ DEFAULT_SCAN_INTERVAL = 15
 MIN_SCAN_INTERVAL = 5
 MAX_SCAN_INTERVAL = 120
 
+# Shared coordinator: how often it checks which channels are due, and how
+# many channels it polls at the same time
+DATA_COORDINATOR = "coordinator"
+DATA_COORDINATOR_LOCK = "coordinator_lock"
+COORDINATOR_TICK = timedelta(minutes=1)
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Adaptive polling: an hour of the day is an upload window when it holds at
+# least ADAPTIVE_MIN_UPLOADS uploads and ADAPTIVE_HOT_SHARE of the feed.
+# Idle channels back off up to ADAPTIVE_MAX_FACTOR times their scan interval,
+# and never beyond ADAPTIVE_MAX_INTERVAL minutes.
+ADAPTIVE_MIN_UPLOADS = 2
+ADAPTIVE_HOT_SHARE = 0.2
+ADAPTIVE_MAX_FACTOR = 16
+ADAPTIVE_MAX_INTERVAL = 6 * 60
+ADAPTIVE_WINDOW_LEAD = timedelta(minutes=30)
+
 BASE_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
 CHANNEL_LIVE_URL = "https://www.youtube.com/channel/{}"
-SHORTS_URL = "https://www.youtube.com/shorts/{}"
\ No newline at end of file
+SHORTS_URL = "https://www.youtube.com/shorts/{}"
+WATCH_URL = "https://www.youtube.com/watch?v={}"
+THUMBNAIL_URL = "https://i.ytimg.com/vi/{}/hqdefault.jpg"
+
+# Shared HTTP session
+DATA_SESSION = "session"
+DATA_SESSION_UNSUB_CLOSE = "session_unsub_close"
+HTTP_LIMIT = 100
+HTTP_LIMIT_PER_HOST = 16
+HTTP_KEEPALIVE_TIMEOUT = 60  # seconds
+HTTP_DNS_CACHE_TTL = 300  # seconds
+REQUEST_TIMEOUT = 10  # seconds, counted once the rate limiter lets a request through
+
+# Integration-wide rate limiter, and back-off after 429/5xx answers
+DATA_CLIENT = "client"
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+RATE_BURST = 10
+RATE_BACKOFF_BASE = 30  # seconds
+RATE_BACKOFF_MAX = 15 * 60  # seconds
+
+# WebSub push mode: channels with an active subscription are only polled
+# every WEBSUB_POLL_INTERVAL as a safety net
+DEFAULT_WEBSUB_HUB = "https://pubsubhubbub.appspot.com/subscribe"
+WEBSUB_STORAGE_KEY = f"{DOMAIN}.websub"
+WEBSUB_LEASE_SECONDS = 5 * 24 * 60 * 60
+WEBSUB_RENEW_CHECK = timedelta(hours=1)
+WEBSUB_RENEW_MARGIN = timedelta(days=1)
+# Subscriptions the hub never verified are sent again less and less often, at most this far apart
+WEBSUB_RETRY_MAX = timedelta(days=1)
+WEBSUB_POLL_INTERVAL = timedelta(hours=6)
+# Delay before polling the full feed after a push (for thumbnails and statistics)
+WEBSUB_REFRESH_DELAY = timedelta(minutes=10)
+
+# Each poll is delayed by up to this fraction of its interval, so channels drift apart
+POLL_JITTER = 0.1
+
+# Streaming page scanner
+SCAN_CHUNK_SIZE = 64 * 1024
+SCAN_OVERLAP = 512  # longest pattern that can span two chunks
+SCAN_MAX_BYTES = 4 * 1024 * 1024
+
+# Persistent storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60  # seconds
+
+# Shared cache of Short/not-Short verdicts, keyed by video ID
+DATA_SHORTS_CACHE = "shorts_cache"
+SHORTS_CACHE_STORAGE_KEY = f"{DOMAIN}.shorts_cache"
+SHORTS_CACHE_MAX_SIZE = 10000
+SHORTS_CACHE_MAX_AGE = 90 * 24 * 60 * 60  # seconds
+
+# Cache of channel avatar URLs, keyed by channel ID
+DATA_AVATAR_CACHE = "avatar_cache"
+AVATAR_CACHE_STORAGE_KEY = f"{DOMAIN}.avatar_cache"
+AVATAR_CACHE_MAX_SIZE = 5000
+AVATAR_CACHE_MAX_AGE = 3 * 24 * 60 * 60  # seconds
+
+# Last known state of every channel, restored at startup, keyed by channel key
+DATA_STATE_CACHE = "state_cache"
+STATE_CACHE_STORAGE_KEY = f"{DOMAIN}.channels"
+STATE_CACHE_MAX_SIZE = 5000
+STATE_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+
+# Startup: channels restored from the state cache are first polled at a random
+# time within STARTUP_SPREAD; new channels STARTUP_DELAY after being added
+STARTUP_DELAY = timedelta(seconds=10)
+STARTUP_SPREAD = timedelta(minutes=5)
+
+# Minimum time between two checks of the channel page for a live stream
+# (while the channel is live it is checked at every update)
+CHANNEL_LIVE_CHECK_INTERVAL = timedelta(minutes=15)
+
+# Per-channel statistics: kinds of request, and upper bounds (seconds) of the
+# latency histogram buckets. A warning is logged when a channel has failed
+# STATS_FAILURE_WARNING updates in a row.
+REQUEST_FEED = "feed"
+REQUEST_WATCH = "watch"
+REQUEST_CHANNEL = "channel"
+REQUEST_SHORTS_PROBE = "shorts_probe"
+REQUEST_OTHER = "other"
+STATS_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Caches whose hit ratio is tracked (the feed "hits" when it is unchanged)
+CACHE_FEED = "feed"
+CACHE_SHORTS = "shorts"
+CACHE_AVATAR = "avatar"
+STATS_FAILURE_WARNING = 3
+
+# Tiers of the Short classifier, from cheapest to most expensive
+SHORT_TIER_FEED = "feed"  # solo in modalità feed_only
+SHORT_TIER_CACHE = "cache"
+SHORT_TIER_PROBE = "probe"
+SHORT_TIER_PAGE = "page"
+
+# Feed entries classified at the same time while looking for a regular video:
+# the one being read and the next one, so older entries are only checked when
+# needed; after a Short (others likely follow) up to SHORTS_CLASSIFY_CONCURRENCY
+SHORTS_CLASSIFY_WINDOW = 2
+SHORTS_CLASSIFY_CONCURRENCY = 4
+
+# Bulk import of channels from an OPML/subscriptions export. Feeds downloaded
+# to validate a channel are kept for its first update for up to
+# PREFETCH_MAX_AGE, so each new channel costs a single feed request.
+SERVICE_IMPORT_CHANNELS = "import_channels"
+ATTR_SUBSCRIPTIONS = "subscriptions"
+ATTR_FILE = "file"
+SOURCE_BULK_IMPORT = "bulk_import"
+DATA_PREFETCHED = "prefetched_feeds"
+PREFETCH_MAX_AGE = timedelta(minutes=10)
+
+# History of the recent videos of each channel, answered from memory by the
+# get_recent_videos service
+HISTORY_SIZE = 25
+SERVICE_GET_RECENT_VIDEOS = "get_recent_videos"
+ATTR_SHORTS = "shorts"
+ATTR_LIVE = "live"
+ATTR_SINCE = "since"
+ATTR_LIMIT = "limit"
+DEFAULT_RECENT_VIDEOS = 50
+
+# Views and stars change at every poll: on their own, they are written to the
+# state machine at most this often
+VOLATILE_ATTRIBUTES_REFRESH = timedelta(hours=1)
+
+# Live streams: the watch page of an upcoming stream is checked again
+# STREAM_START_DELAY after its scheduled start, then every STREAM_LATE_RECHECK
+# until it starts (for at most STREAM_LATE_GIVE_UP); a live stream is checked
+# every STREAM_LIVE_RECHECK until it ends
+STREAM_UPCOMING = "upcoming"
+STREAM_LIVE = "live"
+STREAM_ENDED = "ended"
+STREAM_START_DELAY = timedelta(seconds=30)
+STREAM_LATE_RECHECK = timedelta(minutes=2)
+STREAM_LATE_GIVE_UP = timedelta(hours=2)
+STREAM_LIVE_RECHECK = timedelta(minutes=5)
+
+# Circuit breakers: after BREAKER_THRESHOLD failed requests of a kind in a row
+# (timeouts, errors, 404...), a channel stops sending them for BREAKER_COOLDOWN,
+# or BREAKER_GONE_COOLDOWN if YouTube answered that its feed or page does not
+# exist; the cool-down doubles every time, up to BREAKER_COOLDOWN_MAX. Then a
+# single request tests whether they work again. While the feed's breaker is
+# not closed the channel's sensor is unavailable.
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = timedelta(minutes=15)
+BREAKER_GONE_COOLDOWN = timedelta(hours=6)
+BREAKER_COOLDOWN_MAX = timedelta(hours=24)
+
+# Parsing of pages and feeds, in a thread pool of its own: at most
+# PARSE_WORKERS chunks are parsed at once and PARSE_BACKLOG more wait
+PARSE_WORKERS = 2
+PARSE_BACKLOG = 4
@@ -0,0 +1,957 @@
+"""Shared coordinator polling every monitored YouTube channel."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from http import HTTPStatus
+import logging
+import random
+import time
+from typing import NamedTuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    async_get_client,
+    is_channel_live,
+    is_live,
+    is_youtube_short,
+    probe_youtube_short,
+)
+from .cache import (
+    AvatarCache,
+    ShortsCache,
+    StateCache,
+    async_get_avatar_cache,
+    async_get_shorts_cache,
+    async_get_state_cache,
+)
+from .const import (
+    BASE_URL,
+    BREAKER_OPEN,
+    CACHE_AVATAR,
+    CACHE_FEED,
+    CACHE_SHORTS,
+    CHANNEL_LIVE_CHECK_INTERVAL,
+    CHANNEL_LIVE_URL,
+    CONF_CHANNEL_ID,
+    CONF_FEED_ONLY,
+    CONF_INCLUDE_SHORTS,
+    CONF_MAX_CONCURRENCY,
+    CONF_SCAN_INTERVAL,
+    CONF_WEBSUB,
+    CONF_WEBSUB_HUB,
+    COORDINATOR_TICK,
+    DATA_COORDINATOR,
+    DATA_COORDINATOR_LOCK,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_WEBSUB_HUB,
+    DOMAIN,
+    POLL_JITTER,
+    SHORT_TIER_CACHE,
+    SHORT_TIER_FEED,
+    SHORT_TIER_PAGE,
+    SHORT_TIER_PROBE,
+    SHORTS_CLASSIFY_CONCURRENCY,
+    SHORTS_CLASSIFY_WINDOW,
+    STATS_FAILURE_WARNING,
+    STARTUP_DELAY,
+    STARTUP_SPREAD,
+    STREAM_LATE_GIVE_UP,
+    STREAM_LATE_RECHECK,
+    STREAM_LIVE,
+    STREAM_LIVE_RECHECK,
+    STREAM_START_DELAY,
+    STREAM_UPCOMING,
+    WEBSUB_POLL_INTERVAL,
+    WEBSUB_REFRESH_DELAY,
+)
+from .breaker import ChannelBreakers
+from .feed import (
+    FeedParser,
+    async_parse_feed,
+    async_pop_prefetched_feed,
+    feed_maybe_stream,
+    feed_short_verdict,
+)
+from .history import VideoHistory
+from .scheduler import PollScheduler
+from .stats import ChannelStats, InstrumentedClient
+from .websub import WebSubManager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FeedEntryRecord(NamedTuple):
+    """What is remembered of a feed entry that has already been processed."""
+
+    published: str | None
+    updated: str | None
+    # None se il video non è mai servito classificarlo
+    is_short: bool | None
+
+
+class YoutubeChannel:
+    """Latest known state of a monitored channel."""
+
+    # Campi salvati nella cache di stato e ripristinati all'avvio
+    SNAPSHOT_FIELDS = (
+        'feed_title', 'title', 'thumbnail', 'url', 'content_id', 'published', 'stars',
+        'views', 'stream', 'stream_state', 'live', 'stream_start', 'channel_live',
+        'channel_image', 'is_short', 'etag', 'last_modified', 'feed_hash', 'shorts_skipped',
+    )
+
+    def __init__(self, channel_id, name, include_shorts=False, scan_interval=DEFAULT_SCAN_INTERVAL):
+        self.channel_id = channel_id
+        self.name = name
+        self.include_shorts = include_shorts
+        self.scheduler = PollScheduler(scan_interval)
+        self.feed_title = None
+        self.title = None
+        self.thumbnail = None
+        self.url = None
+        self.content_id = None
+        self.published = None
+        self.stars = 0
+        self.views = 0
+        self.stream = False
+        # Stato della diretta del video mostrato: upcoming, live, ended (o None)
+        self.stream_state = None
+        self.live = False
+        self.stream_start = None
+        self.channel_live = False
+        self.channel_image = None
+        self.live_checked = None
+        # Ultima diretta (in programma, in corso o finita) mostrata dal canale
+        self.last_stream = None
+        self.is_short = False
+        # Validatori del feed per le richieste condizionali
+        self.etag = None
+        self.last_modified = None
+        self.feed_hash = None
+        # Video del feed già elaborati, per video ID
+        self.entries: dict[str, FeedEntryRecord] = {}
+        # Ultimi video visti nel feed, per il servizio get_recent_videos
+        self.history = VideoHistory()
+        self.next_update = None
+        self.refs = 0
+        # Entità che mostrano l'ultimo Short: senza, non lo si cerca nel feed
+        self.short_watchers = 0
+        # True se l'ultimo Short potrebbe essere tra i video non classificati
+        self.shorts_skipped = False
+        # Costo e salute degli aggiornamenti (non salvati tra i riavvii)
+        self.stats = ChannelStats()
+        # Interruttori per tipo di richiesta: un canale guasto smette di interrogare YouTube
+        self.breakers = ChannelBreakers(name)
+
+    @property
+    def available(self):
+        """Return False while the channel's feed cannot be read (e.g. deleted channel)."""
+        return self.breakers.feed.retry_at is None
+
+    @property
+    def latest_short(self):
+        """Return the latest Short of the channel, as returned by the query service (None if unknown)."""
+        video = self.history.latest(is_short=True)
+        return video.as_dict() if video is not None else None
+
+    def watch_shorts(self, watching):
+        """Count an entity showing the latest Short, or forget it when ``watching`` is False.
+
+        The first one forgets the feed validators if the updates stopped
+        before finding a Short, so the next one reads the feed again and
+        looks for it.
+        """
+        if watching and not self.short_watchers and self.shorts_skipped:
+            self.etag = self.last_modified = self.feed_hash = None
+            self.shorts_skipped = False
+        self.short_watchers = max(self.short_watchers + (1 if watching else -1), 0)
+
+    @property
+    def scan_interval(self):
+        """Return the configured scan interval, in minutes."""
+        return self.scheduler.scan_interval
+
+    @scan_interval.setter
+    def scan_interval(self, value):
+        self.scheduler.scan_interval = value
+
+    @property
+    def key(self):
+        """Return the key identifying this channel inside the coordinator."""
+        return channel_key(self.channel_id, self.include_shorts)
+
+    def shown_stream(self):
+        """Return the video shown, as remembered in ``last_stream``."""
+        return {
+            'video_id': self.content_id,
+            'title': self.title,
+            'url': self.url,
+            'thumbnail': self.thumbnail,
+            'published': self.published,
+            'stream_state': self.stream_state,
+            'stream_start': self.stream_start,
+        }
+
+    def snapshot(self):
+        """Return the state worth keeping across restarts, as JSON-friendly data."""
+        data = {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+        data['entries'] = {video_id: list(record) for video_id, record in self.entries.items()}
+        data['history'] = self.history.as_list()
+        if self.stream_start is not None:
+            data['stream_start'] = self.stream_start.isoformat()
+        if self.last_stream is not None:
+            data['last_stream'] = {
+                **self.last_stream,
+                'stream_start': _isoformat(self.last_stream['stream_start']),
+            }
+        data['idle_polls'] = self.scheduler.idle_polls
+        data['hot_hours'] = sorted(self.scheduler.hot_hours)
+        data['breakers'] = self.breakers.snapshot()
+        data['next_update'] = self.next_update.isoformat() if self.next_update else None
+        return data
+
+    def restore(self, data):
+        """Restore the state saved by ``snapshot``."""
+        for field in self.SNAPSHOT_FIELDS:
+            if field in data:
+                setattr(self, field, data[field])
+        self.entries = {
+            video_id: FeedEntryRecord(*record)
+            for video_id, record in data.get('entries', {}).items()
+        }
+        self.history = VideoHistory.from_list(data.get('history', ()))
+        if isinstance(self.stream_start, str):
+            self.stream_start = dt_util.parse_datetime(self.stream_start)
+        if (last_stream := data.get('last_stream')) is not None:
+            self.last_stream = {
+                **last_stream,
+                'stream_start': (
+                    dt_util.parse_datetime(last_stream['stream_start'])
+                    if last_stream.get('stream_start') else None
+                ),
+            }
+        elif self.stream:
+            # Stato salvato prima che l'ultima diretta fosse ricordata a parte
+            self.last_stream = self.shown_stream()
+        self.scheduler.idle_polls = data.get('idle_polls', 0)
+        self.scheduler.hot_hours = frozenset(data.get('hot_hours', ()))
+        self.breakers.restore(data.get('breakers', {}))
+        if next_update := data.get('next_update'):
+            self.next_update = dt_util.parse_datetime(next_update)
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def channel_key(channel_id, include_shorts):
+    """Return the coordinator key for a channel and its Shorts setting."""
+    return f"{channel_id}_{'shorts' if include_shorts else 'videos'}"
+
+
+def _is_latest(channel: YoutubeChannel, video_id, published):
+    """Return True if a video is the one shown, or was published after it."""
+    if channel.content_id is None or video_id == channel.content_id:
+        return True
+    new = dt_util.parse_datetime(published) if published else None
+    current = dt_util.parse_datetime(channel.published) if channel.published else None
+    return new is not None and (current is None or new > current)
+
+
+class YoutubeCoordinator(DataUpdateCoordinator):
+    """Poll the feeds of every channel, with a bounded number of channels at a time.
+
+    The coordinator ticks every ``COORDINATOR_TICK`` and only polls the channels
+    whose own scan interval has elapsed.
+    """
+
+    def __init__(self, hass: HomeAssistant, shorts_cache: ShortsCache, avatar_cache: AvatarCache, state_cache: StateCache, max_concurrency=DEFAULT_MAX_CONCURRENCY, feed_only=False):
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=COORDINATOR_TICK)
+        self.shorts_cache = shorts_cache
+        # Classifica e controlla le dirette con i soli dati del feed, se possibile
+        self.feed_only = feed_only
+        self.avatar_cache = avatar_cache
+        self.state_cache = state_cache
+        self.channels: dict[str, YoutubeChannel] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Quante decisioni Short/non-Short ha preso ogni livello del classificatore
+        self.short_tiers: Counter[str] = Counter()
+        # Gestore delle notifiche push, se attivo
+        self.websub = None
+        # Primo aggiornamento dei canali nuovi, già programmato
+        self._unsub_startup: CALLBACK_TYPE | None = None
+        # ID dei canali in aggiornamento, che un altro ciclo (o una notifica) non deve toccare
+        self._polling: set[str] = set()
+        # Ultima notifica push arrivata durante l'aggiornamento del canale, per ID
+        self._deferred_pushes: dict[str, FeedParser] = {}
+        # Prossimo controllo delle dirette seguite, per chiave del canale
+        self._stream_checks: dict[str, CALLBACK_TYPE] = {}
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_cancel_stream_checks)
+
+    @property
+    def session(self):
+        """Return the shared, rate-limited HTTP client."""
+        return async_get_client(self.hass)
+
+    @callback
+    def async_register_channel(self, channel_id, name, include_shorts=False, scan_interval=DEFAULT_SCAN_INTERVAL):
+        """Start monitoring a channel, without waiting for YouTube.
+
+        Entities asking for the same channel with the same Shorts setting share
+        a single YoutubeChannel, so it is only polled once. A channel seen
+        before starts from its saved state and is first polled at a random
+        time within STARTUP_SPREAD; a new one is polled STARTUP_DELAY later.
+        """
+        key = channel_key(channel_id, include_shorts)
+        if (channel := self.channels.get(key)) is None:
+            subscribe = self.websub is not None and not self._channels_for(channel_id)
+            channel = self.channels[key] = YoutubeChannel(channel_id, name, include_shorts, scan_interval)
+            if subscribe:
+                self.hass.async_create_task(self.websub.async_subscribe(channel_id))
+            now = dt_util.utcnow()
+            if (saved := self.state_cache.get(key)) is not None:
+                channel.restore(saved)
+                # Sfasa il primo aggiornamento: l'avvio non deve attendere YouTube
+                spread = now + STARTUP_SPREAD * random.random()
+                channel.next_update = max(channel.next_update or spread, spread)
+                _LOGGER.debug('%s - Restored, next update at %s', channel.name, channel.next_update)
+                self._async_schedule_stream_check(channel)
+            else:
+                channel.next_update = now
+                self._async_schedule_startup_refresh()
+        else:
+            channel.scan_interval = min(channel.scan_interval, scan_interval)
+        channel.refs += 1
+        return channel
+
+    def saved_title(self, channel_id):
+        """Return the feed title saved for a channel, if it was monitored before."""
+        for include_shorts in (False, True):
+            if (saved := self.state_cache.get(channel_key(channel_id, include_shorts))) is not None:
+                if saved.get('feed_title'):
+                    return saved['feed_title']
+        return None
+
+    @callback
+    def _async_schedule_startup_refresh(self) -> None:
+        """Poll the new channels shortly, in the background."""
+        if self._unsub_startup is not None:
+            return
+
+        @callback
+        def _async_startup_refresh(_now):
+            self._unsub_startup = None
+            self.hass.async_create_task(self.async_refresh())
+
+        self._unsub_startup = async_call_later(self.hass, STARTUP_DELAY, _async_startup_refresh)
+
+    @callback
+    def async_unregister_channel(self, channel: YoutubeChannel) -> None:
+        """Stop monitoring a channel once no entity uses it anymore."""
+        channel.refs -= 1
+        if channel.refs <= 0 and self.channels.get(channel.key) is channel:
+            del self.channels[channel.key]
+            if (unsub := self._stream_checks.pop(channel.key, None)) is not None:
+                unsub()
+            if self.websub is not None and not self._channels_for(channel.channel_id):
+                self.hass.async_create_task(self._async_unsubscribe(channel.channel_id))
+
+    async def _async_unsubscribe(self, channel_id) -> None:
+        """Unsubscribe a channel from WebSub, stopping the webhook if it was the last one."""
+        await self.websub.async_unsubscribe(channel_id)
+        # Es. ultima entry scaricata: nessuna notifica e nessun rinnovo da attendere
+        if not self.channels:
+            self.websub.async_stop()
+
+    def _channels_for(self, channel_id):
+        """Return the monitored channels with a given channel ID."""
+        return [channel for channel in self.channels.values() if channel.channel_id == channel_id]
+
+    async def async_handle_push(self, channel_id, feed: FeedParser) -> None:
+        """Apply the entries pushed by the WebSub hub for a channel (already parsed).
+
+        A notification for a channel being updated (by a poll or another
+        notification) is applied once that update is over.
+        """
+        if channel_id in self._polling:
+            _LOGGER.debug('Channel %s is being updated, deferring its push notification', channel_id)
+            self._deferred_pushes[channel_id] = feed
+            return
+        self._polling.add(channel_id)
+        try:
+            await self._async_apply_push(channel_id, feed)
+        finally:
+            self._async_release(channel_id)
+
+    async def _async_apply_push(self, channel_id, feed: FeedParser) -> None:
+        for channel in self._channels_for(channel_id):
+            try:
+                await self._async_process_feed(channel, feed, partial=True)
+                await self._async_update_channel_page(channel)
+                self.state_cache.set(channel.key, channel.snapshot())
+            except Exception as error:  # pylint: disable=broad-except
+                _LOGGER.debug('%s - Could not apply push notification - %s', channel.name, error)
+            # Rileggi il feed completo più tardi, per miniature e statistiche
+            refresh = dt_util.utcnow() + WEBSUB_REFRESH_DELAY
+            if channel.next_update is None or channel.next_update > refresh:
+                channel.next_update = refresh
+        self.async_update_listeners()
+
+    async def _async_update_data(self):
+        """Poll every channel that is due.
+
+        Channels with the same ID (monitored with and without Shorts) are
+        polled together as soon as one of them is due, so they share their
+        requests; the pages kept for sharing are dropped at the end of the
+        cycle. A cycle can start while another is running (e.g. the first
+        refresh of channels added during a long cycle): channels still being
+        polled by the other one are left to it.
+        """
+        now = dt_util.utcnow()
+        groups: dict[str, list[YoutubeChannel]] = {}
+        due = set()
+        for channel in self.channels.values():
+            groups.setdefault(channel.channel_id, []).append(channel)
+            if channel.channel_id in self._polling:
+                continue
+            if channel.next_update is None or channel.next_update <= now:
+                due.add(channel.channel_id)
+        if due:
+            _LOGGER.debug('Polling %d of %d channel IDs', len(due), len(groups))
+            self._polling.update(due)
+            # Canali il cui aggiornamento non è ancora partito
+            waiting = set(due)
+            try:
+                with self.session.flights.cycle():
+                    await asyncio.gather(*(
+                        self._async_poll(channels, waiting) for channel_id, channels in groups.items()
+                        if channel_id in due
+                    ))
+            finally:
+                # Anche se il ciclo è annullato prima che un canale sia partito
+                for channel_id in waiting:
+                    self._async_release(channel_id)
+        return self.channels
+
+    async def _async_poll(self, channels: list[YoutubeChannel], waiting: set[str]) -> None:
+        waiting.discard(channels[0].channel_id)
+        try:
+            await self._async_poll_channels(channels)
+        finally:
+            self._async_release(channels[0].channel_id)
+
+    @callback
+    def _async_release(self, channel_id) -> None:
+        """Let a channel be updated again, applying the push notification that waited for it."""
+        self._polling.discard(channel_id)
+        if (feed := self._deferred_pushes.pop(channel_id, None)) is not None:
+            self.hass.async_create_task(self.async_handle_push(channel_id, feed))
+
+    async def _async_poll_channels(self, channels: list[YoutubeChannel]) -> None:
+        active = []
+        for channel in channels:
+            feed_breaker = channel.breakers.feed
+            if feed_breaker.state == BREAKER_OPEN:
+                # Canale guasto o eliminato: niente richieste né posti fino alla prossima prova
+                _LOGGER.debug('%s - Feed paused until %s', channel.name, feed_breaker.retry_at)
+            else:
+                active.append(channel)
+        if active:
+            async with self._semaphore:
+                await asyncio.gather(*(self._async_update_channel(channel) for channel in active))
+        for channel in channels:
+            self._async_schedule_poll(channel)
+
+    @callback
+    def _async_schedule_poll(self, channel: YoutubeChannel) -> None:
+        """Schedule the next poll of a channel, and save its state."""
+        # Sfasa i canali tra loro per non interrogarli tutti nello stesso istante
+        now = dt_util.utcnow()
+        next_update = channel.scheduler.next_poll(now)
+        if self.websub is not None and self.websub.is_active(channel.channel_id):
+            # Le novità arrivano via push: il polling è solo una rete di sicurezza
+            next_update = max(next_update, now + WEBSUB_POLL_INTERVAL)
+        if (retry_at := channel.breakers.feed.retry_at) is not None:
+            next_update = max(next_update, retry_at)
+        channel.next_update = next_update + (next_update - now) * random.uniform(0, POLL_JITTER)
+        _LOGGER.debug('%s - Next update at %s', channel.name, channel.next_update)
+        self.state_cache.set(channel.key, channel.snapshot())
+
+    async def _async_is_short(self, channel: YoutubeChannel, video_id):
+        """Return whether a video is a Short, asking YouTube only for unknown videos.
+
+        Returns None if the video could not be classified.
+        """
+        verdict, tier = await self._async_classify_short(channel, video_id)
+        if verdict is None:
+            # Verifica fallita: non salvare nulla, si riprova al prossimo aggiornamento
+            return None
+        self.short_tiers[tier] += 1
+        _LOGGER.debug('%s - Short verdict for %s from %s: %s', channel.name, video_id, tier, verdict)
+        if tier != SHORT_TIER_CACHE:
+            self.shorts_cache.set(video_id, verdict)
+        return verdict
+
+    async def _async_find_latest(self, channel: YoutubeChannel, video_ids, verdicts):
+        """Return the feed indexes of the latest regular video and of the latest Short.
+
+        ``verdicts`` holds the Short verdicts already known, and receives the
+        new ones. The videos are read in feed order, classifying the next
+        SHORTS_CLASSIFY_WINDOW - 1 ones meanwhile (SHORTS_CLASSIFY_CONCURRENCY - 1
+        once a Short was read, so a run of Shorts costs a few round trips, not
+        one each). The search stops as soon as the sensor has its video: the
+        latest Short is looked for too only while an entity shows it, so older
+        videos are not checked for nothing. Every view of the channel comes
+        from this single pass. An index is None if the feed has no video of
+        that kind (or if it was not looked for); a video that could not be
+        classified counts as a regular one.
+        """
+        latest = {False: None, True: None}
+        wanted = []
+        if not channel.include_shorts:
+            wanted.append(False)
+        if channel.short_watchers:
+            wanted.append(True)
+
+        async def _async_classify(video_id):
+            if video_id in verdicts:
+                return verdicts[video_id]
+            verdict = await self._async_is_short(channel, video_id)
+            if verdict is not None:
+                verdicts[video_id] = verdict
+            return bool(verdict)
+
+        tasks = {}
+        window = SHORTS_CLASSIFY_WINDOW
+        try:
+            for index in range(len(video_ids)):
+                for ahead in range(index, min(index + window, len(video_ids))):
+                    if ahead not in tasks:
+                        tasks[ahead] = asyncio.create_task(_async_classify(video_ids[ahead]))
+                is_short = await tasks[index]
+                if is_short:
+                    # Dopo uno Short ne seguono spesso altri: classificali insieme
+                    window = SHORTS_CLASSIFY_CONCURRENCY
+                if is_short and latest[False] is None and not channel.include_shorts:
+                    _LOGGER.debug('%s - Skipping Short video: %s', channel.name, video_ids[index])
+                if latest[is_short] is None:
+                    latest[is_short] = index
+                # Con i Short inclusi basta il primo video (e il suo verdetto)
+                if all(latest[kind] is not None for kind in wanted):
+                    if latest[True] is None and index + 1 < len(video_ids):
+                        channel.shorts_skipped = True
+                    break
+            return latest[False], latest[True]
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    async def _async_classify_short(self, channel: YoutubeChannel, video_id):
+        """Classify a video with the cheapest tier that gives an answer.
+
+        Returns the verdict (None if unknown) and the tier that decided it.
+        """
+        verdict = self.shorts_cache.get(video_id)
+        channel.stats.record_cache(CACHE_SHORTS, verdict is not None)
+        if verdict is not None:
+            return verdict, SHORT_TIER_CACHE
+        client = self._client(channel)
+        if (verdict := await probe_youtube_short(video_id, channel.name, client)) is not None:
+            return verdict, SHORT_TIER_PROBE
+        return await is_youtube_short(video_id, channel.name, client), SHORT_TIER_PAGE
+
+    async def _async_update_channel_page(self, channel: YoutubeChannel) -> None:
+        """Check whether the channel is live, and read its avatar if not cached.
+
+        The avatar comes from the long-lived avatar cache; the channel page is
+        only downloaded when the avatar has expired or the live status is due
+        for a check (every CHANNEL_LIVE_CHECK_INTERVAL, or at every update
+        while the channel is live). In feed-only mode the page is never
+        downloaded: the channel is live when the video shown is, and the
+        avatar is only shown if cached.
+        """
+        now = dt_util.utcnow()
+        channel.channel_image = self.avatar_cache.get(channel.channel_id)
+        want_image = channel.channel_image is None
+        channel.stats.record_cache(CACHE_AVATAR, not want_image)
+        if self.feed_only:
+            return
+        live_due = (
+            channel.channel_live
+            or channel.live_checked is None
+            or now - channel.live_checked >= CHANNEL_LIVE_CHECK_INTERVAL
+        )
+        if not want_image and not live_due:
+            _LOGGER.debug('%s - Skipping channel page check', channel.name)
+            return
+
+        channel_url = CHANNEL_LIVE_URL.format(channel.channel_id)
+        live, image = await is_channel_live(
+            channel_url, channel.name, self.hass, self._client(channel), want_image=want_image
+        )
+        if live is not None:
+            channel.channel_live = live
+        channel.live_checked = now
+        if image is not None:
+            channel.channel_image = image
+            self.avatar_cache.set(channel.channel_id, image)
+
+    async def _async_process_feed(self, channel: YoutubeChannel, feed: FeedParser, partial=False) -> None:
+        """Apply a parsed Atom feed to a channel.
+
+        ``partial`` feeds (WebSub notifications) only hold the entries that
+        changed: they are merged with what is already known instead of
+        replacing it.
+        """
+        # Titolo del canale (le notifiche push hanno un titolo generico)
+        if not partial:
+            channel.feed_title = feed.title
+
+        # Confronta i video del feed, nell'ordine del feed, con quelli già
+        # elaborati: solo i video nuovi o modificati vanno riclassificati
+        candidates = []
+        verdicts = {}
+        uploads = []
+        for entry in feed.entries:
+            if entry.published and (published_at := dt_util.parse_datetime(entry.published)) is not None:
+                uploads.append(dt_util.as_utc(published_at))
+            record = channel.entries.get(entry.video_id)
+            changed = (
+                record is None
+                or record.published != entry.published
+                or record.updated != entry.updated
+            )
+            if not changed and record.is_short is not None:
+                verdicts[entry.video_id] = record.is_short
+            elif self.feed_only and (verdict := feed_short_verdict(entry)) is not None:
+                verdicts[entry.video_id] = verdict
+                self.short_tiers[SHORT_TIER_FEED] += 1
+            candidates.append((entry, changed))
+
+        # Trova il primo video secondo le impostazioni (e intanto l'ultimo Short)
+        video, short = await self._async_find_latest(channel, [entry.video_id for entry, _ in candidates], verdicts)
+        if channel.include_shorts and candidates:
+            found = 0, short == 0
+        else:
+            found = (video, False) if video is not None else None
+        if found is not None and partial:
+            entry = candidates[found[0]][0]
+            if not _is_latest(channel, entry.video_id, entry.published):
+                # Notifica per un video più vecchio di quello mostrato (es. titolo modificato)
+                found = None
+
+        if found is not None:
+            index, is_short = found
+            entry, changed = candidates[index]
+            if is_short:
+                _LOGGER.debug('%s - Found Short video: %s', channel.name, entry.video_id)
+            else:
+                _LOGGER.debug('%s - Found non-Short video: %s', channel.name, entry.video_id)
+        elif candidates and not partial:
+            if channel.include_shorts:
+                _LOGGER.warning('%s - No videos found in feed', channel.name)
+            else:
+                _LOGGER.warning('%s - No non-Short videos found in feed', channel.name)
+
+            # Fallback al video più recente se non ci sono video che soddisfano i criteri
+            entry, changed = candidates[0]
+            is_short = verdicts.get(entry.video_id)
+            if is_short is None:
+                is_short = bool(await self._async_is_short(channel, entry.video_id))
+        else:
+            entry = None
+
+        channel.history.update(feed.entries, verdicts)
+
+        if entry is not None:
+            # Stars e views cambiano a ogni aggiornamento
+            channel.stars = entry.stars
+            channel.views = entry.views
+
+            shown = entry.video_id == channel.content_id
+            if changed or not shown:
+                channel.url = entry.url
+                channel.content_id = entry.video_id
+                channel.published = entry.published
+                channel.title = entry.title
+                channel.thumbnail = entry.thumbnail
+                channel.is_short = is_short
+
+            # Controlla se è live/stream, solo per un video nuovo o modificato:
+            # le dirette in programma o in corso le ricontrolla il loro timer
+            if not changed and shown:
+                _LOGGER.debug('%s - Skipping live check', channel.name)
+            elif self.feed_only and (is_short or not feed_maybe_stream(entry)):
+                # Né gli Short né i video con visualizzazioni sono dirette in programma o in corso
+                _LOGGER.debug('%s - Not a stream according to the feed', channel.name)
+                self._async_apply_stream(channel, (None, None))
+            else:
+                self._async_apply_stream(channel, await is_live(channel.url, channel.name, self.hass, self._client(channel)))
+
+        # Impara la cadenza di caricamento del canale (serve il feed completo)
+        if not partial:
+            channel.scheduler.update_uploads(uploads)
+        channel.scheduler.record_poll(
+            new_uploads=any(entry.video_id not in channel.entries for entry, _ in candidates)
+        )
+
+        # Ricorda tutti i video del feed, anche quelli mai classificati (verranno
+        # controllati quando serve): un video già visto non è un nuovo caricamento
+        records = {
+            entry.video_id: FeedEntryRecord(entry.published, entry.updated, verdicts.get(entry.video_id))
+            for entry, _ in candidates
+        }
+        if partial:
+            channel.entries.update(records)
+        else:
+            channel.entries = records
+
+    async def _async_update_channel(self, channel: YoutubeChannel) -> None:
+        """Update a channel - trova il primo video secondo le impostazioni di includeShorts."""
+        if channel.include_shorts:
+            _LOGGER.debug('%s - Running update (including Shorts) - scan interval: %d minutes',
+                         channel.name, channel.scan_interval)
+        else:
+            _LOGGER.debug('%s - Running update (excluding Shorts) - scan interval: %d minutes',
+                         channel.name, channel.scan_interval)
+
+        start = time.monotonic()
+        failure = None
+        try:
+            if (prefetched := async_pop_prefetched_feed(self.hass, channel.channel_id)) is not None:
+                # Il feed è appena stato scaricato per validare il canale
+                _LOGGER.debug('%s - Using the feed downloaded during setup', channel.name)
+                feed = prefetched.feed
+                etag, last_modified = prefetched.etag, prefetched.last_modified
+            else:
+                feed, etag, last_modified = await self._async_fetch_feed(channel)
+                if feed is None:
+                    _LOGGER.debug('%s - Feed not modified', channel.name)
+                    channel.stats.record_cache(CACHE_FEED, True)
+                    await self._async_handle_unchanged_feed(channel)
+                    return
+
+            # Alcune risposte non hanno validatori: confronta anche il contenuto
+            feed_hash = feed.digest
+            channel.stats.record_cache(CACHE_FEED, feed_hash == channel.feed_hash)
+            if feed_hash == channel.feed_hash:
+                _LOGGER.debug('%s - Feed unchanged', channel.name)
+                await self._async_handle_unchanged_feed(channel)
+                return
+
+            await self._async_process_feed(channel, feed)
+
+            # Controlla lo stato del canale
+            await self._async_update_channel_page(channel)
+
+            # Salva i validatori solo dopo un aggiornamento riuscito
+            channel.etag = etag
+            channel.last_modified = last_modified
+            channel.feed_hash = feed_hash
+
+        except Exception as error:  # pylint: disable=broad-except
+            failure = error
+            _LOGGER.debug('%s - Could not update - %s', channel.name, error)
+        finally:
+            self._record_update(channel, time.monotonic() - start, failure)
+
+    async def _async_handle_unchanged_feed(self, channel: YoutubeChannel) -> None:
+        """Finish a poll whose feed did not change.
+
+        Nothing is downloaded, unless the channel was live: its stream can
+        end without any change to the feed, so its page is checked again.
+        """
+        channel.scheduler.record_poll(new_uploads=False)
+        if channel.channel_live:
+            await self._async_update_channel_page(channel)
+
+    async def _async_fetch_feed(self, channel: YoutubeChannel):
+        """Download and parse the feed of a channel, with a conditional request.
+
+        Returns the feed (None if not modified) and its validators. Channels
+        with the same ID and validators (e.g. monitored with and without
+        Shorts) are polled together and share the request; the parsed feed
+        is not kept for later callers.
+        """
+        url = BASE_URL.format(channel.channel_id)
+        headers = {}
+        if channel.etag:
+            headers['If-None-Match'] = channel.etag
+        if channel.last_modified:
+            headers['If-Modified-Since'] = channel.last_modified
+        client = self._client(channel)
+
+        async def _async_fetch():
+            response = await client.get(url, headers=headers)
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                response.release()
+                return None, None, None
+            response.raise_for_status()
+            feed = await async_parse_feed(response, executor=client.parser)
+            return feed, response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+        return await client.flights.async_run(
+            ("GET", url, channel.etag, channel.last_modified), _async_fetch, keep=False
+        )
+
+    @callback
+    def _async_apply_stream(self, channel: YoutubeChannel, result) -> None:
+        """Apply the result of ``is_live`` (None if it failed) and schedule the next check."""
+        if result is not None:
+            channel.stream_state, channel.stream_start = result
+            channel.stream = channel.stream_state is not None
+            channel.live = channel.stream_state == STREAM_LIVE
+            channel.history.set_live(channel.content_id, channel.live)
+            if channel.stream:
+                channel.last_stream = channel.shown_stream()
+            elif channel.last_stream is not None and channel.last_stream['video_id'] == channel.content_id:
+                # La diretta seguita non lo è più (es. trasformata in video normale)
+                channel.last_stream = {**channel.last_stream, 'stream_state': None, 'stream_start': None}
+            self._async_stream_changed(channel)
+        self._async_schedule_stream_check(channel)
+
+    @callback
+    def _async_apply_tracked_stream(self, channel: YoutubeChannel, result) -> None:
+        """Apply the result of ``is_live`` for the latest stream, once a newer video is shown."""
+        if result is not None:
+            state, start = result
+            channel.last_stream = {**channel.last_stream, 'stream_state': state, 'stream_start': start}
+            channel.history.set_live(channel.last_stream['video_id'], state == STREAM_LIVE)
+            self._async_stream_changed(channel)
+        self._async_schedule_stream_check(channel)
+
+    @callback
+    def _async_stream_changed(self, channel: YoutubeChannel) -> None:
+        """Update what depends on the latest stream of a channel."""
+        if self.feed_only:
+            # Senza pagina del canale, è live se lo è la sua ultima diretta
+            channel.channel_live = (
+                channel.last_stream is not None and channel.last_stream['stream_state'] == STREAM_LIVE
+            )
+
+    @callback
+    def _async_schedule_stream_check(self, channel: YoutubeChannel) -> None:
+        """Schedule the next check of the latest stream of a channel, if it needs one.
+
+        The stream is followed even once a newer video is shown, until it
+        ends: an upcoming stream is checked just after its scheduled start
+        (then every STREAM_LATE_RECHECK while it is late), a live one every
+        STREAM_LIVE_RECHECK; an ended stream or a regular video is left to
+        the regular polls.
+        """
+        if (unsub := self._stream_checks.pop(channel.key, None)) is not None:
+            unsub()
+        if (stream := channel.last_stream) is None:
+            return
+        now = dt_util.utcnow()
+        if stream['stream_state'] == STREAM_LIVE:
+            when = now + STREAM_LIVE_RECHECK
+        elif stream['stream_state'] == STREAM_UPCOMING and stream['stream_start'] is not None:
+            start = dt_util.as_utc(stream['stream_start'])
+            if now - start > STREAM_LATE_GIVE_UP:
+                _LOGGER.debug('%s - Stream still not started, no more checks', channel.name)
+                return
+            when = start + STREAM_START_DELAY
+            if when <= now:
+                when = now + STREAM_LATE_RECHECK
+        else:
+            return
+
+        @callback
+        def _async_check(_now):
+            self._stream_checks.pop(channel.key, None)
+            self.hass.async_create_task(self._async_check_stream(channel))
+
+        _LOGGER.debug('%s - Next stream check at %s', channel.name, when)
+        self._stream_checks[channel.key] = async_track_point_in_time(self.hass, _async_check, when)
+
+    async def _async_check_stream(self, channel: YoutubeChannel) -> None:
+        """Check the watch page of a tracked stream, between the regular polls."""
+        if self.channels.get(channel.key) is not channel or (stream := channel.last_stream) is None:
+            return
+        async with self._semaphore:
+            result = await is_live(stream['url'], channel.name, self.hass, self._client(channel))
+        if stream['video_id'] == channel.content_id:
+            self._async_apply_stream(channel, result)
+        else:
+            self._async_apply_tracked_stream(channel, result)
+        if (state := channel.last_stream['stream_state']) != stream['stream_state']:
+            _LOGGER.debug('%s - Stream is now %s', channel.name, state)
+            self.state_cache.set(channel.key, channel.snapshot())
+            self.async_update_listeners()
+
+    @callback
+    def _async_cancel_stream_checks(self, _event: Event | None = None) -> None:
+        """Cancel every scheduled stream check."""
+        for unsub in self._stream_checks.values():
+            unsub()
+        self._stream_checks.clear()
+
+    def _client(self, channel: YoutubeChannel) -> InstrumentedClient:
+        """Return the shared client, recording the requests in the channel's statistics and breakers."""
+        return InstrumentedClient(self.session, channel.stats, channel.breakers)
+
+    @staticmethod
+    def _record_update(channel: YoutubeChannel, duration, error=None) -> None:
+        """Record the outcome of an update, and log when a channel starts or stops failing."""
+        failing = channel.stats.consecutive_failures >= STATS_FAILURE_WARNING
+        channel.stats.record_update(duration, error)
+        if channel.stats.consecutive_failures == STATS_FAILURE_WARNING:
+            _LOGGER.warning('%s - Could not update %d times in a row - %s',
+                            channel.name, STATS_FAILURE_WARNING, channel.stats.last_error)
+        elif failing and error is None:
+            _LOGGER.info('%s - Updating again', channel.name)
+
+
+async def async_get_coordinator(hass: HomeAssistant) -> YoutubeCoordinator:
+    """Return the integration-wide coordinator, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (coordinator := domain_data.get(DATA_COORDINATOR)) is not None:
+        return coordinator
+    # Le piattaforme di un'entry partono insieme: il coordinatore va creato
+    # una volta sola, e reso visibile solo quando WebSub è pronto
+    async with domain_data.setdefault(DATA_COORDINATOR_LOCK, asyncio.Lock()):
+        if (coordinator := domain_data.get(DATA_COORDINATOR)) is None:
+            coordinator = YoutubeCoordinator(
+                hass,
+                await async_get_shorts_cache(hass),
+                await async_get_avatar_cache(hass),
+                await async_get_state_cache(hass),
+                domain_data.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+                domain_data.get(CONF_FEED_ONLY, False),
+            )
+            if domain_data.get(CONF_WEBSUB):
+                websub = WebSubManager(
+                    hass, coordinator, domain_data.get(CONF_WEBSUB_HUB, DEFAULT_WEBSUB_HUB)
+                )
+                await websub.async_start()
+                coordinator.websub = websub
+            domain_data[DATA_COORDINATOR] = coordinator
+    return coordinator
+
+
+async def async_register_entry_channel(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> tuple[YoutubeCoordinator, YoutubeChannel]:
+    """Return the coordinator and the channel of a config entry, registering it.
+
+    Every platform of the entry registers the channel, which is polled once
+    for all of them, until the entry is unloaded: a disabled entity is never
+    added, so it could not unregister the channel itself.
+    """
+    coordinator = await async_get_coordinator(hass)
+    channel = coordinator.async_register_channel(
+        config_entry.data[CONF_CHANNEL_ID],
+        config_entry.data[CONF_NAME],
+        config_entry.data.get(CONF_INCLUDE_SHORTS, False),
+        config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+    )
+    config_entry.async_on_unload(lambda: coordinator.async_unregister_channel(channel))
+    return coordinator, channel
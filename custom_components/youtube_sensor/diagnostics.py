@@ -0,0 +1,87 @@
+"""Diagnostics support for YouTube Sensor."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_CHANNEL_ID, DATA_CLIENT, DATA_COORDINATOR, DOMAIN
+
+# Canali più costosi elencati nella sezione del coordinatore
+TOP_CHANNELS = 10
+
+
+def _channel_diagnostics(channel) -> dict[str, Any]:
+    return {
+        'key': channel.key,
+        'name': channel.name,
+        'include_shorts': channel.include_shorts,
+        'content_id': channel.content_id,
+        'is_short': channel.is_short,
+        'live': channel.live,
+        'channel_live': channel.channel_live,
+        'scan_interval_minutes': channel.scan_interval,
+        'idle_polls': channel.scheduler.idle_polls,
+        'upload_hours_utc': sorted(channel.scheduler.hot_hours),
+        'next_update': channel.next_update.isoformat() if channel.next_update else None,
+        'known_entries': len(channel.entries),
+        'available': channel.available,
+        'breakers': channel.breakers.as_dict(),
+        'stats': channel.stats.as_dict(),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Besides the entry's own channel, the coordinator section ranks the
+    channels that downloaded the most, to find the ones driving the load.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    channel_id = entry.data[CONF_CHANNEL_ID]
+    diagnostics: dict[str, Any] = {'entry': dict(entry.data), 'channels': []}
+
+    if (coordinator := domain_data.get(DATA_COORDINATOR)) is None:
+        return diagnostics
+
+    channels = list(coordinator.channels.values())
+    diagnostics['channels'] = [
+        _channel_diagnostics(channel) for channel in channels if channel.channel_id == channel_id
+    ]
+
+    busiest = sorted(channels, key=lambda channel: channel.stats.total_bytes, reverse=True)
+    coordinator_data = {
+        'channels': len(channels),
+        'feed_only': coordinator.feed_only,
+        'short_tiers': dict(coordinator.short_tiers),
+        'shorts_cache_size': len(coordinator.shorts_cache),
+        'avatar_cache_size': len(coordinator.avatar_cache),
+        'failing_channels': sum(1 for channel in channels if channel.stats.consecutive_failures),
+        'unavailable_channels': sum(1 for channel in channels if not channel.available),
+        'top_channels': [
+            {
+                'key': channel.key,
+                'name': channel.name,
+                'requests': channel.stats.total_requests,
+                'bytes': channel.stats.total_bytes,
+                'consecutive_failures': channel.stats.consecutive_failures,
+            }
+            for channel in busiest[:TOP_CHANNELS]
+        ],
+    }
+    if (client := domain_data.get(DATA_CLIENT)) is not None:
+        coordinator_data['rate_limiter'] = {
+            'requests_per_second': client.limiter.rate,
+            'failures': client.limiter.failures,
+            'blocked_for_seconds': round(client.limiter.blocked_for, 1),
+        }
+        coordinator_data['shared_requests'] = client.flights.shared
+    if coordinator.websub is not None:
+        coordinator_data['websub_active_channels'] = sum(
+            1 for channel in channels if coordinator.websub.is_active(channel.channel_id)
+        )
+    diagnostics['coordinator'] = coordinator_data
+    return diagnostics
@@ -0,0 +1,42 @@
+"""Thread pool running the CPU-bound parsing of YouTube pages and feeds."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .const import PARSE_BACKLOG, PARSE_WORKERS
+
+_T = TypeVar("_T")
+
+
+class ParseExecutor:
+    """Run parsing jobs in a few threads of their own, off the event loop.
+
+    Scanning a 64 KB chunk of a watch page takes several milliseconds: on
+    the event loop, the chunks of many channels queue up and delay every
+    other integration. Here at most ``workers`` jobs run at once and at most
+    ``backlog`` more wait for a thread; a download waits for a free slot
+    before handing over its next chunk, so when parsing falls behind the
+    downloads slow down instead of piling data up in memory.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS, backlog: int = PARSE_BACKLOG) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="youtube_sensor_parser"
+        )
+        self._slots = asyncio.Semaphore(workers + backlog)
+
+    async def async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run ``func(*args)`` in the pool and return its result."""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Drop the jobs not started yet and, if ``wait``, wait for the running ones.
+
+        From the event loop pass ``wait=False``: the running jobs then end on
+        their own threads instead of blocking the loop.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,238 @@
+"""Single-pass streaming parser for YouTube Atom feeds."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import hashlib
+from typing import TYPE_CHECKING, NamedTuple
+import xml.etree.ElementTree as ET
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PREFETCHED, DOMAIN, PREFETCH_MAX_AGE, SCAN_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from .executor import ParseExecutor
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+YT = '{http://www.youtube.com/xml/schemas/2015}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+AT = '{http://purl.org/atompub/tombstones/1.0}'
+
+
+class FeedEntry(NamedTuple):
+    """The fields of a feed entry used by the sensor."""
+
+    video_id: str
+    title: str
+    url: str
+    published: str | None
+    updated: str | None
+    thumbnail: str | None
+    stars: str
+    views: str
+    # False se il feed non ha il link al video (url ricostruito dall'ID)
+    linked: bool = True
+
+
+class FeedParser:
+    """Pull parser that turns a feed into FeedEntry records as it is read.
+
+    Data can be fed in chunks of any size; ``title`` and ``entries`` grow as
+    soon as the corresponding elements are complete. Each entry element is
+    cleared once read, so the tree never holds more than one entry.
+    ``channel_ids`` collects the channels of the entries and of the deleted
+    videos (WebSub notifications say which channel they are about this way).
+    """
+
+    def __init__(self) -> None:
+        self.title: str | None = None
+        self.entries: list[FeedEntry] = []
+        self.channel_ids: set[str] = set()
+        self._deleted = False
+        self._parser = ET.XMLPullParser(('start', 'end'))
+        self._hash = hashlib.sha1(usedforsecurity=False)
+        self._depth = 0
+        self._entry: dict[str, str | None] | None = None
+
+    @property
+    def digest(self) -> str:
+        """Return the SHA-1 of the data fed so far."""
+        return self._hash.hexdigest()
+
+    def feed(self, data: bytes | str) -> None:
+        """Parse the next chunk of the feed."""
+        if isinstance(data, str):
+            data = data.encode()
+        self._hash.update(data)
+        self._parser.feed(data)
+        self._read_events()
+
+    def close(self) -> None:
+        """Finish parsing; raises ``ET.ParseError`` if the feed is truncated."""
+        self._parser.close()
+        self._read_events()
+
+    def _read_events(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == 'start':
+                self._depth += 1
+                if elem.tag == ATOM + 'entry':
+                    self._entry = {}
+                elif elem.tag == AT + 'deleted-entry':
+                    self._deleted = True
+                continue
+
+            self._depth -= 1
+            tag = elem.tag
+            entry = self._entry
+            if entry is None:
+                # Il titolo del canale è figlio diretto di <feed>
+                if tag == ATOM + 'title' and self._depth == 1 and self.title is None:
+                    self.title = elem.text
+                elif tag == AT + 'deleted-entry':
+                    self._deleted = False
+                    elem.clear()
+                elif self._deleted and tag == ATOM + 'uri' and '/channel/' in (elem.text or ''):
+                    # Video eliminato: l'URI dell'autore contiene l'ID del canale
+                    self.channel_ids.add(elem.text.rpartition('/channel/')[2])
+                continue
+
+            if tag == ATOM + 'entry':
+                if entry.get('video_id'):
+                    self.entries.append(_make_entry(entry))
+                self._entry = None
+                elem.clear()
+            elif tag == YT + 'videoId':
+                entry['video_id'] = elem.text
+            elif tag == YT + 'channelId':
+                if elem.text:
+                    self.channel_ids.add(elem.text)
+            elif tag == ATOM + 'title':
+                entry['title'] = elem.text
+            elif tag == ATOM + 'link' and elem.get('rel') == 'alternate':
+                entry['url'] = elem.get('href')
+            elif tag == ATOM + 'published':
+                entry['published'] = elem.text
+            elif tag == ATOM + 'updated':
+                entry['updated'] = elem.text
+            elif tag == MEDIA + 'thumbnail':
+                entry.setdefault('thumbnail', elem.get('url'))
+            elif tag == MEDIA + 'starRating':
+                entry['stars'] = elem.get('count')
+            elif tag == MEDIA + 'statistics':
+                entry['views'] = elem.get('views')
+
+
+def _make_entry(entry: dict[str, str | None]) -> FeedEntry:
+    video_id = entry['video_id']
+    return FeedEntry(
+        video_id=video_id,
+        title=entry.get('title') or "Unknown Title",
+        url=entry.get('url') or f"https://www.youtube.com/watch?v={video_id}",
+        published=entry.get('published'),
+        updated=entry.get('updated'),
+        thumbnail=entry.get('thumbnail'),
+        stars=entry.get('stars') or '0',
+        views=entry.get('views') or '0',
+        linked=entry.get('url') is not None,
+    )
+
+
+def feed_short_verdict(entry: FeedEntry) -> bool | None:
+    """Return whether the feed links an entry as a Short (None if it does not tell).
+
+    YouTube links Shorts to their /shorts/ page and the other videos to
+    their watch page.
+    """
+    if not entry.linked:
+        return None
+    if '/shorts/' in entry.url:
+        return True
+    if '/watch' in entry.url:
+        return False
+    return None
+
+
+def feed_maybe_stream(entry: FeedEntry) -> bool:
+    """Return whether an entry may be an upcoming or live stream.
+
+    Streams and premieres get neither views nor ratings in the feed until
+    they are over, while a regular video gets some within minutes: only
+    the entries without any are worth a look at their watch page (so are
+    the entries of push notifications, which have no statistics).
+    """
+    return entry.views == '0' and entry.stars == '0'
+
+
+def parse_feed(data: bytes | str) -> FeedParser:
+    """Parse a complete feed held in memory."""
+    parser = FeedParser()
+    parser.feed(data)
+    parser.close()
+    return parser
+
+
+async def async_parse_feed(
+    response,
+    stop: Callable[[FeedParser], bool] | None = None,
+    executor: ParseExecutor | None = None,
+) -> FeedParser:
+    """Parse the body of ``response`` while it is downloaded.
+
+    Reading stops, and the connection is closed, as soon as ``stop`` returns
+    True for what has been parsed so far (e.g. once the channel title is known).
+    With an ``executor`` the chunks are parsed in its threads.
+    """
+    parser = FeedParser()
+    complete = False
+    try:
+        async for chunk in response.content.iter_chunked(SCAN_CHUNK_SIZE):
+            if executor is not None:
+                await executor.async_run(parser.feed, chunk)
+            else:
+                parser.feed(chunk)
+            if stop is not None and stop(parser):
+                return parser
+        parser.close()
+        complete = True
+        return parser
+    finally:
+        if complete:
+            response.release()
+        else:
+            response.close()
+
+
+class PrefetchedFeed(NamedTuple):
+    """A feed downloaded while validating a channel, kept for its first update."""
+
+    feed: FeedParser
+    etag: str | None
+    last_modified: str | None
+    fetched: datetime
+
+
+@callback
+def async_store_prefetched_feed(hass: HomeAssistant, channel_id: str, feed: FeedParser, response) -> None:
+    """Keep a complete feed for the first update of a channel being added."""
+    prefetched = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PREFETCHED, {})
+    now = dt_util.utcnow()
+    # Canali validati ma mai aggiunti: non tenerli per sempre
+    for stale in [key for key, item in prefetched.items() if now - item.fetched > PREFETCH_MAX_AGE]:
+        del prefetched[stale]
+    prefetched[channel_id] = PrefetchedFeed(
+        feed, response.headers.get('ETag'), response.headers.get('Last-Modified'), now
+    )
+
+
+@callback
+def async_pop_prefetched_feed(hass: HomeAssistant, channel_id: str) -> PrefetchedFeed | None:
+    """Return (once) the feed kept for a channel, if still fresh."""
+    prefetched = hass.data.get(DOMAIN, {}).get(DATA_PREFETCHED)
+    if not prefetched or (item := prefetched.pop(channel_id, None)) is None:
+        return None
+    if dt_util.utcnow() - item.fetched > PREFETCH_MAX_AGE:
+        return None
+    return item
@@ -0,0 +1,153 @@
+"""Bounded history of the recent videos of each channel."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+from .const import HISTORY_SIZE, SHORTS_URL, THUMBNAIL_URL, WATCH_URL
+
+
+class RecentVideo:
+    """A video of the history: only what the query service needs.
+
+    ``published`` is a UTC timestamp (0 if unknown) and ``is_short`` is None
+    while the video has not been classified.
+    """
+
+    __slots__ = ('video_id', 'title', 'published', 'is_short', 'live')
+
+    def __init__(self, video_id: str, title: str, published: int, is_short: bool | None = None, live: bool = False) -> None:
+        self.video_id = video_id
+        self.title = title
+        self.published = published
+        self.is_short = is_short
+        self.live = live
+
+    def as_list(self) -> list:
+        """Return the video as JSON-friendly data, for the state cache."""
+        return [self.video_id, self.title, self.published, self.is_short, self.live]
+
+    def as_dict(self) -> dict:
+        """Return the video as returned by the query service."""
+        url = SHORTS_URL if self.is_short else WATCH_URL
+        return {
+            'video_id': self.video_id,
+            'title': self.title,
+            'url': url.format(self.video_id),
+            'thumbnail': THUMBNAIL_URL.format(self.video_id),
+            'published': (
+                dt_util.utc_from_timestamp(self.published).isoformat() if self.published else None
+            ),
+            'is_short': self.is_short,
+            'live': self.live,
+        }
+
+
+def _timestamp(published: str | None) -> int:
+    if published and (parsed := dt_util.parse_datetime(published)) is not None:
+        return int(dt_util.as_timestamp(parsed))
+    return 0
+
+
+class VideoHistory:
+    """Ring buffer of the last HISTORY_SIZE videos seen in a channel's feed.
+
+    Videos are kept from the oldest to the newest; a new video pushes the
+    oldest one out, so the memory used by a channel never grows.
+    """
+
+    __slots__ = ('_videos',)
+
+    def __init__(self, videos: Iterable[RecentVideo] = ()) -> None:
+        self._videos: deque[RecentVideo] = deque(videos, maxlen=HISTORY_SIZE)
+
+    def __iter__(self):
+        return iter(self._videos)
+
+    def __len__(self) -> int:
+        return len(self._videos)
+
+    def get(self, video_id: str) -> RecentVideo | None:
+        """Return a video of the history, if present."""
+        for video in self._videos:
+            if video.video_id == video_id:
+                return video
+        return None
+
+    def latest(self, is_short: bool) -> RecentVideo | None:
+        """Return the newest video that is (or is not) a Short."""
+        for video in reversed(self._videos):
+            if video.is_short is is_short:
+                return video
+        return None
+
+    def update(self, entries, verdicts: dict[str, bool]) -> None:
+        """Add the new entries of a feed (newest first) and refresh the known ones."""
+        added = []
+        for entry in entries:
+            verdict = verdicts.get(entry.video_id)
+            if (video := self.get(entry.video_id)) is not None:
+                video.title = entry.title
+                if verdict is not None:
+                    video.is_short = verdict
+            else:
+                added.append(RecentVideo(entry.video_id, entry.title, _timestamp(entry.published), verdict))
+        if added:
+            # Anche un video vecchio può comparire solo ora (es. reso pubblico):
+            # esce sempre il video pubblicato per primo
+            ordered = sorted([*self._videos, *reversed(added)], key=lambda video: video.published)
+            self._videos = deque(ordered, maxlen=HISTORY_SIZE)
+
+    def set_live(self, video_id: str, live: bool) -> None:
+        """Record whether the video shown is currently live (the others are not)."""
+        for video in self._videos:
+            video.live = live and video.video_id == video_id
+
+    def as_list(self) -> list[list]:
+        """Return the history as JSON-friendly data, for the state cache."""
+        return [video.as_list() for video in self._videos]
+
+    @classmethod
+    def from_list(cls, data: list[list]) -> VideoHistory:
+        """Restore a history saved by ``as_list``."""
+        return cls(RecentVideo(*item) for item in data)
+
+
+def query_recent_videos(
+    channels,
+    shorts: bool | None = None,
+    live: bool | None = None,
+    since: datetime | None = None,
+    channel_ids: list[str] | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Return the videos in the histories of ``channels``, newest first.
+
+    ``shorts`` and ``live`` keep only the videos with that value (videos not
+    yet classified are left out when filtering on Shorts); ``since`` keeps
+    only those published from that time on.
+    """
+    start = int(dt_util.as_timestamp(since)) if since is not None else None
+    found: dict[str, tuple[RecentVideo, object]] = {}
+    for channel in channels:
+        if channel_ids and channel.channel_id not in channel_ids:
+            continue
+        for video in channel.history:
+            if shorts is not None and video.is_short is not shorts:
+                continue
+            if live is not None and video.live is not live:
+                continue
+            if start is not None and video.published < start:
+                continue
+            # Lo stesso canale può essere monitorato con e senza Shorts
+            if (known := found.get(video.video_id)) is None or (known[0].is_short is None and video.is_short is not None):
+                found[video.video_id] = (video, channel)
+
+    ordered = sorted(found.values(), key=lambda item: item[0].published, reverse=True)
+    return [
+        {'channel_id': channel.channel_id, 'channel': channel.name, **video.as_dict()}
+        for video, channel in ordered[:limit]
+    ]
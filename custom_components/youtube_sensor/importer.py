@@ -0,0 +1,85 @@
+"""Bulk import of channels from an OPML or subscriptions export."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .config_flow import CannotConnect, InvalidChannelId, validate_input
+from .const import (
+    CONF_CHANNEL_ID,
+    CONF_INCLUDE_SHORTS,
+    CONF_MAX_CONCURRENCY,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SOURCE_BULK_IMPORT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Un ID di canale ovunque nel testo: negli xmlUrl dell'OPML, nella colonna
+# "Channel Id" o negli URL dell'export CSV di Google Takeout, o in un elenco
+CHANNEL_ID_RE = re.compile(r'(?<![\w-])UC[\w-]{22}(?![\w-])')
+
+
+def parse_channel_ids(text: str) -> list[str]:
+    """Return the channel IDs found in an export, without duplicates, in order."""
+    return list(dict.fromkeys(CHANNEL_ID_RE.findall(text)))
+
+
+async def async_import_channels(
+    hass: HomeAssistant,
+    channel_ids: list[str],
+    include_shorts: bool = False,
+    scan_interval: int = DEFAULT_SCAN_INTERVAL,
+) -> dict[str, Any]:
+    """Validate channels concurrently and add a config entry for each valid one.
+
+    Channels already configured are skipped without any request. At most
+    ``max_concurrent_requests`` channels are validated at the same time, on
+    top of the integration-wide rate limiter, and the feed downloaded for
+    each of them is reused by its first update.
+    """
+    configured = {entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)}
+    pending = [channel_id for channel_id in channel_ids if channel_id not in configured]
+    semaphore = asyncio.Semaphore(
+        hass.data.get(DOMAIN, {}).get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+    )
+    failed: dict[str, str] = {}
+
+    async def _async_validate(channel_id: str) -> dict[str, Any] | None:
+        async with semaphore:
+            try:
+                return await validate_input(hass, {
+                    CONF_CHANNEL_ID: channel_id,
+                    CONF_INCLUDE_SHORTS: include_shorts,
+                    CONF_SCAN_INTERVAL: scan_interval,
+                })
+            except (CannotConnect, InvalidChannelId) as error:
+                failed[channel_id] = str(error)
+                return None
+
+    validated = [
+        info for info in await asyncio.gather(*map(_async_validate, pending)) if info is not None
+    ]
+
+    imported = []
+    for info in validated:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_BULK_IMPORT}, data=info
+        )
+        if result["type"] == "create_entry":
+            imported.append(info[CONF_CHANNEL_ID])
+
+    _LOGGER.info('Imported %d channels (%d already configured, %d failed)',
+                 len(imported), len(channel_ids) - len(pending), len(failed))
+    return {
+        'imported': imported,
+        'already_configured': [channel_id for channel_id in channel_ids if channel_id in configured],
+        'failed': failed,
+    }
@@ -0,0 +1,90 @@
+"""Integration-wide rate limiting of the requests sent to YouTube."""
+from __future__ import annotations
+
+import asyncio
+from email.utils import parsedate_to_datetime
+import logging
+import time
+
+from homeassistant.util import dt as dt_util
+
+from .const import RATE_BACKOFF_BASE, RATE_BACKOFF_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket shared by every request, with back-off when YouTube throttles.
+
+    Requests wait for a token, so at most ``rate`` requests per second are
+    sent on average (``burst`` at once). A 429 or 5xx answer blocks every
+    request for ``Retry-After`` seconds or for an exponential back-off,
+    whichever is longer; the back-off is reset by the next successful answer.
+    ``service`` names the server in the logs.
+    """
+
+    def __init__(self, rate: float, burst: int, service: str = "YouTube") -> None:
+        self.rate = rate
+        self.burst = burst
+        self.service = service
+        self.failures = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def blocked_for(self) -> float:
+        """Return how many seconds requests are still blocked for."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def throttled(self, status: int, retry_after: str | None = None) -> None:
+        """Back off after a 429 or 5xx answer."""
+        now = time.monotonic()
+        requested = parse_retry_after(retry_after)
+        if now < self._blocked_until:
+            # Risposta a una richiesta partita prima della pausa: non raddoppiare
+            if requested is not None:
+                self._blocked_until = max(self._blocked_until, now + min(requested, RATE_BACKOFF_MAX))
+            return
+        delay = min(RATE_BACKOFF_BASE * 2 ** self.failures, RATE_BACKOFF_MAX)
+        self.failures += 1
+        if requested is not None:
+            delay = max(delay, min(requested, RATE_BACKOFF_MAX))
+        self._blocked_until = now + delay
+        # Avvisa solo al primo errore di una serie
+        log = _LOGGER.warning if self.failures == 1 else _LOGGER.debug
+        log('%s answered %s, pausing requests for %d seconds', self.service, status, delay)
+
+    def succeeded(self) -> None:
+        """Reset the back-off after a successful answer."""
+        self.failures = 0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds asked by a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - dt_util.utcnow()).total_seconds())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,90 @@
+"""Streaming scanner for large YouTube pages."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import re
+from typing import TYPE_CHECKING
+
+from .const import SCAN_CHUNK_SIZE, SCAN_MAX_BYTES, SCAN_OVERLAP
+
+if TYPE_CHECKING:
+    from .executor import ParseExecutor
+
+
+class PageScanner:
+    """Search a streamed page for several patterns in a single pass.
+
+    Patterns are byte regular expressions without capturing groups; they are
+    combined into one alternation of lookaheads, so every chunk is searched
+    only once and a match never hides another one overlapping it (e.g.
+    ``isLiveBroadcast`` inside ``"isLiveBroadcast":true``): wherever a
+    pattern matches, the patterns still missing are also tried there.
+    The last ``SCAN_OVERLAP`` bytes of each chunk are searched again with the
+    next one, so matches spanning two chunks are still found.
+    """
+
+    def __init__(self, patterns: dict[str, bytes]) -> None:
+        self.names = tuple(patterns)
+        self._patterns = {name: re.compile(pattern) for name, pattern in patterns.items()}
+        self._regex = re.compile(
+            b"(?=%s)" % b"|".join(
+                b"(?P<%s>%s)" % (name.encode(), pattern)
+                for name, pattern in patterns.items()
+            )
+        )
+
+    def scan(self, data: bytes, found: dict[str, bytes] | None = None) -> dict[str, bytes]:
+        """Record the first match of every pattern found in ``data``."""
+        if found is None:
+            found = {}
+        for match in self._regex.finditer(data):
+            name = match.lastgroup
+            found.setdefault(name, match.group(name))
+            # A una stessa posizione conta solo la prima alternativa: prova le altre
+            start = match.start()
+            for other, regex in self._patterns.items():
+                if other not in found and (other_match := regex.match(data, start)) is not None:
+                    found[other] = other_match.group()
+            if len(found) == len(self._patterns):
+                break
+        return found
+
+    async def async_scan(
+        self,
+        response,
+        stop: Callable[[dict[str, bytes]], bool] | None = None,
+        executor: ParseExecutor | None = None,
+    ) -> tuple[dict[str, bytes], bool]:
+        """Read the body of ``response`` and return the first match of each pattern.
+
+        Reading stops, and the connection is closed, as soon as ``stop``
+        returns True for the matches found so far. With an ``executor`` the
+        chunks are searched in its threads instead of on the event loop.
+        Also returns True if the page was cut off at SCAN_MAX_BYTES: a
+        pattern that was not found may then just be further on.
+        """
+        found: dict[str, bytes] = {}
+        tail = b""
+        read = 0
+        complete = False
+        try:
+            async for chunk in response.content.iter_chunked(SCAN_CHUNK_SIZE):
+                read += len(chunk)
+                window = tail + chunk
+                if executor is not None:
+                    await executor.async_run(self.scan, window, found)
+                else:
+                    self.scan(window, found)
+                if stop is not None and stop(found):
+                    return found, False
+                if read >= SCAN_MAX_BYTES:
+                    return found, True
+                tail = window[-SCAN_OVERLAP:]
+            complete = True
+            return found, False
+        finally:
+            if complete:
+                response.release()
+            else:
+                # Il resto della pagina non serve: non leggerlo
+                response.close()
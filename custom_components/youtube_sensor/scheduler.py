@@ -0,0 +1,77 @@
+"""Adaptive poll scheduling based on each channel's upload cadence."""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from .const import (
+    ADAPTIVE_HOT_SHARE,
+    ADAPTIVE_MAX_FACTOR,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_UPLOADS,
+    ADAPTIVE_WINDOW_LEAD,
+)
+
+
+class PollScheduler:
+    """Decide when a channel should be polled next.
+
+    The configured scan interval is the shortest interval ever used. Around
+    the hours of the day (UTC) when the channel usually uploads, it is polled
+    at that interval; the rest of the time the interval doubles after every
+    poll that finds no new upload, up to ``ADAPTIVE_MAX_FACTOR`` times the
+    configured one (and at most ``ADAPTIVE_MAX_INTERVAL`` minutes). A backed-off
+    poll is never scheduled past the start of the next upload window.
+    """
+
+    def __init__(self, scan_interval: int) -> None:
+        self.scan_interval = scan_interval
+        self.idle_polls = 0
+        self.hot_hours: frozenset[int] = frozenset()
+
+    @property
+    def max_interval(self) -> int:
+        """Return the longest interval, in minutes, used for an idle channel."""
+        return max(
+            self.scan_interval,
+            min(self.scan_interval * ADAPTIVE_MAX_FACTOR, ADAPTIVE_MAX_INTERVAL),
+        )
+
+    def update_uploads(self, published: list[datetime]) -> None:
+        """Learn the usual upload hours from the publication dates in the feed."""
+        counts = Counter(stamp.hour for stamp in published)
+        threshold = max(ADAPTIVE_MIN_UPLOADS, len(published) * ADAPTIVE_HOT_SHARE)
+        self.hot_hours = frozenset(hour for hour, count in counts.items() if count >= threshold)
+
+    def record_poll(self, new_uploads: bool) -> None:
+        """Reset the back-off when a poll finds new uploads, grow it otherwise."""
+        self.idle_polls = 0 if new_uploads else self.idle_polls + 1
+
+    def in_upload_window(self, now: datetime) -> bool:
+        """Return True if an upload is expected around ``now``."""
+        return bool(self.hot_hours) and (
+            now.hour in self.hot_hours
+            or (now + ADAPTIVE_WINDOW_LEAD).hour in self.hot_hours
+        )
+
+    def next_window(self, now: datetime) -> datetime | None:
+        """Return when the next upload window starts, if the channel has one."""
+        if not self.hot_hours:
+            return None
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        for offset in range(1, 25):
+            start = hour_start + timedelta(hours=offset)
+            if start.hour in self.hot_hours:
+                return start - ADAPTIVE_WINDOW_LEAD
+        return None
+
+    def next_poll(self, now: datetime) -> datetime:
+        """Return when the channel should be polled next."""
+        if self.in_upload_window(now):
+            return now + timedelta(minutes=self.scan_interval)
+        interval = min(self.scan_interval * 2 ** min(self.idle_polls, 16), self.max_interval)
+        next_poll = now + timedelta(minutes=interval)
+        if (window := self.next_window(now)) is not None and window < next_poll:
+            # Non rimandare oltre l'inizio della prossima finestra di caricamento
+            next_poll = max(window, now + timedelta(minutes=self.scan_interval))
+        return next_poll
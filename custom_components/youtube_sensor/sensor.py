@@ -5,31 +5,45 @@ For more details about this component, please refer to the documentation at
 https://github.com/custom-components/youtube
 """
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
-import async_timeout
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-from homeassistant.components.sensor import PLATFORM_SCHEMA, SensorEntity
+from homeassistant.components.sensor import (
+    PLATFORM_SCHEMA,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from dateutil.parser import parse
-from homeassistant.const import CONF_NAME
-import re
-import html
-import xml.etree.ElementTree as ET
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.const import CONF_NAME, UnitOfInformation, UnitOfTime
+from homeassistant.util import dt as dt_util
 
+from .coordinator import (
+    YoutubeChannel,
+    YoutubeCoordinator,
+    async_get_coordinator,
+    async_register_entry_channel,
+)
+from .feed import async_parse_feed, async_store_prefetched_feed
+from .stats import ChannelStats
 from .const import (
-    DOMAIN,
     CONF_CHANNEL_ID,
     CONF_INCLUDE_SHORTS,
     CONF_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
     ICON,
     BASE_URL,
-    CHANNEL_LIVE_URL,
-    SHORTS_URL,
+    VOLATILE_ATTRIBUTES_REFRESH,
 )
 
 # Manteniamo il supporto per configuration.yaml per retrocompatibilità
@@ -45,20 +59,145 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class YoutubeStatsSensorEntityDescription(SensorEntityDescription):
+    """Describe a diagnostic sensor reading a channel's statistics."""
+
+    value_fn: Callable[[ChannelStats], int | float | None]
+
+
+# Sensori diagnostici, disattivati di default
+STATS_SENSORS = (
+    YoutubeStatsSensorEntityDescription(
+        key="requests",
+        name="requests",
+        icon="mdi:swap-vertical",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.total_requests,
+    ),
+    YoutubeStatsSensorEntityDescription(
+        key="downloaded",
+        name="downloaded",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.MEBIBYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.total_bytes,
+    ),
+    YoutubeStatsSensorEntityDescription(
+        key="update_duration",
+        name="update duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: (
+            round(stats.last_update_duration * 1000)
+            if stats.last_update_duration is not None else None
+        ),
+    ),
+    YoutubeStatsSensorEntityDescription(
+        key="consecutive_failures",
+        name="consecutive failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.consecutive_failures,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class YoutubeVideoSensorEntityDescription(SensorEntityDescription):
+    """Describe a sensor showing another video of a channel than its latest one."""
+
+    video_fn: Callable[[YoutubeChannel], dict | None]
+    # Il canale cerca l'ultimo Short solo finché un'entità lo mostra
+    watch_shorts: bool = False
+
+
+# Altre viste dello stesso aggiornamento del canale: non costano richieste in più
+VIDEO_SENSORS = (
+    YoutubeVideoSensorEntityDescription(
+        key="latest_short",
+        name="latest Short",
+        icon="mdi:cellphone-play",
+        video_fn=lambda channel: channel.latest_short,
+        watch_shorts=True,
+    ),
+    YoutubeVideoSensorEntityDescription(
+        key="stream",
+        name="stream",
+        icon="mdi:broadcast",
+        video_fn=lambda channel: channel.last_stream,
+    ),
+)
+
+
+def _sensor_unique_id(channel_id, include_shorts):
+    """Return the unique ID of the sensor of a channel.
+
+    A channel may be monitored both with and without Shorts (e.g. from
+    configuration.yaml and from a config entry): the two sensors need
+    different IDs.
+    """
+    return f"youtube_{channel_id}_shorts" if include_shorts else f"youtube_{channel_id}"
+
+
+def _entity_unique_id(channel_id, include_shorts, key=None):
+    """Return the unique ID of the sensor of a channel, or of its ``key`` sensor."""
+    unique_id = _sensor_unique_id(channel_id, include_shorts)
+    return f"{unique_id}_{key}" if key is not None else unique_id
+
+
+@callback
+def _async_migrate_unique_id(hass: HomeAssistant, channel: YoutubeChannel, config_entry_id=None) -> None:
+    """Move the sensors of a channel including Shorts to their own unique IDs.
+
+    They used to share the IDs of the sensors without Shorts: only the
+    entities registered by the same config entry (or by configuration.yaml)
+    are moved.
+    """
+    if not channel.include_shorts:
+        return
+    registry = er.async_get(hass)
+    for key in (None, *(description.key for description in (*STATS_SENSORS, *VIDEO_SENSORS))):
+        old_id = _entity_unique_id(channel.channel_id, False, key)
+        new_id = _entity_unique_id(channel.channel_id, True, key)
+        entity_id = registry.async_get_entity_id(SENSOR_DOMAIN, DOMAIN, old_id)
+        if (
+            entity_id is None
+            or registry.async_get(entity_id).config_entry_id != config_entry_id
+            or registry.async_get_entity_id(SENSOR_DOMAIN, DOMAIN, new_id) is not None
+        ):
+            continue
+        _LOGGER.debug('%s - Moving %s to unique ID %s', channel.name, entity_id, new_id)
+        registry.async_update_entity(entity_id, new_unique_id=new_id)
+
+
+def _channel_entities(coordinator, channel, views=False, owner=True):
+    """Return the sensor of a channel, its other views and its diagnostic sensors.
+
+    The other views (latest Short, stream) are only given to config
+    entries, which are unique per channel. ``owner`` sensors unregister the
+    channel when removed.
+    """
+    entities = [YoutubeSensor(coordinator, channel, owner)]
+    if views:
+        entities += [YoutubeVideoSensor(coordinator, channel, description) for description in VIDEO_SENSORS]
+    return entities + [
+        YoutubeStatsSensor(coordinator, channel, description) for description in STATS_SENSORS
+    ]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up YouTube Sensor from config entry."""
-    channel_id = config_entry.data[CONF_CHANNEL_ID]
-    name = config_entry.data[CONF_NAME]
-    include_shorts = config_entry.data.get(CONF_INCLUDE_SHORTS, False)
-    scan_interval = config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    
-    session = async_create_clientsession(hass)
-    
-    async_add_entities([YoutubeSensor(channel_id, name, session, include_shorts, scan_interval)], True)
+    coordinator, channel = await async_register_entry_channel(hass, config_entry)
+    _async_migrate_unique_id(hass, channel, config_entry.entry_id)
+
+    async_add_entities(_channel_entities(coordinator, channel, views=True, owner=False))
 
 
 async def async_setup_platform(
@@ -68,188 +207,100 @@ async def async_setup_platform(
     custom_name = config.get('name')  # Nome personalizzato opzionale
     include_shorts = config.get('includeShorts', False)  # Parametro per includere Shorts
     scan_interval = config.get('scan_interval', DEFAULT_SCAN_INTERVAL)  # Intervallo di scansione
-    session = async_create_clientsession(hass)
-    
-    try:
-        url = BASE_URL.format(channel_id)
-        async with async_timeout.timeout(10):
-            response = await session.get(url)
-            info = await response.text()
-        name = info.split('<title>')[1].split('</')[0]
-    except Exception as error:  # pylint: disable=broad-except
-        _LOGGER.debug('Unable to set up - %s', error)
-        name = None
+    coordinator = await async_get_coordinator(hass)
+
+    # Il titolo del canale serve solo senza nome personalizzato, e solo la prima volta
+    name = custom_name or coordinator.saved_title(channel_id)
+    if name is None:
+        try:
+            url = BASE_URL.format(channel_id)
+            response = await coordinator.session.get(url)
+            response.raise_for_status()
+            feed = await async_parse_feed(response, executor=coordinator.session.parser)
+            name = feed.title
+            # Il primo aggiornamento userà questo feed invece di riscaricarlo
+            async_store_prefetched_feed(hass, channel_id, feed, response)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.debug('Unable to set up - %s', error)
+            name = None
 
     if name is not None:
-        # Usa il nome personalizzato se fornito, altrimenti usa quello dal canale
-        display_name = custom_name if custom_name else name
-        async_add_entities([YoutubeSensor(channel_id, display_name, session, include_shorts, scan_interval)], True)
-
-
-class YoutubeSensor(SensorEntity):
-    """YouTube Sensor class"""
-    def __init__(self, channel_id, name, session, include_shorts=False, scan_interval=DEFAULT_SCAN_INTERVAL):
-        self._attr_native_value = None
-        self.session = session
-        self._attr_entity_picture = None
-        self.stars = 0
-        self.views = 0
-        self.stream = False
-        self.live = False
-        self._name = name
-        self.channel_id = channel_id
-        self.url = None
-        self.content_id = None
-        self.published = None
-        self.channel_live = False
-        self.channel_image = None
-        self.expiry = parse('01 Jan 1900 00:00:00 UTC')
-        self.stream_start = None
-        self.is_short = False
-        self.include_shorts = include_shorts  # Parametro per includere Shorts
-        self.scan_interval_minutes = scan_interval  # Nuovo parametro
+        channel = coordinator.async_register_channel(channel_id, name, include_shorts, scan_interval)
+        _async_migrate_unique_id(hass, channel)
+        async_add_entities(_channel_entities(coordinator, channel))
+
+
+class YoutubeSensor(CoordinatorEntity, SensorEntity):
+    """YouTube Sensor class.
+
+    The state is only written when the video, the live status or the
+    availability change (the sensor is unavailable while the circuit breaker
+    of the channel's feed is open): views and stars change at every poll, so on their
+    own they are written at most every VOLATILE_ATTRIBUTES_REFRESH, and are
+    never stored by the recorder.
+    """
+
+    _unrecorded_attributes = frozenset({'stars', 'views', 'include_shorts', 'scan_interval_minutes'})
+
+    def __init__(self, coordinator: YoutubeCoordinator, channel: YoutubeChannel, owner: bool = True):
+        super().__init__(coordinator)
+        self.channel = channel
+        self.owner = owner
+        self._name = channel.name
+        self.channel_id = channel.channel_id
+        self.include_shorts = channel.include_shorts
         
         # Attributi per config entry
-        self._attr_unique_id = f"youtube_{channel_id}"
-        self._attr_name = f"youtube_{name}"
+        self._attr_unique_id = _entity_unique_id(channel.channel_id, channel.include_shorts)
+        self._attr_name = f"youtube_{channel.name}"
         self._attr_icon = ICON
 
+        # Attributi dell'ultimo stato scritto, ricostruiti solo quando cambiano
+        self._attributes = None
+        self._signature = None
+        self._volatile = None
+        self._written = None
+
+    def _state_signature(self):
+        """Return the values whose change is worth a new state."""
+        channel = self.channel
+        return (
+            self.available, channel.title, channel.thumbnail, channel.url, channel.content_id,
+            channel.published, channel.stream, channel.stream_state, channel.stream_start, channel.live,
+            channel.channel_live, channel.channel_image, channel.is_short,
+        )
+
+    def _volatile_values(self):
+        """Return the values that change often and do not matter on their own."""
+        channel = self.channel
+        return channel.stars, channel.views, channel.scan_interval
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if something meaningful changed."""
+        now = dt_util.utcnow()
+        if self._signature == self._state_signature() and (
+            self._volatile == self._volatile_values()
+            or (self._written is not None and now - self._written < VOLATILE_ATTRIBUTES_REFRESH)
+        ):
+            return
+        self._attributes = None
+        self.async_write_ha_state()
+        if not self.available:
+            # Uno stato non disponibile non legge gli attributi: ricorda qui la firma
+            self._signature = self._state_signature()
+            self._written = now
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop polling the channel when the sensor is removed (config entries do it on unload)."""
+        await super().async_will_remove_from_hass()
+        if self.owner:
+            self.coordinator.async_unregister_channel(self.channel)
+
     @property
-    def scan_interval(self):
-        """Return the scan interval."""
-        from datetime import timedelta
-        return timedelta(minutes=self.scan_interval_minutes)
-
-    async def async_update(self):
-        """Update sensor - trova il primo video secondo le impostazioni di includeShorts."""
-        if self.include_shorts:
-            _LOGGER.debug('%s - Running update (including Shorts) - scan interval: %d minutes', 
-                         self._name, self.scan_interval_minutes)
-        else:
-            _LOGGER.debug('%s - Running update (excluding Shorts) - scan interval: %d minutes', 
-                         self._name, self.scan_interval_minutes)
-            
-        try:
-            url = BASE_URL.format(self.channel_id)
-            async with async_timeout.timeout(10):
-                response = await self.session.get(url)
-                info = await response.text()
-            
-            exp = parse(response.headers['Expires'])
-            if exp < self.expiry:
-                return
-            self.expiry = exp
-            
-            # Parse XML per trovare tutti i video
-            root = ET.fromstring(info)
-            
-            # Namespace per YouTube XML
-            namespaces = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'yt': 'http://www.youtube.com/xml/schemas/2015',
-                'media': 'http://search.yahoo.com/mrss/'
-            }
-            
-            # Trova tutte le entry (video)
-            entries = root.findall('atom:entry', namespaces)
-            
-            # Itera attraverso i video per trovare il primo video secondo le impostazioni
-            video_found = False
-            for entry in entries:
-                # Estrai informazioni del video
-                video_id_elem = entry.find('yt:videoId', namespaces)
-                if video_id_elem is None:
-                    continue
-                    
-                temp_video_id = video_id_elem.text
-                
-                # Controlla se è uno Short
-                is_short = await is_youtube_short(temp_video_id, self._name, self.session)
-                
-                # Logica di filtro basata su include_shorts
-                should_include_video = True
-                if not self.include_shorts and is_short:
-                    # Se non vogliamo gli Shorts e questo è uno Short, salta
-                    should_include_video = False
-                    _LOGGER.debug('%s - Skipping Short video: %s', self._name, temp_video_id)
-                elif self.include_shorts or not is_short:
-                    # Se vogliamo gli Shorts, o se questo non è uno Short, includi
-                    should_include_video = True
-                
-                if should_include_video:
-                    # Questo è il primo video che soddisfa i nostri criteri
-                    if is_short:
-                        _LOGGER.debug('%s - Found Short video: %s', self._name, temp_video_id)
-                    else:
-                        _LOGGER.debug('%s - Found non-Short video: %s', self._name, temp_video_id)
-                    
-                    # Estrai titolo
-                    title_elem = entry.find('atom:title', namespaces)
-                    title = title_elem.text if title_elem is not None else "Unknown Title"
-                    
-                    # Estrai URL
-                    link_elem = entry.find('atom:link[@rel="alternate"]', namespaces)
-                    video_url = link_elem.get('href') if link_elem is not None else f"https://www.youtube.com/watch?v={temp_video_id}"
-                    
-                    # Estrai data pubblicazione
-                    published_elem = entry.find('atom:published', namespaces)
-                    published_date = published_elem.text if published_elem is not None else None
-                    
-                    # Estrai thumbnail
-                    thumbnail_elem = entry.find('.//media:thumbnail', namespaces)
-                    thumbnail_url = thumbnail_elem.get('url') if thumbnail_elem is not None else None
-                    
-                    # Estrai stars e views
-                    stars_elem = entry.find('.//media:starRating', namespaces)
-                    stars = stars_elem.get('count') if stars_elem is not None else '0'
-                    
-                    stats_elem = entry.find('.//media:statistics', namespaces)
-                    views = stats_elem.get('views') if stats_elem is not None else '0'
-                    
-                    # Aggiorna le proprietà dell'oggetto
-                    self.url = video_url
-                    self.content_id = temp_video_id
-                    self.published = published_date
-                    self._attr_native_value = html.unescape(title)
-                    self._attr_entity_picture = thumbnail_url
-                    self.stars = stars
-                    self.views = views
-                    self.is_short = is_short
-                    
-                    # Controlla se è live/stream
-                    if self.live or video_url != self.url:
-                        self.stream, self.live, self.stream_start = await is_live(video_url, self._name, self.hass, self.session)
-                    else:
-                        _LOGGER.debug('%s - Skipping live check', self._name)
-                    
-                    video_found = True
-                    break
-            
-            if not video_found:
-                if self.include_shorts:
-                    _LOGGER.warning('%s - No videos found in feed', self._name)
-                else:
-                    _LOGGER.warning('%s - No non-Short videos found in feed', self._name)
-                
-                # Fallback al video più recente se non ci sono video che soddisfano i criteri
-                title = info.split('<title>')[2].split('</')[0]
-                url = info.split('<link rel="alternate" href="')[2].split('"/>')[0]
-                self.url = url
-                self.content_id = url.split('?v=')[1]
-                self.published = info.split('<published>')[2].split('</')[0]
-                thumbnail_url = info.split('<media:thumbnail url="')[1].split('"')[0]
-                self._attr_native_value = html.unescape(title)
-                self._attr_entity_picture = thumbnail_url
-                self.stars = info.split('<media:starRating count="')[1].split('"')[0]
-                self.views = info.split('<media:statistics views="')[1].split('"')[0]
-                self.is_short = await is_youtube_short(self.content_id, self._name, self.session)
-            
-            # Controlla lo stato del canale
-            channel_url = CHANNEL_LIVE_URL.format(self.channel_id)
-            self.channel_live, self.channel_image = await is_channel_live(channel_url, self.name, self.hass, self.session)
-            
-        except Exception as error:  # pylint: disable=broad-except
-            _LOGGER.debug('%s - Could not update - %s', self._name, error)
+    def available(self) -> bool:
+        """Return False while the channel's feed cannot be read."""
+        return super().available and self.channel.available
 
     @property
     def name(self):
@@ -259,17 +310,12 @@ class YoutubeSensor(SensorEntity):
     @property
     def entity_picture(self):
         """Picture."""
-        return self._attr_entity_picture
+        return self.channel.thumbnail
 
     @property
     def native_value(self):
         """State."""
-        return self._attr_native_value
-
-    @property
-    def unique_id(self):
-        """Return unique ID for this sensor."""
-        return f"youtube_{self.channel_id}"
+        return self.channel.title
 
     @property
     def icon(self):
@@ -279,116 +325,132 @@ class YoutubeSensor(SensorEntity):
     @property
     def extra_state_attributes(self):
         """Attributes."""
-        return {'url': self.url,
-                'content_id': self.content_id,
-                'published': self.published,
-                'stars': self.stars,
-                'views': self.views,
-                'stream': self.stream,
-                'stream_start': self.stream_start,
-                'live': self.live,
-                'channel_is_live': self.channel_live,
-                'channel_image': self.channel_image,
-                'is_short': self.is_short,
-                'include_shorts': self.include_shorts,  # Aggiunto per debug
-                'scan_interval_minutes': self.scan_interval_minutes,  # Nuovo attributo
+        if self._attributes is None:
+            self._attributes = self._build_attributes()
+            self._signature = self._state_signature()
+            self._volatile = self._volatile_values()
+            self._written = dt_util.utcnow()
+        return self._attributes
+
+    def _build_attributes(self):
+        channel = self.channel
+        return {'url': channel.url,
+                'content_id': channel.content_id,
+                'published': channel.published,
+                'stars': channel.stars,
+                'views': channel.views,
+                'stream': channel.stream,
+                'stream_start': channel.stream_start,
+                'stream_state': channel.stream_state,
+                'live': channel.live,
+                'channel_is_live': channel.channel_live,
+                'channel_image': channel.channel_image,
+                'is_short': channel.is_short,
+                'include_shorts': channel.include_shorts,  # Aggiunto per debug
+                'scan_interval_minutes': channel.scan_interval,  # Nuovo attributo
                 'friendly_name': self._name}
 
 
-async def is_live(url, name, hass, session):
-    """Return bool if video is stream and bool if video is live"""
-    live = False
-    stream = False
-    start = None
-    try:
-        async with async_timeout.timeout(10):
-            response = await session.get(url, cookies=dict(CONSENT="YES+cb"))
-            info = await response.text()
-        if 'isLiveBroadcast' in info:
-            stream = True
-            start = parse(info.split('startDate" content="')[1].split('"')[0])
-            if 'endDate' not in info:
-                live = True
-                _LOGGER.debug('%s - Latest Video is live', name)
-    except Exception as error:  # pylint: disable=broad-except
-        _LOGGER.debug('%s - Could not update - %s', name, error)
-    return stream, live, start
-
-
-async def is_channel_live(url, name, hass, session):
-    """Return bool if channel is live"""
-    live = False
-    channel_image = None
-    try:
-        async with async_timeout.timeout(10):
-            response = await session.get(url, cookies=dict(CONSENT="YES+cb"))
-            info = await response.text()
-        if '{"iconType":"LIVE"}' in info:
-            live = True
-            _LOGGER.debug('%s - Channel is live', name)
-        regex = r"\"width\":48,\"height\":48},{\"url\":\"(.*?)\",\"width\":88,\"height\":88},{\"url\":"
-        matches = re.findall(regex, info, re.MULTILINE)
-        if matches:
-            channel_image = matches[0].replace("=s88-c-k-c0x00ffffff-no-rj", "")
-    except Exception as error:  # pylint: disable=broad-except
-        _LOGGER.debug('%s - Could not update - %s', name, error)
-    return live, channel_image
-
-
-async def is_youtube_short(video_id, name, session):
-    """Check if a video is a YouTube Short with stricter validation to reduce false positives"""
-    try:
-        # Controlla la pagina normale del video
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-        async with async_timeout.timeout(10):
-            response = await session.get(video_url, cookies=dict(CONSENT="YES+cb"))
-            info = await response.text()
-        
-        # Indicatori SPECIFICI che un video è uno Short
-        # Questi sono più affidabili e riducono i falsi positivi
-        definitive_short_indicators = [
-            '"isShort":true',                      # Indicatore JSON esplicito
-            '"shorts":{"isShort":true',            # Struttura JSON specifica per Shorts
-            'ytd-shorts-player',                   # Player specifico per Shorts
-            '"webPageType":"WEB_PAGE_TYPE_SHORTS"' # Tipo di pagina esplicito
-        ]
-        
-        # Prima verifica: cerca indicatori definitivi
-        for indicator in definitive_short_indicators:
-            if indicator in info:
-                _LOGGER.debug('%s - Video %s confirmed as YouTube Short (indicator: %s)', name, video_id, indicator)
-                return True
-        
-        # Seconda verifica: controlla durata E altri segnali insieme
-        duration_match = re.search(r'"lengthSeconds":"(\d+)"', info)
-        if duration_match:
-            duration = int(duration_match.group(1))
-            
-            # Solo se la durata è <= 180 secondi E ci sono altri indicatori
-            if duration <= 180:
-                additional_indicators = [
-                    'shorts',  # parola "shorts" nel contenuto
-                    '"isShortsMobileWeb":true',  # indicatore mobile
-                    'shortsLockupViewModel'  # componente UI specifico
-                ]
-                
-                for indicator in additional_indicators:
-                    if indicator in info.lower():
-                        _LOGGER.debug('%s - Video %s is YouTube Short (duration: %ds + indicator: %s)', 
-                                    name, video_id, duration, indicator)
-                        return True
-                
-                # Se è molto corto (< 30 sec) e non ci sono indicatori contrari, probabilmente è uno Short
-                if duration <= 30:
-                    # Verifica che non sia un video normale molto corto o live
-                    normal_video_indicators = ['"isLive":true', '"isLiveBroadcast":true']
-                    if not any(indicator in info for indicator in normal_video_indicators):
-                        _LOGGER.debug('%s - Video %s likely Short (very short duration: %ds)', name, video_id, duration)
-                        return True
-        
-        _LOGGER.debug('%s - Video %s is NOT a YouTube Short', name, video_id)
-        return False
-        
-    except Exception as error:  # pylint: disable=broad-except
-        _LOGGER.debug('%s - Could not check if video is Short - %s', name, error)
-        return False
\ No newline at end of file
+class YoutubeStatsSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing what polling a channel costs."""
+
+    _written_value = None
+
+    entity_description: YoutubeStatsSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: YoutubeCoordinator,
+        channel: YoutubeChannel,
+        description: YoutubeStatsSensorEntityDescription,
+    ):
+        super().__init__(coordinator)
+        self.channel = channel
+        self.entity_description = description
+        self._attr_unique_id = _entity_unique_id(channel.channel_id, channel.include_shorts, description.key)
+        self._attr_name = f"youtube_{channel.name} {description.name}"
+
+    @property
+    def native_value(self):
+        """State."""
+        return self.entity_description.value_fn(self.channel.stats)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value changed."""
+        if (value := self.native_value) == self._written_value:
+            return
+        self._written_value = value
+        self.async_write_ha_state()
+
+
+class YoutubeVideoSensor(CoordinatorEntity, SensorEntity):
+    """Sensor showing another view of a channel's videos (e.g. its latest Short).
+
+    It reads what the channel's update already found, and only writes its
+    state when the video or the availability change.
+    """
+
+    _written_value = None
+
+    entity_description: YoutubeVideoSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: YoutubeCoordinator,
+        channel: YoutubeChannel,
+        description: YoutubeVideoSensorEntityDescription,
+    ):
+        super().__init__(coordinator)
+        self.channel = channel
+        self.entity_description = description
+        self._attr_unique_id = _entity_unique_id(channel.channel_id, channel.include_shorts, description.key)
+        self._attr_name = f"youtube_{channel.name} {description.name}"
+
+    @property
+    def available(self) -> bool:
+        """Return False while the channel's feed cannot be read."""
+        return super().available and self.channel.available
+
+    async def async_added_to_hass(self) -> None:
+        """Ask the channel's updates to look for the video shown, if they would not otherwise."""
+        await super().async_added_to_hass()
+        if self.entity_description.watch_shorts:
+            self.channel.watch_shorts(True)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop looking for the video shown."""
+        await super().async_will_remove_from_hass()
+        if self.entity_description.watch_shorts:
+            self.channel.watch_shorts(False)
+
+    @property
+    def _video(self):
+        return self.entity_description.video_fn(self.channel) or {}
+
+    @property
+    def native_value(self):
+        """State."""
+        return self._video.get('title')
+
+    @property
+    def entity_picture(self):
+        """Picture."""
+        return self._video.get('thumbnail')
+
+    @property
+    def extra_state_attributes(self):
+        """Attributes."""
+        return {
+            key: value for key, value in self._video.items() if key not in ('title', 'thumbnail')
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the video or the availability changed."""
+        if (value := (self.available, self._video)) == self._written_value:
+            return
+        self._written_value = value
+        self.async_write_ha_state()
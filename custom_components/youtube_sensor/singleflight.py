@@ -0,0 +1,81 @@
+"""Sharing of identical YouTube requests made at the same time."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class SingleFlight:
+    """Run a fetch once for every caller asking for the same key at the same time.
+
+    Callers asking for a key while its fetch is in flight wait for it and
+    get the same result. Results fetched with ``keep`` during an update
+    ``cycle`` are also given to the callers asking for them later in the
+    cycle (e.g. the live check of a watch page just downloaded for the Short
+    check), and forgotten when it ends. Errors are shared with the waiting
+    callers but not kept. A fetch is cancelled only when every caller waiting
+    for it was.
+    """
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._cycles = 0
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self._results: dict[Hashable, Any] = {}
+
+    async def async_run(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        reuse: Callable[[Any], bool] | None = None,
+        keep: bool = True,
+    ) -> Any:
+        """Return the result of ``fetch()``, or of an identical fetch in flight or kept.
+
+        ``reuse`` tells whether a shared result answers this caller too (e.g.
+        a page scan that stopped before finding what this caller looks for);
+        if not, ``fetch`` runs again for this caller.
+        """
+        if key in self._results and (reuse is None or reuse(self._results[key])):
+            self.shared += 1
+            return self._results[key]
+        if (task := self._inflight.get(key)) is not None:
+            result = await self._async_wait(key, task)
+            if reuse is None or reuse(result):
+                self.shared += 1
+                return result
+            return await fetch()
+        task = self._inflight[key] = asyncio.create_task(fetch())
+        task.add_done_callback(lambda task: self._finished(key, task, keep))
+        return await self._async_wait(key, task)
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """Keep the results fetched while the block runs, then forget them."""
+        self._cycles += 1
+        try:
+            yield
+        finally:
+            self._cycles -= 1
+            if not self._cycles:
+                self._results.clear()
+
+    async def _async_wait(self, key: Hashable, task: asyncio.Task) -> Any:
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                # Nessuno aspetta più il risultato: non scaricare per niente
+                task.cancel()
+
+    def _finished(self, key: Hashable, task: asyncio.Task, keep: bool) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None and keep and self._cycles:
+            self._results[key] = task.result()
@@ -0,0 +1,195 @@
+"""Per-channel statistics of the requests sent to YouTube."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    REQUEST_CHANNEL,
+    REQUEST_FEED,
+    REQUEST_OTHER,
+    REQUEST_SHORTS_PROBE,
+    REQUEST_WATCH,
+    STATS_LATENCY_BUCKETS,
+)
+
+
+def request_kind(url) -> str:
+    """Return the kind of YouTube page a URL points to."""
+    url = str(url)
+    if '/feeds/videos.xml' in url:
+        return REQUEST_FEED
+    if '/watch' in url:
+        return REQUEST_WATCH
+    if '/shorts/' in url:
+        return REQUEST_SHORTS_PROBE
+    if '/channel/' in url:
+        return REQUEST_CHANNEL
+    return REQUEST_OTHER
+
+
+class RequestStats:
+    """Counters and latency histogram of one kind of request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_time = 0.0
+        self.histogram = [0] * (len(STATS_LATENCY_BUCKETS) + 1)
+
+    def record(self, duration: float, error: bool = False) -> None:
+        """Record a request that got an answer (or failed) after ``duration`` seconds."""
+        self.count += 1
+        self.total_time += duration
+        self.histogram[bisect_left(STATS_LATENCY_BUCKETS, duration)] += 1
+        if error:
+            self.errors += 1
+
+    def as_dict(self) -> dict:
+        """Return the statistics as JSON-friendly data."""
+        labels = [f"<={bound}s" for bound in STATS_LATENCY_BUCKETS]
+        labels.append(f">{STATS_LATENCY_BUCKETS[-1]}s")
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'mean_latency_ms': round(self.total_time / self.count * 1000, 1) if self.count else None,
+            'latency_histogram': dict(zip(labels, self.histogram)),
+        }
+
+
+class ChannelStats:
+    """What polling a channel has cost, and how it went.
+
+    Latencies are measured from when the rate limiter lets a request through
+    to when its headers arrive. The bytes of a response body are counted
+    when the statistics are next read, so pages abandoned early by the
+    scanner only count for what was actually downloaded.
+    """
+
+    def __init__(self) -> None:
+        self.requests: defaultdict[str, RequestStats] = defaultdict(RequestStats)
+        self.cache_hits: Counter[str] = Counter()
+        self.cache_misses: Counter[str] = Counter()
+        self.updates = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        self.last_error_at = None
+        self.last_update_duration: float | None = None
+        self._pending: list[tuple[str, object]] = []
+
+    def record_request(self, kind: str, duration: float, response=None, error=None) -> None:
+        """Record a request, and the response whose body bytes are to be counted."""
+        failed = error is not None or (response is not None and response.status >= 400)
+        self.requests[kind].record(duration, failed)
+        if error is not None:
+            self.last_error = f"{kind}: {error}"
+            self.last_error_at = dt_util.utcnow()
+        elif failed:
+            self.last_error = f"{kind}: HTTP {response.status}"
+            self.last_error_at = dt_util.utcnow()
+        if response is not None:
+            self._pending.append((kind, response))
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Record a lookup in one of the caches."""
+        if hit:
+            self.cache_hits[cache] += 1
+        else:
+            self.cache_misses[cache] += 1
+
+    def record_update(self, duration: float, error=None) -> None:
+        """Record the outcome of a poll of the channel."""
+        self._collect()
+        self.updates += 1
+        self.last_update_duration = duration
+        if error is None:
+            self.consecutive_failures = 0
+            return
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error) or type(error).__name__
+        self.last_error_at = dt_util.utcnow()
+
+    def _collect(self) -> None:
+        for kind, response in self._pending:
+            if (content := getattr(response, 'content', None)) is not None:
+                self.requests[kind].bytes += getattr(content, 'total_bytes', 0)
+        self._pending.clear()
+
+    @property
+    def total_requests(self) -> int:
+        """Return how many requests were sent for the channel."""
+        return sum(stats.count for stats in self.requests.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """Return how many body bytes were downloaded for the channel."""
+        self._collect()
+        return sum(stats.bytes for stats in self.requests.values())
+
+    def cache_ratio(self, cache: str) -> float | None:
+        """Return the hit ratio of a cache, or None if it was never used."""
+        lookups = self.cache_hits[cache] + self.cache_misses[cache]
+        return round(self.cache_hits[cache] / lookups, 3) if lookups else None
+
+    def as_dict(self) -> dict:
+        """Return the statistics as JSON-friendly data."""
+        self._collect()
+        caches = sorted(set(self.cache_hits) | set(self.cache_misses))
+        return {
+            'requests': {kind: stats.as_dict() for kind, stats in sorted(self.requests.items())},
+            'total_requests': self.total_requests,
+            'total_bytes': self.total_bytes,
+            'cache_hit_ratio': {cache: self.cache_ratio(cache) for cache in caches},
+            'updates': self.updates,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_error': self.last_error,
+            'last_error_at': self.last_error_at.isoformat() if self.last_error_at else None,
+            'last_update_duration_ms': (
+                round(self.last_update_duration * 1000, 1)
+                if self.last_update_duration is not None else None
+            ),
+        }
+
+
+class InstrumentedClient:
+    """Rate-limited client that records every request in a channel's statistics.
+
+    It is passed to the HTTP helpers in place of the shared client, so they
+    need not know about statistics, nor about the channel's circuit breakers.
+    """
+
+    def __init__(self, client, stats: ChannelStats, breakers=None) -> None:
+        self.client = client
+        self.stats = stats
+        self.breakers = breakers
+
+    @property
+    def parser(self):
+        """Return the thread pool parsing the answers."""
+        return self.client.parser
+
+    @property
+    def flights(self):
+        """Return the requests in flight, shared by identical requests."""
+        return self.client.flights
+
+    async def get(self, url, **kwargs):
+        """Send a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        """Send a HEAD request."""
+        return await self.request("HEAD", url, **kwargs)
+
+    async def request(self, method, url, **kwargs):
+        """Send a request through the shared client."""
+        return await self.client.request(
+            method, url, stats=self.stats, breakers=self.breakers, **kwargs
+        )
@@ -0,0 +1,230 @@
+"""WebSub (PubSubHubbub) push notifications for new uploads."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import hashlib
+import hmac
+from http import HTTPStatus
+import logging
+import secrets
+from typing import TYPE_CHECKING
+import xml.etree.ElementTree as ET
+
+import aiohttp
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from .api import async_get_session
+from .const import (
+    BASE_URL,
+    CONF_REQUESTS_PER_SECOND,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DOMAIN,
+    RATE_BURST,
+    REQUEST_TIMEOUT,
+    STORAGE_VERSION,
+    WEBSUB_LEASE_SECONDS,
+    WEBSUB_RENEW_CHECK,
+    WEBSUB_RENEW_MARGIN,
+    WEBSUB_RETRY_MAX,
+    WEBSUB_STORAGE_KEY,
+)
+from .feed import parse_feed
+from .ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from .coordinator import YoutubeCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WebSubManager:
+    """Subscribe every channel to a WebSub hub and apply the pushed entries.
+
+    Notifications arrive on a Home Assistant webhook. They are checked
+    against the HMAC secret sent with the subscription, then handed to the
+    coordinator, which parses them like a polled feed. Leases are renewed
+    before they expire; polling goes on as a slow safety net. Requests to
+    the hub have a rate limiter of their own: when the hub fails, only they
+    back off, and polling YouTube goes on.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: YoutubeCoordinator, hub: str) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.hub = hub
+        self.webhook_id: str | None = None
+        self.secret: str | None = None
+        # Scadenza del lease per canale (None finché l'hub non verifica)
+        self.leases: dict[str, datetime | None] = {}
+        # Prossimo invio e attesa successiva per i lease mai verificati
+        self._retries: dict[str, tuple[datetime, timedelta]] = {}
+        rate = hass.data.get(DOMAIN, {}).get(CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND)
+        self._limiter = RateLimiter(rate, max(RATE_BURST, int(rate)), "WebSub hub")
+        self._store: Store = Store(hass, STORAGE_VERSION, WEBSUB_STORAGE_KEY)
+        self._unsub_renew: CALLBACK_TYPE | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+    @property
+    def callback_url(self) -> str:
+        """Return the URL the hub delivers notifications to."""
+        return webhook.async_generate_url(self.hass, self.webhook_id)
+
+    async def async_start(self) -> None:
+        """Register the webhook and start renewing leases."""
+        await async_setup_component(self.hass, "webhook", {})
+        stored = await self._store.async_load() or {}
+        self.webhook_id = stored.get("webhook_id") or webhook.async_generate_id()
+        self.secret = stored.get("secret") or secrets.token_hex(16)
+        await self._store.async_save({"webhook_id": self.webhook_id, "secret": self.secret})
+        self._async_activate()
+
+    @callback
+    def _async_activate(self) -> None:
+        """Register the webhook, the lease renewals and the stop listener."""
+        webhook.async_register(
+            self.hass,
+            DOMAIN,
+            "YouTube WebSub",
+            self.webhook_id,
+            self._async_handle_webhook,
+            local_only=False,
+            allowed_methods=["GET", "POST"],
+        )
+        self._unsub_renew = async_track_time_interval(
+            self.hass, self._async_renew, WEBSUB_RENEW_CHECK, cancel_on_shutdown=True
+        )
+
+        @callback
+        def _async_stop_on_shutdown(event: Event) -> None:
+            self._unsub_stop = None
+            self.async_stop()
+
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, _async_stop_on_shutdown
+        )
+
+    @property
+    def active(self) -> bool:
+        """Return True while the webhook is registered."""
+        return self._unsub_renew is not None
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop receiving notifications (a new subscription starts again)."""
+        if not self.active:
+            return
+        self._unsub_renew()
+        self._unsub_renew = None
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        webhook.async_unregister(self.hass, self.webhook_id)
+
+    def is_active(self, channel_id: str) -> bool:
+        """Return True if pushes are being received for a channel."""
+        lease = self.leases.get(channel_id)
+        return lease is not None and lease > dt_util.utcnow()
+
+    async def async_subscribe(self, channel_id: str) -> None:
+        """Ask the hub to push the uploads of a channel."""
+        if not self.active:
+            # Fermato quando è stato tolto l'ultimo canale (es. ricaricamento dell'entry)
+            self._async_activate()
+        self.leases.setdefault(channel_id, None)
+        await self._async_send(channel_id, "subscribe")
+
+    async def async_unsubscribe(self, channel_id: str) -> None:
+        """Ask the hub to stop pushing the uploads of a channel."""
+        self.leases.pop(channel_id, None)
+        self._retries.pop(channel_id, None)
+        await self._async_send(channel_id, "unsubscribe")
+
+    async def _async_send(self, channel_id: str, mode: str) -> None:
+        data = {
+            'hub.callback': self.callback_url,
+            'hub.mode': mode,
+            'hub.topic': BASE_URL.format(channel_id),
+            'hub.verify': 'async',
+        }
+        if mode == "subscribe":
+            data['hub.lease_seconds'] = str(WEBSUB_LEASE_SECONDS)
+            data['hub.secret'] = self.secret
+        try:
+            await self._limiter.acquire()
+            response = await async_get_session(self.hass).post(
+                self.hub, data=data, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+            if response.status == HTTPStatus.TOO_MANY_REQUESTS or response.status >= 500:
+                self._limiter.throttled(response.status, response.headers.get("Retry-After"))
+            else:
+                self._limiter.succeeded()
+            response.raise_for_status()
+            _LOGGER.debug('WebSub %s request accepted for %s', mode, channel_id)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning('WebSub %s failed for channel %s - %s', mode, channel_id, error)
+
+    async def _async_renew(self, now: datetime) -> None:
+        """Renew the leases that expire soon (or were never verified).
+
+        A subscription the hub does not verify is sent again after one
+        WEBSUB_RENEW_CHECK, then after twice as long each time, up to
+        WEBSUB_RETRY_MAX: the channel is polled meanwhile anyway.
+        """
+        for channel_id, lease in list(self.leases.items()):
+            if lease is None:
+                retry_at, delay = self._retries.get(channel_id, (now, WEBSUB_RENEW_CHECK))
+                if now < retry_at:
+                    continue
+                self._retries[channel_id] = (now + delay, min(delay * 2, WEBSUB_RETRY_MAX))
+                await self.async_subscribe(channel_id)
+            elif lease - now < WEBSUB_RENEW_MARGIN:
+                await self.async_subscribe(channel_id)
+
+    async def _async_handle_webhook(
+        self, hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Handle hub verifications (GET) and notifications (POST)."""
+        if request.method == "GET":
+            return self._handle_verification(request)
+
+        body = await request.content.read()
+        signature = request.headers.get('X-Hub-Signature', '')
+        algorithm, _, digest = signature.partition('=')
+        if algorithm not in ('sha1', 'sha256') or not hmac.compare_digest(
+            hmac.new(self.secret.encode(), body, getattr(hashlib, algorithm)).hexdigest(),
+            digest,
+        ):
+            # Il protocollo richiede comunque una risposta 2xx
+            _LOGGER.warning('Ignoring WebSub notification with an invalid signature')
+            return web.Response(status=202)
+
+        try:
+            # Letta una volta sola, nel pool di parsing e non nel loop
+            feed = await self.coordinator.session.parser.async_run(parse_feed, body)
+        except ET.ParseError as error:
+            _LOGGER.debug('Malformed WebSub notification - %s', error)
+            return web.Response(status=202)
+        for channel_id in feed.channel_ids:
+            _LOGGER.debug('WebSub notification for channel %s', channel_id)
+            hass.async_create_task(self.coordinator.async_handle_push(channel_id, feed))
+        return web.Response(status=202)
+
+    def _handle_verification(self, request: web.Request) -> web.Response:
+        mode = request.query.get('hub.mode')
+        topic = request.query.get('hub.topic', '')
+        channel_id = topic.rpartition('channel_id=')[2]
+        if mode == "subscribe" and channel_id in self.leases:
+            lease_seconds = int(request.query.get('hub.lease_seconds', WEBSUB_LEASE_SECONDS))
+            self.leases[channel_id] = dt_util.utcnow() + timedelta(seconds=lease_seconds)
+            self._retries.pop(channel_id, None)
+            _LOGGER.debug('WebSub subscription for %s verified (%d s)', channel_id, lease_seconds)
+        elif not (mode == "unsubscribe" and channel_id not in self.leases):
+            return web.Response(status=404)
+        return web.Response(text=request.query.get('hub.challenge', ''))
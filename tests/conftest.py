@@ -1,4 +1,5 @@
 """Fixtures for testing."""
+from unittest.mock import patch
 
 import pytest
 
@@ -7,3 +8,13 @@ import pytest
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations."""
     return
+
+
+@pytest.fixture(autouse=True)
+def mock_session(aioclient_mock):
+    """Route the integration's shared HTTP session to the aiohttp mocker."""
+    with patch(
+        "custom_components.youtube_sensor.api._async_create_session",
+        side_effect=lambda hass: aioclient_mock.create_session(hass.loop),
+    ):
+        yield aioclient_mock
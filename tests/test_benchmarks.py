@@ -0,0 +1,23 @@
+"""Smoke test of the offline benchmark against the local stand-in server."""
+from benchmarks.run import async_run_scenario
+from benchmarks.server import StandInServer
+
+from custom_components.youtube_sensor.const import CONF_REQUESTS_PER_SECOND, DOMAIN
+
+
+async def test_benchmark_scenario(hass, socket_enabled):
+    """Test a small benchmark run counts requests and bytes for every round."""
+    hass.data[DOMAIN] = {CONF_REQUESTS_PER_SECOND: 1000}
+    server = StandInServer(page_size=4096)
+    await server.async_start()
+    try:
+        results = await async_run_scenario(hass, server, channels=3, publish=1.0, memory=False)
+    finally:
+        await server.async_stop()
+
+    cold, warm, publish = results
+    assert cold.requests_per_channel > warm.requests_per_channel
+    assert cold.kb_per_channel > warm.kb_per_channel
+    # Dopo un nuovo caricamento il feed va riletto e il nuovo video classificato
+    assert publish.requests_per_channel > warm.requests_per_channel
+    assert server.stats.statuses[304] == 3
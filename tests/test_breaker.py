@@ -0,0 +1,110 @@
+"""Test the per-channel circuit breakers."""
+from datetime import timedelta
+from http import HTTPStatus
+import time
+
+from homeassistant.const import STATE_UNAVAILABLE
+
+from custom_components.youtube_sensor.breaker import CircuitBreaker
+from custom_components.youtube_sensor.const import (
+    BASE_URL,
+    BREAKER_CLOSED,
+    BREAKER_COOLDOWN,
+    BREAKER_GONE_COOLDOWN,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    BREAKER_THRESHOLD,
+    DATA_COORDINATOR,
+    DOMAIN,
+    STATE_CACHE_STORAGE_KEY,
+)
+from custom_components.youtube_sensor.coordinator import YoutubeChannel
+
+from .test_sensor import CHANNEL_ID, mock_youtube, setup_entry
+
+
+def test_breaker_opens_and_probes(freezer):
+    """Test the breaker opens after repeated failures and lets one probe through."""
+    breaker = CircuitBreaker("Test")
+    for _ in range(BREAKER_THRESHOLD - 1):
+        breaker.failed()
+    assert breaker.state == BREAKER_CLOSED
+    breaker.failed()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow()
+
+    freezer.tick(BREAKER_COOLDOWN)
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.allow()
+    # Una sola richiesta di prova alla volta
+    assert not breaker.allow()
+
+    # La prova fallisce: di nuovo aperto, per il doppio del tempo
+    breaker.failed()
+    assert breaker.state == BREAKER_OPEN
+    freezer.tick(BREAKER_COOLDOWN)
+    assert breaker.state == BREAKER_OPEN
+    freezer.tick(BREAKER_COOLDOWN)
+    assert breaker.allow()
+
+    # Una prova annullata lascia provare la richiesta successiva
+    breaker.release()
+    assert breaker.allow()
+    breaker.succeeded()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.opens == 0
+
+
+async def test_deleted_channel_unavailable(hass, aioclient_mock, freezer):
+    """Test a channel whose feed is gone becomes unavailable and stops polling."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    channel = next(iter(coordinator.channels.values()))
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BASE_URL.format(CHANNEL_ID), status=HTTPStatus.NOT_FOUND)
+    for _ in range(BREAKER_THRESHOLD):
+        channel.next_update = None
+        await coordinator.async_refresh()
+
+    assert hass.states.get("sensor.youtube_test_channel").state == STATE_UNAVAILABLE
+    assert channel.breakers.feed.gone
+    assert channel.next_update >= channel.breakers.feed.retry_at
+    assert aioclient_mock.call_count == BREAKER_THRESHOLD
+
+    # Finché l'interruttore è aperto il canale non costa richieste
+    channel.next_update = None
+    await coordinator.async_refresh()
+    assert aioclient_mock.call_count == BREAKER_THRESHOLD
+
+    # Il canale torna: la richiesta di prova lo rende di nuovo disponibile
+    freezer.tick(BREAKER_GONE_COOLDOWN + timedelta(seconds=1))
+    aioclient_mock.clear_requests()
+    mock_youtube(aioclient_mock)
+    channel.next_update = None
+    channel.feed_hash = None
+    await coordinator.async_refresh()
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state != STATE_UNAVAILABLE
+    assert channel.breakers.feed.state == BREAKER_CLOSED
+
+
+async def test_restored_open_breaker(hass, hass_storage):
+    """Test a sensor restored with its feed breaker open stays unavailable across updates."""
+    saved = YoutubeChannel(CHANNEL_ID, "Test Channel")
+    saved.title = "A regular video & more"
+    for _ in range(BREAKER_THRESHOLD):
+        saved.breakers.feed.failed(gone=True)
+    hass_storage[STATE_CACHE_STORAGE_KEY] = {
+        "version": 1,
+        "key": STATE_CACHE_STORAGE_KEY,
+        "data": {"channels": {f"{CHANNEL_ID}_videos": [saved.snapshot(), time.time()]}},
+    }
+    await setup_entry(hass, refresh=False)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    # Nessun attributo mai letto: gli aggiornamenti non devono fallire
+    for _ in range(3):
+        coordinator.async_update_listeners()
+    assert hass.states.get("sensor.youtube_test_channel").state == STATE_UNAVAILABLE
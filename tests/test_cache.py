@@ -0,0 +1,40 @@
+"""Test the shared Shorts verdict cache."""
+from unittest.mock import patch
+
+from custom_components.youtube_sensor.cache import ShortsCache, async_get_shorts_cache
+from custom_components.youtube_sensor.const import SHORTS_CACHE_STORAGE_KEY
+
+
+async def test_shorts_cache_lru_eviction(hass):
+    """Test the least recently used verdict is evicted first."""
+    cache = ShortsCache(hass, max_size=2)
+    await cache.async_load()
+    cache.set("a", True)
+    cache.set("b", False)
+    assert cache.get("a") is True
+    cache.set("c", False)
+    assert cache.get("b") is None
+    assert cache.get("a") is True
+    assert cache.get("c") is False
+
+
+async def test_shorts_cache_age_eviction(hass):
+    """Test verdicts older than the maximum age are dropped."""
+    cache = ShortsCache(hass, max_age=60)
+    await cache.async_load()
+    with patch("custom_components.youtube_sensor.cache.time.time", return_value=1000):
+        cache.set("a", True)
+    with patch("custom_components.youtube_sensor.cache.time.time", return_value=1100):
+        assert cache.get("a") is None
+
+
+async def test_shorts_cache_restored_from_storage(hass, hass_storage):
+    """Test verdicts survive a restart."""
+    hass_storage[SHORTS_CACHE_STORAGE_KEY] = {
+        "version": 1,
+        "key": SHORTS_CACHE_STORAGE_KEY,
+        "data": {"verdicts": {"abc": [True, 4102444800]}},
+    }
+    cache = await async_get_shorts_cache(hass)
+    assert cache.get("abc") is True
+    assert await async_get_shorts_cache(hass) is cache
@@ -0,0 +1,177 @@
+"""Test the shared coordinator."""
+import asyncio
+from unittest.mock import patch
+
+from custom_components.youtube_sensor.const import SHORTS_CLASSIFY_CONCURRENCY
+from custom_components.youtube_sensor.coordinator import (
+    YoutubeChannel,
+    async_get_coordinator,
+)
+from custom_components.youtube_sensor.feed import FeedParser, parse_feed
+
+from .test_sensor import load_fixture
+
+
+def feed_with_older_videos(views, count=3):
+    """Return the test feed followed by ``count`` older regular videos, all with ``views``."""
+    body = load_fixture("videos.xml")
+    start = body.index("<entry>", body.index("video000001") - 200)
+    entry = body[start:body.index("</entry>", start) + len("</entry>")]
+    older = "".join(
+        entry.replace("video000001", f"video00000{index}") for index in range(2, count + 2)
+    )
+    body = body.replace("</feed>", older + "\n</feed>")
+    return parse_feed(body.replace('views="340"', f'views="{views}"').replace('views="2500"', f'views="{views}"'))
+
+
+async def test_find_latest_keeps_feed_order(hass):
+    """Test the first regular video and Short win and later checks are cancelled."""
+    coordinator = await async_get_coordinator(hass)
+    channel = YoutubeChannel("UC4V3oCikXeSqYQr0hBMARwg", "Test")
+    channel.watch_shorts(True)
+    delays = {"s1": 0.02, "v1": 0.04, "v2": 10, "s2": 0.0, "v3": 0.0}
+    started, cancelled = [], []
+
+    async def is_short(channel, video_id):
+        started.append(video_id)
+        try:
+            await asyncio.sleep(delays[video_id])
+        except asyncio.CancelledError:
+            cancelled.append(video_id)
+            raise
+        return video_id.startswith("s")
+
+    with patch.object(coordinator, "_async_is_short", side_effect=is_short):
+        found = await coordinator._async_find_latest(channel, list(delays), {})
+
+    assert found == (1, 0)
+    await asyncio.sleep(0)
+    assert "v2" in cancelled
+    # Prima solo il video successivo, dopo uno Short i successivi tre
+    assert started == ["s1", "v1", "v2", "s2", "v3"]
+
+
+async def test_find_latest_shorts_classified_concurrently(hass):
+    """Test a run of Shorts is classified several at a time, not one round trip each."""
+    coordinator = await async_get_coordinator(hass)
+    channel = YoutubeChannel("UC4V3oCikXeSqYQr0hBMARwg", "Test")
+    video_ids = [f"s{index}" for index in range(12)] + ["v1"]
+    running, peak = 0, 0
+
+    async def is_short(channel, video_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return video_id.startswith("s")
+
+    with patch.object(coordinator, "_async_is_short", side_effect=is_short):
+        assert await coordinator._async_find_latest(channel, video_ids, {}) == (12, 0)
+
+    assert peak == SHORTS_CLASSIFY_CONCURRENCY
+
+
+async def test_find_latest_skips_unwatched_shorts(hass):
+    """Test older videos are not classified to find a Short no entity shows."""
+    coordinator = await async_get_coordinator(hass)
+    channel = YoutubeChannel("UC4V3oCikXeSqYQr0hBMARwg", "Test")
+    started = []
+
+    async def is_short(channel, video_id):
+        started.append(video_id)
+        return video_id.startswith("s")
+
+    with patch.object(coordinator, "_async_is_short", side_effect=is_short):
+        assert await coordinator._async_find_latest(channel, ["v1", "v2", "s1", "v3"], {}) == (0, None)
+        assert started == ["v1", "v2"]
+        # Il primo sensore dell'ultimo Short fa rileggere il feed
+        channel.etag = '"feed-v1"'
+        channel.watch_shorts(True)
+        assert channel.etag is None
+
+        channel.include_shorts = True
+        started.clear()
+        assert await coordinator._async_find_latest(channel, ["s1", "v1", "v2"], {}) == (None, 0)
+        assert started == ["s1", "v1"]
+
+
+async def test_overlapping_cycles_poll_once(hass):
+    """Test a cycle started while another runs leaves its channels alone."""
+    coordinator = await async_get_coordinator(hass)
+    first = coordinator.async_register_channel("UC4V3oCikXeSqYQr0hBMARwg", "First")
+    polled = []
+    release = asyncio.Event()
+
+    async def update(channel):
+        polled.append(channel.channel_id)
+        await release.wait()
+
+    with patch.object(coordinator, "_async_update_channel", side_effect=update):
+        running = hass.async_create_task(coordinator.async_refresh())
+        await asyncio.sleep(0)
+        # Un canale aggiunto durante il ciclo: il suo primo aggiornamento non ripete il primo
+        second = coordinator.async_register_channel("UCaaaaaaaaaaaaaaaaaaaaaa", "Second")
+        first.next_update = None
+        release.set()
+        await coordinator._async_update_data()  # pylint: disable=protected-access
+        await running
+
+    assert sorted(polled) == ["UC4V3oCikXeSqYQr0hBMARwg", "UCaaaaaaaaaaaaaaaaaaaaaa"]
+    coordinator.async_unregister_channel(first)
+    coordinator.async_unregister_channel(second)
+    coordinator._unsub_startup()  # pylint: disable=protected-access
+
+
+async def test_push_during_poll_waits_for_it(hass):
+    """Test a push notification for a channel being polled is applied once the poll ends."""
+    coordinator = await async_get_coordinator(hass)
+    channel = coordinator.async_register_channel("UC4V3oCikXeSqYQr0hBMARwg", "Test")
+    events = []
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def update(channel):
+        events.append("poll")
+        started.set()
+        await release.wait()
+        events.append("poll done")
+
+    async def apply_push(channel_id, feed):
+        events.append("push")
+
+    with patch.object(coordinator, "_async_update_channel", side_effect=update), patch.object(
+        coordinator, "_async_apply_push", side_effect=apply_push
+    ):
+        running = hass.async_create_task(coordinator.async_refresh())
+        await started.wait()
+        await coordinator.async_handle_push(channel.channel_id, FeedParser())
+        assert events == ["poll"]
+        release.set()
+        await running
+        await hass.async_block_till_done()
+
+    assert events == ["poll", "poll done", "push"]
+    assert not coordinator._polling  # pylint: disable=protected-access
+    coordinator.async_unregister_channel(channel)
+    coordinator._unsub_startup()  # pylint: disable=protected-access
+
+
+async def test_unclassified_entries_are_not_new_uploads(hass):
+    """Test a feed whose views changed grows the back-off, even with entries never classified."""
+    coordinator = await async_get_coordinator(hass)
+    channel = YoutubeChannel("UC4V3oCikXeSqYQr0hBMARwg", "Test")
+
+    async def is_short(channel, video_id):
+        return video_id.startswith("short")
+
+    idle_polls = []
+    with patch.object(coordinator, "_async_is_short", side_effect=is_short), patch(
+        "custom_components.youtube_sensor.coordinator.is_live", return_value=(None, None)
+    ):
+        for views in (100, 200, 300, 400):
+            await coordinator._async_process_feed(channel, feed_with_older_videos(views))
+            idle_polls.append(channel.scheduler.idle_polls)
+
+    assert idle_polls == [0, 1, 2, 3]
+    assert len(channel.entries) == 5
+    assert channel.entries["video000004"].is_short is None
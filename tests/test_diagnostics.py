@@ -0,0 +1,61 @@
+"""Test the request statistics and diagnostics."""
+from http import HTTPStatus
+
+from custom_components.youtube_sensor.const import (
+    BASE_URL,
+    CACHE_FEED,
+    DATA_COORDINATOR,
+    DOMAIN,
+    REQUEST_CHANNEL,
+    REQUEST_FEED,
+)
+from custom_components.youtube_sensor.diagnostics import async_get_config_entry_diagnostics
+
+from .test_sensor import CHANNEL_ID, mock_youtube, setup_entry
+
+
+async def test_diagnostics_report_channel_statistics(hass, aioclient_mock):
+    """Test requests and feed cache lookups are counted per channel."""
+    mock_youtube(aioclient_mock)
+    entry = await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BASE_URL.format(CHANNEL_ID), status=HTTPStatus.NOT_MODIFIED)
+    for channel in coordinator.channels.values():
+        channel.next_update = None
+    await coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    stats = diagnostics["channels"][0]["stats"]
+    assert stats["requests"][REQUEST_FEED]["count"] == 2
+    assert stats["requests"][REQUEST_CHANNEL]["count"] >= 1
+    assert stats["cache_hit_ratio"][CACHE_FEED] == 0.5
+    assert stats["updates"] == 2
+    assert stats["consecutive_failures"] == 0
+    assert diagnostics["coordinator"]["top_channels"][0]["name"] == "Test Channel"
+
+
+async def test_consecutive_failures(hass, aioclient_mock):
+    """Test failed polls are counted until one succeeds."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    channel = next(iter(coordinator.channels.values()))
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BASE_URL.format(CHANNEL_ID), status=HTTPStatus.NOT_FOUND)
+    for _ in range(2):
+        channel.next_update = None
+        await coordinator.async_refresh()
+
+    assert channel.stats.failures == 2
+    assert channel.stats.consecutive_failures == 2
+    assert channel.stats.last_error is not None
+
+    aioclient_mock.clear_requests()
+    mock_youtube(aioclient_mock)
+    channel.next_update = None
+    await coordinator.async_refresh()
+    assert channel.stats.consecutive_failures == 0
+    assert channel.stats.failures == 2
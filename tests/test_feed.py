@@ -0,0 +1,100 @@
+"""Test the streaming Atom feed parser."""
+from pathlib import Path
+
+from custom_components.youtube_sensor.executor import ParseExecutor
+from custom_components.youtube_sensor.feed import (
+    FeedEntry,
+    async_parse_feed,
+    feed_maybe_stream,
+    feed_short_verdict,
+    parse_feed,
+)
+
+from .test_scanner import mock_response
+
+FEED = (Path(__file__).parent / "fixtures" / "videos.xml").read_bytes()
+
+
+def test_parse_feed():
+    """Test every entry is turned into a compact record."""
+    feed = parse_feed(FEED)
+    assert feed.title == "Test Channel"
+    assert [entry.video_id for entry in feed.entries] == ["short000001", "video000001"]
+    assert feed.entries[1] == FeedEntry(
+        video_id="video000001",
+        title="A regular video & more",
+        url="https://www.youtube.com/watch?v=video000001",
+        published="2026-10-15T17:00:00+00:00",
+        updated="2026-10-16T09:00:00+00:00",
+        thumbnail="https://i3.ytimg.com/vi/video000001/hqdefault.jpg",
+        stars="100",
+        views="2500",
+    )
+    assert feed.entries[0].url == "https://www.youtube.com/shorts/short000001"
+
+
+def test_notified_channels():
+    """Test the channels of a notification, deleted videos included."""
+    assert parse_feed(FEED).channel_ids == {"UC4V3oCikXeSqYQr0hBMARwg"}
+    deleted = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:at="http://purl.org/atompub/tombstones/1.0" xmlns="http://www.w3.org/2005/Atom">
+ <at:deleted-entry ref="yt:video:video000001" when="2026-10-17T09:00:00+00:00">
+  <link href="https://www.youtube.com/watch?v=video000001"/>
+  <at:by>
+   <name>Test Channel</name>
+   <uri>https://www.youtube.com/channel/UCdeleted0000000000000</uri>
+  </at:by>
+ </at:deleted-entry>
+</feed>"""
+    feed = parse_feed(deleted)
+    assert feed.channel_ids == {"UCdeleted0000000000000"}
+    assert not feed.entries
+
+
+def test_feed_hints():
+    """Test the Short verdict and the stream hint read from the feed alone."""
+    short, video = parse_feed(FEED).entries
+    assert feed_short_verdict(short) is True
+    assert feed_short_verdict(video) is False
+    assert not feed_maybe_stream(video)
+
+    # Senza link il feed non dice nulla; senza statistiche può essere una diretta
+    unlinked = parse_feed(FEED.replace(
+        b'<link rel="alternate" href="https://www.youtube.com/watch?v=video000001"/>', b''
+    )).entries[1]
+    assert unlinked.url == "https://www.youtube.com/watch?v=video000001"
+    assert feed_short_verdict(unlinked) is None
+    assert feed_maybe_stream(video._replace(views="0", stars="0"))
+
+
+async def test_stream_stops_after_title():
+    """Test a caller needing only the channel title does not read the whole feed."""
+    chunks = [FEED[i:i + 200] for i in range(0, len(FEED), 200)]
+    response = mock_response(*chunks)
+    feed = await async_parse_feed(response, stop=lambda feed: feed.title is not None)
+    assert feed.title == "Test Channel"
+    assert feed.entries == []
+    response.close.assert_called_once()
+    response.release.assert_not_called()
+
+
+async def test_stream_matches_parse():
+    """Test a feed streamed in small chunks gives the same records and digest."""
+    chunks = [FEED[i:i + 7] for i in range(0, len(FEED), 7)]
+    response = mock_response(*chunks)
+    streamed = await async_parse_feed(response)
+    parsed = parse_feed(FEED)
+    assert streamed.entries == parsed.entries
+    assert streamed.digest == parsed.digest
+    response.release.assert_called_once()
+
+
+async def test_stream_parsed_in_executor():
+    """Test a feed parsed in the parser threads gives the same result."""
+    chunks = [FEED[i:i + 4096] for i in range(0, len(FEED), 4096)]
+    executor = ParseExecutor()
+    try:
+        streamed = await async_parse_feed(mock_response(*chunks), executor=executor)
+    finally:
+        executor.shutdown()
+    assert streamed.entries == parse_feed(FEED).entries
@@ -0,0 +1,58 @@
+"""Test the history of recent videos."""
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.setup import async_setup_component
+
+from custom_components.youtube_sensor.const import DOMAIN, HISTORY_SIZE, SERVICE_GET_RECENT_VIDEOS
+from custom_components.youtube_sensor.feed import FeedEntry
+from custom_components.youtube_sensor.history import VideoHistory
+
+from .test_sensor import mock_youtube, setup_entry
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_entry(seq):
+    """Return a feed entry published ``seq`` hours after EPOCH."""
+    return FeedEntry(
+        f"video{seq:06d}", f"Video {seq}", f"https://www.youtube.com/watch?v=video{seq:06d}",
+        (EPOCH + timedelta(hours=seq)).isoformat(), None, None, "0", "0",
+    )
+
+
+def test_history_is_bounded():
+    """Test new videos push the oldest ones out, whatever order they arrive in."""
+    history = VideoHistory()
+    history.update([make_entry(seq) for seq in range(HISTORY_SIZE, 0, -1)], {})
+    history.update([make_entry(seq) for seq in range(HISTORY_SIZE + 3, HISTORY_SIZE, -1)], {})
+    assert len(history) == HISTORY_SIZE
+    assert [video.video_id for video in history][0] == "video000004"
+
+    # Un video più vecchio di tutti non resta nella cronologia
+    history.update([make_entry(0)], {"video000000": True})
+    assert history.get("video000000") is None
+
+    history.update([make_entry(5)], {"video000005": True})
+    assert history.get("video000005").is_short is True
+    restored = VideoHistory.from_list(history.as_list())
+    assert [video.as_list() for video in restored] == history.as_list()
+
+
+async def test_get_recent_videos(hass, aioclient_mock):
+    """Test the service answers from memory, with filters."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass, include_shorts=True)
+    assert await async_setup_component(hass, DOMAIN, {})
+    calls = aioclient_mock.call_count
+
+    async def _async_query(**data):
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_GET_RECENT_VIDEOS, data, blocking=True, return_response=True
+        )
+        return [video["video_id"] for video in response["videos"]]
+
+    assert await _async_query() == ["short000001", "video000001"]
+    assert await _async_query(shorts=True) == ["short000001"]
+    assert await _async_query(since="2026-10-16T00:00:00+00:00") == ["short000001"]
+    assert await _async_query(channel_id="UCxxxxxxxxxxxxxxxxxxxxxx") == []
+    assert aioclient_mock.call_count == calls
@@ -0,0 +1,70 @@
+"""Test the bulk import of channels."""
+from http import HTTPStatus
+
+from homeassistant.setup import async_setup_component
+
+from custom_components.youtube_sensor.const import (
+    BASE_URL,
+    CHANNEL_LIVE_URL,
+    DOMAIN,
+    SERVICE_IMPORT_CHANNELS,
+)
+from custom_components.youtube_sensor.importer import parse_channel_ids
+
+from .test_sensor import CHANNEL_ID, async_startup_refresh, load_fixture, mock_youtube, setup_entry
+
+OTHER_ID = "UCabcdefghijklmnopqrstuv"
+BROKEN_ID = "UCzzzzzzzzzzzzzzzzzzzzzz"
+
+OPML = f"""<opml version="1.1"><body><outline text="YouTube Subscriptions">
+<outline text="Test" type="rss" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id={CHANNEL_ID}" />
+<outline text="Other" type="rss" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id={OTHER_ID}" />
+<outline text="Broken" type="rss" xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id={BROKEN_ID}" />
+</outline></body></opml>"""
+
+
+def test_parse_channel_ids():
+    """Test channel IDs are read from OPML and Takeout CSV exports."""
+    assert parse_channel_ids(OPML) == [CHANNEL_ID, OTHER_ID, BROKEN_ID]
+
+    csv = (
+        "Channel Id,Channel Url,Channel Title\n"
+        f"{OTHER_ID},http://www.youtube.com/channel/{OTHER_ID},Other\n"
+        f"{CHANNEL_ID},http://www.youtube.com/channel/{CHANNEL_ID},Test\n"
+    )
+    assert parse_channel_ids(csv) == [OTHER_ID, CHANNEL_ID]
+    assert parse_channel_ids(f"{CHANNEL_ID}x UC123") == []
+
+
+async def test_import_reuses_validated_feeds(hass, aioclient_mock):
+    """Test each imported channel costs one feed request, and known channels none."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    aioclient_mock.clear_requests()
+    mock_youtube(aioclient_mock)
+    aioclient_mock.get(BASE_URL.format(OTHER_ID), text=load_fixture("videos.xml"))
+    aioclient_mock.get(CHANNEL_LIVE_URL.format(OTHER_ID), text=load_fixture("channel.html"))
+    aioclient_mock.get(BASE_URL.format(BROKEN_ID), status=HTTPStatus.NOT_FOUND)
+
+    result = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_CHANNELS,
+        {"subscriptions": OPML},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+    await async_startup_refresh(hass)
+
+    assert result["imported"] == [OTHER_ID]
+    assert result["already_configured"] == [CHANNEL_ID]
+    assert list(result["failed"]) == [BROKEN_ID]
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 2
+
+    feed_requests = [
+        call for call in aioclient_mock.mock_calls if "feeds/videos.xml" in str(call[1])
+    ]
+    assert len(feed_requests) == 2
+    assert hass.states.get("sensor.youtube_test_channel_2").state == "A regular video & more"
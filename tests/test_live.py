@@ -0,0 +1,107 @@
+"""Test the tracking of live streams."""
+from datetime import datetime, timedelta, timezone
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.youtube_sensor.const import (
+    DATA_COORDINATOR,
+    DOMAIN,
+    STREAM_LIVE_RECHECK,
+    STREAM_START_DELAY,
+)
+from custom_components.youtube_sensor.feed import parse_feed
+
+from .test_sensor import CHANNEL_ID, load_fixture, mock_youtube, setup_entry
+from .test_websub import PUSH
+
+WATCH_URL = "https://www.youtube.com/watch?v=video000001"
+START = datetime(2026, 10, 18, 13, 0, tzinfo=timezone.utc)
+
+
+def stream_page(upcoming=False, ended=False):
+    """Return the watch page of a stream starting at START."""
+    details = '"isUpcoming":true' if upcoming else '"isLive":true'
+    end = '<meta itemprop="endDate" content="2026-10-18T14:00:00+00:00">' if ended else ''
+    return (
+        '<html><body><span itemprop="publication">'
+        '<meta itemprop="isLiveBroadcast" content="True">'
+        f'<meta itemprop="startDate" content="{START.isoformat()}">{end}</span>'
+        '<script>var ytInitialPlayerResponse = {"videoDetails":{"videoId":"video000001",'
+        f'{details}}}}};</script></body></html>'
+    )
+
+
+def mock_stream(aioclient_mock, **kwargs):
+    """Serve the test channel with its latest video being a stream."""
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(WATCH_URL, text=stream_page(**kwargs))
+    mock_youtube(aioclient_mock)
+
+
+async def test_stream_tracked_until_it_ends(hass, aioclient_mock, freezer):
+    """Test an upcoming stream is checked at its start, while live, and no more once ended."""
+    freezer.move_to(START - timedelta(minutes=5))
+    mock_stream(aioclient_mock, upcoming=True)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.attributes["stream_state"] == "upcoming"
+    assert state.attributes["live"] is False
+    stream = hass.states.get("sensor.youtube_test_channel_stream")
+    assert stream.state == "A regular video & more"
+    assert stream.attributes["stream_state"] == "upcoming"
+
+    # Va in onda: controllato subito dopo l'orario previsto, senza aspettare il feed
+    mock_stream(aioclient_mock)
+    freezer.move_to(START + STREAM_START_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.attributes["stream_state"] == "live"
+    assert state.attributes["live"] is True
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [WATCH_URL]
+
+    mock_stream(aioclient_mock, ended=True)
+    freezer.tick(STREAM_LIVE_RECHECK)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.attributes["stream_state"] == "ended"
+    assert state.attributes["live"] is False
+    assert hass.states.get("sensor.youtube_test_channel_stream").attributes["stream_state"] == "ended"
+    assert not coordinator._stream_checks  # pylint: disable=protected-access
+
+
+async def test_stream_tracked_after_newer_upload(hass, aioclient_mock, freezer):
+    """Test the latest stream is still followed once a newer video is shown."""
+    freezer.move_to(START - timedelta(minutes=5))
+    mock_stream(aioclient_mock, upcoming=True)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    # Un video normale caricato prima dell'inizio della diretta
+    aioclient_mock.get(
+        "https://www.youtube.com/watch?v=video000002", text=load_fixture("watch_video.html")
+    )
+    await coordinator.async_handle_push(CHANNEL_ID, parse_feed(PUSH))
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.youtube_test_channel").state == "A pushed video"
+    stream = hass.states.get("sensor.youtube_test_channel_stream")
+    assert stream.attributes["video_id"] == "video000001"
+    assert stream.attributes["stream_state"] == "upcoming"
+
+    mock_stream(aioclient_mock)
+    freezer.move_to(START + STREAM_START_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [WATCH_URL]
+    assert hass.states.get("sensor.youtube_test_channel_stream").attributes["stream_state"] == "live"
+    assert hass.states.get("sensor.youtube_test_channel").state == "A pushed video"
+
+    mock_stream(aioclient_mock, ended=True)
+    freezer.tick(STREAM_LIVE_RECHECK)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.youtube_test_channel_stream").attributes["stream_state"] == "ended"
+    assert not coordinator._stream_checks  # pylint: disable=protected-access
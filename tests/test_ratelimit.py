@@ -0,0 +1,32 @@
+"""Test the integration-wide rate limiter."""
+from http import HTTPStatus
+
+from custom_components.youtube_sensor.const import RATE_BACKOFF_BASE
+from custom_components.youtube_sensor.ratelimit import RateLimiter, parse_retry_after
+
+
+def test_parse_retry_after():
+    """Test both forms of the Retry-After header."""
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Thu, 01 Jan 1970 00:00:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+async def test_backoff_on_throttling():
+    """Test 429 answers block requests, honoring Retry-After, until a success."""
+    limiter = RateLimiter(rate=5, burst=2)
+    await limiter.acquire()
+
+    limiter.throttled(HTTPStatus.TOO_MANY_REQUESTS, "600")
+    assert 590 < limiter.blocked_for <= 600
+    assert limiter.failures == 1
+
+    # Altre risposte della stessa raffica non allungano il back-off
+    limiter.throttled(HTTPStatus.TOO_MANY_REQUESTS)
+    assert limiter.failures == 1
+
+    limiter.succeeded()
+    limiter._blocked_until = 0
+    limiter.throttled(HTTPStatus.SERVICE_UNAVAILABLE)
+    assert RATE_BACKOFF_BASE - 1 < limiter.blocked_for <= RATE_BACKOFF_BASE
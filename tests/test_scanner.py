@@ -0,0 +1,133 @@
+"""Test the streaming page scanner."""
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from custom_components.youtube_sensor.api import (
+    LIVE_SCANNER,
+    WATCH_SCANNER,
+    _short_known,
+    async_get_client,
+    is_live,
+    is_youtube_short,
+)
+from custom_components.youtube_sensor.executor import ParseExecutor
+from custom_components.youtube_sensor.scanner import PageScanner
+
+
+def mock_response(*chunks):
+    """Return a response whose body is streamed in the given chunks."""
+
+    async def iter_chunked(size):
+        for chunk in chunks:
+            yield chunk
+
+    response = MagicMock()
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+async def test_match_across_chunks():
+    """Test a pattern split between two chunks is found."""
+    scanner = PageScanner({"live": rb'\{"iconType":"LIVE"\}', "other": rb"nothing"})
+    response = mock_response(b'...{"iconT', b'ype":"LIVE"}...')
+    found, truncated = await scanner.async_scan(response)
+    assert found == {"live": b'{"iconType":"LIVE"}'}
+    assert not truncated
+    response.release.assert_called_once()
+    response.close.assert_not_called()
+
+
+def test_overlapping_matches_all_found():
+    """Test a match does not hide another pattern overlapping it."""
+    # L'indicatore della diretta è solo dentro quello del video normale
+    page = (
+        b'{"isLiveBroadcast":true,"lengthSeconds":"0"}'
+        b'<meta itemprop="startDate" content="2026-10-18T13:00:00+00:00">'
+    )
+    found = WATCH_SCANNER.scan(page)
+    assert found["normal"] == b'"isLiveBroadcast":true'
+    assert found["broadcast"] == b"isLiveBroadcast"
+    # La scansione condivisa vede la diretta come quella dedicata
+    assert {name: found[name] for name in LIVE_SCANNER.names if name in found} == LIVE_SCANNER.scan(page)
+
+    # Due pattern che iniziano nello stesso punto
+    assert PageScanner({"long": rb"abc", "short": rb"ab"}).scan(b"xabc") == {"long": b"abc", "short": b"ab"}
+
+
+async def test_cut_off_page_reported(hass, aioclient_mock):
+    """Test a page cut off at SCAN_MAX_BYTES is not taken as proof of a missing pattern."""
+    response = mock_response(b'{"lengthSeconds":"21"}', b"x" * 10, b"never read")
+    with patch("custom_components.youtube_sensor.scanner.SCAN_MAX_BYTES", 20):
+        found, truncated = await WATCH_SCANNER.async_scan(response, _short_known)
+    assert truncated
+    assert found == {"length": b'"lengthSeconds":"21"'}
+    response.close.assert_called_once()
+
+    # Né "non è uno Short" né "non è una diretta": la risposta è sconosciuta
+    url = "https://www.youtube.com/watch?v=video000001"
+    aioclient_mock.get(url, text='{"lengthSeconds":"21"}' + "x" * 100)
+    client = async_get_client(hass)
+    with patch("custom_components.youtube_sensor.scanner.SCAN_MAX_BYTES", 20), patch(
+        "custom_components.youtube_sensor.scanner.SCAN_CHUNK_SIZE", 20
+    ):
+        assert await is_youtube_short("video000001", "Test", client) is None
+        assert await is_live(url, "Test", hass, client) is None
+
+
+async def test_stops_when_answer_known():
+    """Test reading stops, and the connection is closed, once a Short is confirmed."""
+    response = mock_response(
+        b'{"lengthSeconds":"21"}',
+        b'"webPageType":"WEB_PAGE_TYPE_SHORTS"',
+        b"never read",
+    )
+    chunks_read = []
+
+    def stop(found):
+        chunks_read.append(dict(found))
+        return _short_known(found)
+
+    found, _ = await WATCH_SCANNER.async_scan(response, stop)
+    assert len(chunks_read) == 2
+    assert found["definitive"] == b'"webPageType":"WEB_PAGE_TYPE_SHORTS"'
+    response.close.assert_called_once()
+
+
+async def test_scan_in_executor():
+    """Test chunks are searched in the parser threads, not on the event loop."""
+    threads = set()
+
+    class ThreadScanner(PageScanner):
+        def scan(self, window, found):
+            threads.add(threading.current_thread().name)
+            super().scan(window, found)
+
+    scanner = ThreadScanner({"live": rb'\{"iconType":"LIVE"\}'})
+    executor = ParseExecutor(workers=1, backlog=0)
+    try:
+        response = mock_response(b'...{"iconT', b'ype":"LIVE"}...', b"never read")
+        found, _ = await scanner.async_scan(response, lambda found: "live" in found, executor)
+    finally:
+        executor.shutdown()
+    assert found == {"live": b'{"iconType":"LIVE"}'}
+    assert threads and all(name.startswith("youtube_sensor_parser") for name in threads)
+    response.close.assert_called_once()
+
+
+async def test_executor_shutdown_does_not_wait():
+    """Test shutting the pool down from the event loop leaves running jobs to their threads."""
+    executor = ParseExecutor(workers=1, backlog=0)
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    task = asyncio.ensure_future(executor.async_run(job))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+    executor.shutdown(wait=False)
+    assert not task.done()
+    release.set()
+    assert await task == "done"
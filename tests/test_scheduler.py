@@ -0,0 +1,46 @@
+"""Test the adaptive poll scheduler."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.youtube_sensor.scheduler import PollScheduler
+
+
+def daily_uploads(hour, days=10):
+    """Return publication dates of a channel uploading every day at ``hour``."""
+    start = datetime(2026, 10, 1, hour, 2, tzinfo=timezone.utc)
+    return [start + timedelta(days=day) for day in range(days)]
+
+
+def test_idle_channel_backs_off():
+    """Test polls without new uploads double the interval up to the cap."""
+    scheduler = PollScheduler(15)
+    now = datetime(2026, 10, 17, 3, 0, tzinfo=timezone.utc)
+    assert scheduler.next_poll(now) == now + timedelta(minutes=15)
+    for _ in range(3):
+        scheduler.record_poll(new_uploads=False)
+    assert scheduler.next_poll(now) == now + timedelta(minutes=120)
+    for _ in range(10):
+        scheduler.record_poll(new_uploads=False)
+    assert scheduler.next_poll(now) == now + timedelta(minutes=240)
+    scheduler.record_poll(new_uploads=True)
+    assert scheduler.next_poll(now) == now + timedelta(minutes=15)
+
+
+def test_upload_window_polls_at_scan_interval():
+    """Test a daily uploader is polled at the scan interval around its upload time."""
+    scheduler = PollScheduler(15)
+    scheduler.update_uploads(daily_uploads(17))
+    for _ in range(10):
+        scheduler.record_poll(new_uploads=False)
+
+    # Lontano dalla finestra: back-off, ma non oltre l'inizio della finestra
+    morning = datetime(2026, 10, 17, 9, 0, tzinfo=timezone.utc)
+    assert scheduler.next_poll(morning) == morning + timedelta(minutes=240)
+    afternoon = datetime(2026, 10, 17, 15, 0, tzinfo=timezone.utc)
+    assert scheduler.next_poll(afternoon) == datetime(2026, 10, 17, 16, 30, tzinfo=timezone.utc)
+
+    # Dentro la finestra: intervallo configurato
+    for now in (
+        datetime(2026, 10, 17, 16, 40, tzinfo=timezone.utc),
+        datetime(2026, 10, 17, 17, 20, tzinfo=timezone.utc),
+    ):
+        assert scheduler.next_poll(now) == now + timedelta(minutes=15)
@@ -0,0 +1,381 @@
+"""Test the YouTube sensor."""
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+import time
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.youtube_sensor.api import async_get_session
+from custom_components.youtube_sensor.const import (
+    BASE_URL,
+    CHANNEL_LIVE_URL,
+    CONF_CHANNEL_ID,
+    CONF_INCLUDE_SHORTS,
+    DATA_COORDINATOR,
+    DOMAIN,
+    SHORTS_URL,
+    STARTUP_DELAY,
+    STARTUP_SPREAD,
+    STATE_CACHE_STORAGE_KEY,
+    VOLATILE_ATTRIBUTES_REFRESH,
+)
+from custom_components.youtube_sensor.coordinator import YoutubeChannel
+
+CHANNEL_ID = "UC4V3oCikXeSqYQr0hBMARwg"
+FIXTURES = Path(__file__).parent / "fixtures"
+FEED_HEADERS = {"ETag": '"feed-v1"', "Last-Modified": "Fri, 16 Oct 2026 17:05:00 GMT"}
+
+
+def load_fixture(name):
+    """Return the content of a fixture file."""
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def mock_youtube(aioclient_mock):
+    """Register the YouTube pages used by the test channel."""
+    aioclient_mock.get(
+        BASE_URL.format(CHANNEL_ID), text=load_fixture("videos.xml"), headers=FEED_HEADERS
+    )
+    aioclient_mock.get(
+        "https://www.youtube.com/watch?v=short000001", text=load_fixture("watch_short.html")
+    )
+    aioclient_mock.get(
+        "https://www.youtube.com/watch?v=video000001", text=load_fixture("watch_video.html")
+    )
+    aioclient_mock.get(CHANNEL_LIVE_URL.format(CHANNEL_ID), text=load_fixture("channel.html"))
+
+
+async def async_startup_refresh(hass):
+    """Let the deferred first refresh of new channels run."""
+    async_fire_time_changed(hass, dt_util.utcnow() + STARTUP_DELAY)
+    await hass.async_block_till_done()
+
+
+async def setup_entry(hass, include_shorts=False, refresh=True):
+    """Set up a config entry for the test channel and run its first refresh."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=CHANNEL_ID,
+        data={
+            CONF_CHANNEL_ID: CHANNEL_ID,
+            "name": "Test Channel",
+            CONF_INCLUDE_SHORTS: include_shorts,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    if refresh:
+        await async_startup_refresh(hass)
+    return entry
+
+
+async def test_sensor_skips_shorts(hass, aioclient_mock):
+    """Test the sensor shows the latest regular video."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A regular video & more"
+    assert state.attributes["content_id"] == "video000001"
+    assert state.attributes["is_short"] is False
+    assert state.attributes["views"] == "2500"
+    assert state.attributes["channel_image"] == "https://yt3.ggpht.com/avatar"
+
+
+async def test_sensor_includes_shorts(hass, aioclient_mock):
+    """Test the sensor shows the latest Short when Shorts are included."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass, include_shorts=True)
+
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A quick Short"
+    assert state.attributes["is_short"] is True
+
+
+async def test_session_shared_and_closed_on_unload(hass, aioclient_mock):
+    """Test one HTTP session is shared and closed with the last entry."""
+    mock_youtube(aioclient_mock)
+    entry = await setup_entry(hass)
+    session = hass.data[DOMAIN]["session"]
+    assert not session.closed
+    listeners = hass.bus.async_listeners()[EVENT_HOMEASSISTANT_CLOSE]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert session.closed
+    assert "session" not in hass.data[DOMAIN]
+    assert hass.bus.async_listeners().get(EVENT_HOMEASSISTANT_CLOSE, 0) == listeners - 1
+
+    # Una nuova sessione non lascia listener in più
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not async_get_session(hass).closed
+    assert hass.bus.async_listeners()[EVENT_HOMEASSISTANT_CLOSE] == listeners
+
+
+async def test_feed_not_modified(hass, aioclient_mock):
+    """Test a 304 answer skips every follow-up request."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(BASE_URL.format(CHANNEL_ID), status=HTTPStatus.NOT_MODIFIED)
+    for channel in coordinator.channels.values():
+        channel.next_update = None
+    await coordinator.async_refresh()
+
+    assert aioclient_mock.call_count == 1
+    headers = aioclient_mock.mock_calls[0][3]
+    assert headers["If-None-Match"] == '"feed-v1"'
+    assert headers["If-Modified-Since"] == "Fri, 16 Oct 2026 17:05:00 GMT"
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A regular video & more"
+
+
+async def test_feed_unchanged_body(hass, aioclient_mock):
+    """Test an identical feed body is not processed again."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    calls = aioclient_mock.call_count
+
+    for channel in coordinator.channels.values():
+        channel.next_update = None
+    await coordinator.async_refresh()
+
+    assert aioclient_mock.call_count == calls + 1
+
+
+async def test_shorts_probe_avoids_watch_pages(hass, aioclient_mock):
+    """Test the /shorts/ probe classifies videos without downloading watch pages."""
+    aioclient_mock.request("head", SHORTS_URL.format("short000001"))
+    aioclient_mock.request(
+        "head",
+        SHORTS_URL.format("video000001"),
+        status=HTTPStatus.SEE_OTHER,
+        headers={"Location": "https://www.youtube.com/watch?v=video000001"},
+    )
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A regular video & more"
+    assert not any("short000001" in str(call[1]) for call in aioclient_mock.mock_calls if call[0] == "get")
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    assert coordinator.short_tiers == {"probe": 2}
+
+
+async def test_only_changed_entries_processed(hass, aioclient_mock, freezer):
+    """Test a feed where only the statistics changed needs no page requests."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        BASE_URL.format(CHANNEL_ID),
+        text=load_fixture("videos.xml").replace('views="2500"', 'views="2600"'),
+    )
+    aioclient_mock.get(CHANNEL_LIVE_URL.format(CHANNEL_ID), text=load_fixture("channel.html"))
+    for channel in coordinator.channels.values():
+        channel.next_update = None
+    await coordinator.async_refresh()
+
+    # Solo il feed: né pagine video né pagina del canale (avatar in cache, live controllato da poco)
+    assert aioclient_mock.call_count == 1
+    # Le sole visualizzazioni non valgono una nuova scrittura dello stato...
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.attributes["views"] == "2500"
+    assert state.attributes["channel_image"] == "https://yt3.ggpht.com/avatar"
+
+    # ...se non ogni VOLATILE_ATTRIBUTES_REFRESH
+    freezer.tick(VOLATILE_ATTRIBUTES_REFRESH)
+    coordinator.async_update_listeners()
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.attributes["views"] == "2600"
+    last_updated = state.last_updated
+
+    coordinator.async_update_listeners()
+    assert hass.states.get("sensor.youtube_test_channel").last_updated == last_updated
+
+
+async def test_startup_restores_saved_state(hass, aioclient_mock, hass_storage, freezer):
+    """Test a known channel is shown from its saved state without waiting for YouTube."""
+    saved = YoutubeChannel(CHANNEL_ID, "Test Channel")
+    saved.title = "A regular video & more"
+    saved.content_id = "video000001"
+    saved.views = "2500"
+    saved.etag = '"feed-v1"'
+    hass_storage[STATE_CACHE_STORAGE_KEY] = {
+        "version": 1,
+        "key": STATE_CACHE_STORAGE_KEY,
+        "data": {"channels": {f"{CHANNEL_ID}_videos": [saved.snapshot(), time.time()]}},
+    }
+    aioclient_mock.get(BASE_URL.format(CHANNEL_ID), status=HTTPStatus.NOT_MODIFIED)
+    aioclient_mock.get(CHANNEL_LIVE_URL.format(CHANNEL_ID), text=load_fixture("channel.html"))
+    await setup_entry(hass, refresh=False)
+
+    assert aioclient_mock.call_count == 0
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A regular video & more"
+    assert state.attributes["views"] == "2500"
+
+    # Il primo aggiornamento arriva più tardi, ed è una richiesta condizionale
+    freezer.tick(STARTUP_SPREAD + timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"feed-v1"'
+    # Feed invariato: nemmeno la pagina del canale
+    assert aioclient_mock.call_count == 1
+    assert hass.states.get("sensor.youtube_test_channel").state == "A regular video & more"
+
+
+async def test_unchanged_feed_rechecks_live_channel(hass, aioclient_mock, hass_storage, freezer):
+    """Test the channel page is only checked again on an unchanged feed while the channel is live."""
+    saved = YoutubeChannel(CHANNEL_ID, "Test Channel")
+    saved.title = "A regular video & more"
+    saved.channel_live = True
+    saved.etag = '"feed-v1"'
+    hass_storage[STATE_CACHE_STORAGE_KEY] = {
+        "version": 1,
+        "key": STATE_CACHE_STORAGE_KEY,
+        "data": {"channels": {f"{CHANNEL_ID}_videos": [saved.snapshot(), time.time()]}},
+    }
+    aioclient_mock.get(BASE_URL.format(CHANNEL_ID), status=HTTPStatus.NOT_MODIFIED)
+    aioclient_mock.get(CHANNEL_LIVE_URL.format(CHANNEL_ID), text=load_fixture("channel.html"))
+    await setup_entry(hass, refresh=False)
+
+    freezer.tick(STARTUP_SPREAD + timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [
+        BASE_URL.format(CHANNEL_ID), CHANNEL_LIVE_URL.format(CHANNEL_ID)
+    ]
+    assert hass.states.get("binary_sensor.youtube_test_channel_live").state == "off"
+
+
+async def test_only_shorts_falls_back_to_latest(hass, aioclient_mock):
+    """Test a feed of only Shorts shows the latest one, even with a /shorts/ URL."""
+    aioclient_mock.request("head", SHORTS_URL.format("short000001"))
+    aioclient_mock.request("head", SHORTS_URL.format("video000001"))
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A quick Short"
+    assert state.attributes["content_id"] == "short000001"
+    assert state.attributes["url"] == "https://www.youtube.com/shorts/short000001"
+    assert state.attributes["is_short"] is True
+
+
+async def test_entry_views_share_one_poll(hass, aioclient_mock):
+    """Test the latest Short, stream and live entities come from the sensor's update."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+    calls = aioclient_mock.call_count
+
+    state = hass.states.get("sensor.youtube_test_channel_latest_short")
+    assert state.state == "A quick Short"
+    assert state.attributes["url"] == "https://www.youtube.com/shorts/short000001"
+    assert hass.states.get("binary_sensor.youtube_test_channel_live").state == "off"
+    assert hass.states.get("sensor.youtube_test_channel_stream").state == "unknown"
+
+    # Una sola entità "proprietaria": il canale è interrogato una volta sola
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    assert len(coordinator.channels) == 1
+    # Feed, pagine dei due video e pagina del canale
+    assert calls == 4
+
+
+async def test_unique_id_with_shorts_migrated(hass, aioclient_mock):
+    """Test a sensor including Shorts moves off the unique ID of the one without."""
+    mock_youtube(aioclient_mock)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=CHANNEL_ID,
+        data={CONF_CHANNEL_ID: CHANNEL_ID, "name": "Test Channel", CONF_INCLUDE_SHORTS: True},
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    old = registry.async_get_or_create(
+        "sensor", DOMAIN, f"youtube_{CHANNEL_ID}", config_entry=entry,
+        suggested_object_id="youtube_test_channel",
+    )
+    old_stats = registry.async_get_or_create(
+        "sensor", DOMAIN, f"youtube_{CHANNEL_ID}_requests", config_entry=entry,
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await async_startup_refresh(hass)
+
+    assert registry.async_get(old.entity_id).unique_id == f"youtube_{CHANNEL_ID}_shorts"
+    assert registry.async_get(old_stats.entity_id).unique_id == f"youtube_{CHANNEL_ID}_shorts_requests"
+    assert hass.states.get(old.entity_id).state == "A quick Short"
+
+    # Scaricando l'entry il canale non è più interrogato
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not hass.data[DOMAIN][DATA_COORDINATOR].channels
+
+
+# Le entità di configuration.yaml non vengono mai scaricate
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_stats_sensors_per_shorts_setting(hass, aioclient_mock):
+    """Test a channel monitored with and without Shorts gets two sets of diagnostic sensors."""
+    mock_youtube(aioclient_mock)
+    assert await async_setup_component(
+        hass,
+        "sensor",
+        {"sensor": [{"platform": DOMAIN, "channel_id": CHANNEL_ID, "includeShorts": True}]},
+    )
+    await hass.async_block_till_done()
+    await setup_entry(hass)
+
+    registry = er.async_get(hass)
+    for unique_id in (f"youtube_{CHANNEL_ID}_requests", f"youtube_{CHANNEL_ID}_shorts_requests"):
+        assert registry.async_get_entity_id("sensor", DOMAIN, unique_id) is not None
+    assert len(hass.data[DOMAIN][DATA_COORDINATOR].channels) == 2
+
+
+async def test_feed_only_mode(hass, aioclient_mock):
+    """Test feed-only mode costs one feed request, and a watch page only for possible streams."""
+    mock_youtube(aioclient_mock)
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"feed_only": True}})
+    await setup_entry(hass)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [BASE_URL.format(CHANNEL_ID)]
+    assert coordinator.short_tiers == {"feed": 2}
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A regular video & more"
+    assert state.attributes["stream"] is False
+    assert hass.states.get("sensor.youtube_test_channel_latest_short").state == "A quick Short"
+
+    # Un video nuovo senza visualizzazioni potrebbe essere una diretta: solo allora la pagina
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        BASE_URL.format(CHANNEL_ID),
+        text=load_fixture("videos.xml")
+        .replace('views="2500"', 'views="0"')
+        .replace('count="100"', 'count="0"')
+        .replace("2026-10-16T09:00:00", "2026-10-16T10:00:00"),
+    )
+    aioclient_mock.get(
+        "https://www.youtube.com/watch?v=video000001", text=load_fixture("watch_video.html")
+    )
+    for channel in coordinator.channels.values():
+        channel.next_update = None
+    await coordinator.async_refresh()
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [
+        BASE_URL.format(CHANNEL_ID),
+        "https://www.youtube.com/watch?v=video000001",
+    ]
@@ -0,0 +1,66 @@
+"""Test the sharing of identical concurrent requests."""
+import asyncio
+
+from custom_components.youtube_sensor.const import BASE_URL, DATA_COORDINATOR, DOMAIN
+from custom_components.youtube_sensor.singleflight import SingleFlight
+
+from .test_sensor import CHANNEL_ID, async_startup_refresh, mock_youtube, setup_entry
+
+WATCH_URL = "https://www.youtube.com/watch?v=video000001"
+
+
+async def test_concurrent_callers_share_fetch():
+    """Test callers asking at the same time share one fetch, and cancelling one keeps it going."""
+    flights = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        await release.wait()
+        return "page"
+
+    first = asyncio.create_task(flights.async_run("key", fetch))
+    second = asyncio.create_task(flights.async_run("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "page"
+    assert len(calls) == 1
+    assert flights.shared == 1
+
+    # Fuori da un ciclo di aggiornamento il risultato non viene tenuto
+    assert await flights.async_run("key", fetch) == "page"
+    assert len(calls) == 2
+    with flights.cycle():
+        await flights.async_run("key", fetch)
+        # Un risultato che non risponde a questa richiesta viene riscaricato
+        await flights.async_run("key", fetch, reuse=lambda result: False)
+        assert await flights.async_run("key", fetch) == "page"
+    assert len(calls) == 4
+
+
+async def test_watch_page_downloaded_once(hass, aioclient_mock):
+    """Test one watch page answers both the Short check and the live check."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass)
+
+    watch_calls = [call for call in aioclient_mock.mock_calls if str(call[1]) == WATCH_URL]
+    assert len(watch_calls) == 1
+    assert hass.states.get("sensor.youtube_test_channel").state == "A regular video & more"
+
+
+async def test_same_channel_with_and_without_shorts(hass, aioclient_mock):
+    """Test a channel monitored with and without Shorts downloads its pages once."""
+    mock_youtube(aioclient_mock)
+    await setup_entry(hass, refresh=False)
+    coordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    coordinator.async_register_channel(CHANNEL_ID, "Test Channel", include_shorts=True)
+
+    await async_startup_refresh(hass)
+    urls = [str(call[1]) for call in aioclient_mock.mock_calls]
+    assert urls.count(BASE_URL.format(CHANNEL_ID)) == 1
+    assert len(urls) == len(set(urls))
+    assert {channel.content_id for channel in coordinator.channels.values()} == {
+        "short000001", "video000001"
+    }
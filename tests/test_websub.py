@@ -0,0 +1,150 @@
+"""Test the WebSub push mode."""
+from datetime import timedelta
+import hashlib
+import hmac
+
+from homeassistant.components import webhook
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from homeassistant.util.aiohttp import MockRequest
+
+from custom_components.youtube_sensor.const import (
+    DATA_CLIENT,
+    DATA_COORDINATOR,
+    DEFAULT_WEBSUB_HUB,
+    DOMAIN,
+)
+
+from .test_sensor import CHANNEL_ID, load_fixture, mock_youtube, setup_entry
+
+PUSH = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+ <link rel="hub" href="https://pubsubhubbub.appspot.com"/>
+ <title>YouTube video feed</title>
+ <entry>
+  <id>yt:video:video000002</id>
+  <yt:videoId>video000002</yt:videoId>
+  <yt:channelId>{channel_id}</yt:channelId>
+  <title>A pushed video</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=video000002"/>
+  <author>
+   <name>Test Channel</name>
+   <uri>https://www.youtube.com/channel/{channel_id}</uri>
+  </author>
+  <published>2026-10-17T09:00:00+00:00</published>
+  <updated>2026-10-17T09:00:10+00:00</updated>
+ </entry>
+</feed>
+""".format(channel_id=CHANNEL_ID).encode()
+
+
+async def setup_websub(hass, aioclient_mock):
+    """Set up the test channel with push mode enabled."""
+    hass.config.external_url = "https://example.com"
+    aioclient_mock.post(DEFAULT_WEBSUB_HUB, status=202)
+    mock_youtube(aioclient_mock)
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"websub": True}})
+    await setup_entry(hass)
+    return hass.data[DOMAIN][DATA_COORDINATOR].websub
+
+
+async def test_subscribe_and_verify(hass, aioclient_mock):
+    """Test the channel is subscribed and the hub challenge is answered."""
+    websub = await setup_websub(hass, aioclient_mock)
+    hub_calls = [call for call in aioclient_mock.mock_calls if call[0] == "POST"]
+    assert len(hub_calls) == 1
+    assert hub_calls[0][2]["hub.mode"] == "subscribe"
+    assert hub_calls[0][2]["hub.callback"].startswith("https://example.com/api/webhook/")
+    assert not websub.is_active(CHANNEL_ID)
+
+    response = await webhook.async_handle_webhook(
+        hass,
+        websub.webhook_id,
+        MockRequest(
+            b"",
+            "",
+            method="GET",
+            query_string=(
+                "hub.mode=subscribe&hub.challenge=challenge-42&hub.lease_seconds=86400"
+                f"&hub.topic=https://www.youtube.com/feeds/videos.xml?channel_id={CHANNEL_ID}"
+            ),
+        ),
+    )
+    assert response.status == 200
+    assert response.text == "challenge-42"
+    assert websub.is_active(CHANNEL_ID)
+
+
+async def test_signed_push_updates_sensor(hass, aioclient_mock):
+    """Test a signed notification updates the sensor without polling the feed."""
+    websub = await setup_websub(hass, aioclient_mock)
+    aioclient_mock.get(
+        "https://www.youtube.com/watch?v=video000002",
+        text=load_fixture("watch_video.html"),
+    )
+
+    # Firma sbagliata: notifica ignorata
+    response = await webhook.async_handle_webhook(
+        hass,
+        websub.webhook_id,
+        MockRequest(PUSH, "", method="POST", headers={"X-Hub-Signature": "sha1=0000"}),
+    )
+    assert response.status == 202
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.youtube_test_channel").state == "A regular video & more"
+
+    signature = hmac.new(websub.secret.encode(), PUSH, hashlib.sha1).hexdigest()
+    response = await webhook.async_handle_webhook(
+        hass,
+        websub.webhook_id,
+        MockRequest(PUSH, "", method="POST", headers={"X-Hub-Signature": f"sha1={signature}"}),
+    )
+    assert response.status == 202
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.youtube_test_channel")
+    assert state.state == "A pushed video"
+    assert state.attributes["content_id"] == "video000002"
+
+
+async def test_unverified_lease_backs_off(hass, aioclient_mock):
+    """Test a subscription the hub never verifies is sent again less and less often."""
+    websub = await setup_websub(hass, aioclient_mock)
+    now = dt_util.utcnow()
+    sent = []
+    for hour in range(1, 25):
+        before = aioclient_mock.call_count
+        await websub._async_renew(now + timedelta(hours=hour))
+        if aioclient_mock.call_count > before:
+            sent.append(hour)
+    assert sent == [1, 2, 4, 8, 16]
+
+
+async def test_unload_stops_webhook(hass, aioclient_mock):
+    """Test unloading the last entry unsubscribes and stops the webhook."""
+    websub = await setup_websub(hass, aioclient_mock)
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    assert websub.active
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    hub_calls = [call for call in aioclient_mock.mock_calls if call[0] == "POST"]
+    assert hub_calls[-1][2]["hub.mode"] == "unsubscribe"
+    assert not websub.active
+    assert websub.webhook_id not in hass.data["webhook"]
+
+    # Ricaricando l'entry il webhook torna attivo
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert websub.active
+
+
+async def test_hub_failure_does_not_slow_polling(hass, aioclient_mock):
+    """Test a hub answering 5xx backs off its own requests, not the ones to YouTube."""
+    websub = await setup_websub(hass, aioclient_mock)
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(DEFAULT_WEBSUB_HUB, status=503)
+    mock_youtube(aioclient_mock)
+
+    await websub.async_subscribe(CHANNEL_ID)
+    assert websub._limiter.blocked_for > 0  # pylint: disable=protected-access
+    assert hass.data[DOMAIN][DATA_CLIENT].limiter.blocked_for == 0